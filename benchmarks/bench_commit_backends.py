@@ -0,0 +1,52 @@
+"""Benchmark the numstat commit backend against the GitPython backend.
+
+Usage: python benchmarks/bench_commit_backends.py [COMMITS ...]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from synthetic_repo import create_synthetic_repo
+
+from git_sniff_otter.config import Config
+from git_sniff_otter.modules.data_collector import DataCollector
+
+
+def time_backend(repo_path: str, backend: str, num_commits: int) -> float:
+    """Collect all commits of a repository and return the elapsed seconds."""
+    config = Config(
+        openai_api_key="bench",
+        repository_paths=[repo_path],
+        slack_channel="#bench",
+        slack_token="bench",
+        start_date=datetime.now() - timedelta(hours=num_commits + 1),
+        end_date=datetime.now() + timedelta(hours=1),
+        commit_backend=backend,
+    )
+    collector = DataCollector(config)
+
+    started = time.perf_counter()
+    commits = collector._collect_commits(repo_path)
+    elapsed = time.perf_counter() - started
+
+    assert len(commits) == num_commits, (backend, len(commits))
+    return elapsed
+
+
+def main(sizes):
+    print(f"{'commits':>8} {'gitpython':>11} {'numstat':>9} {'speedup':>8}")
+    for num_commits in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            repo_path = create_synthetic_repo(f"{tmp}/repo", num_commits)
+            gitpython = time_backend(repo_path, "gitpython", num_commits)
+            numstat = time_backend(repo_path, "numstat", num_commits)
+        print(
+            f"{num_commits:>8} {gitpython:>10.2f}s {numstat:>8.3f}s "
+            f"{gitpython / numstat:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 2000])
@@ -0,0 +1,106 @@
+"""Measure memory held per commit by CommitData and the author statistics.
+
+Compares the slotted, interned containers with the previous dict-based
+layout (reproduced below) on a synthetic fleet of commits.
+
+Usage: python benchmarks/bench_commit_memory.py [COMMITS]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from git_sniff_otter.modules.data_collector import CommitData
+from git_sniff_otter.modules.data_transformer import AuthorStats
+
+
+class LegacyCommitData:
+    """The pre-slots CommitData layout: a __dict__ and a fresh path list."""
+
+    def __init__(self, **fields):
+        self.sha = fields["sha"]
+        # Strings decoded from git output are distinct objects per commit
+        self.author_name = "".join(fields["author_name"])
+        self.author_email = "".join(fields["author_email"])
+        self.message = fields["message"]
+        self.date = fields["date"]
+        self.files_changed = ["".join(path) for path in fields["files_changed"]]
+        self.insertions = fields["insertions"]
+        self.deletions = fields["deletions"]
+        self.lines_changed = fields["lines_changed"]
+
+
+class LegacyAuthorStats:
+    """The pre-slots AuthorStats message handling: every message is kept."""
+
+    def __init__(self):
+        self.commit_messages = []
+
+    def add_commit(self, commit, repo_name):
+        self.commit_messages.append(commit.message)
+
+
+def synthetic_fields(num_commits):
+    """Yield commit fields with repeating authors and paths, like a real fleet."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(num_commits):
+        author = i % 300
+        yield {
+            "sha": f"{i:040x}",
+            "author_name": f"Author {author}",
+            "author_email": f"author{author}@example.com",
+            "message": f"Commit {i}: refactor the thing",
+            "date": start + timedelta(minutes=i),
+            "files_changed": [
+                f"services/svc_{(i + j) % 50}/module_{(i * 7 + j) % 400}.py"
+                for j in range(3)
+            ],
+            "insertions": i % 40,
+            "deletions": i % 15,
+            "lines_changed": i % 40 + i % 15,
+        }
+
+
+def measure(build, num_commits):
+    """Return bytes allocated per commit by ``build``."""
+    fields = list(synthetic_fields(num_commits))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(fields)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / num_commits
+
+
+def build_legacy(fields):
+    commits = [LegacyCommitData(**f) for f in fields]
+    authors = {}
+    for commit in commits:
+        authors.setdefault(commit.author_email, LegacyAuthorStats()).add_commit(
+            commit, "repo"
+        )
+    return commits, authors
+
+
+def build_current(fields):
+    commits = [CommitData.from_fields(**f) for f in fields]
+    authors = {}
+    for commit in commits:
+        authors.setdefault(
+            commit.author_email, AuthorStats(commit.author_name, commit.author_email)
+        ).add_commit(commit, "repo")
+    return commits, authors
+
+
+def main(num_commits):
+    legacy = measure(build_legacy, num_commits)
+    current = measure(build_current, num_commits)
+    print(f"{num_commits} commits")
+    print(f"  before (dict + lists):      {legacy:8.0f} bytes/commit")
+    print(f"  after (slots + interning):  {current:8.0f} bytes/commit")
+    print(f"  reduction:                  {1 - current / legacy:8.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,113 @@
+"""Time report generation against the local LLM stub, without network access.
+
+Runs several report jobs at once against a stub with realistic latency and
+compares the single-prompt, map-reduce and streaming paths: total wall time,
+and for streaming the time until the first section is delivered.
+
+Usage: python benchmarks/bench_llm_stub.py [JOBS] [REPOSITORIES]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from synthetic_repo import create_synthetic_repo
+
+from git_sniff_otter.config import Config
+from git_sniff_otter.modules.data_collector import CommitData, RepositoryData
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.llm_generator import LLMReportGenerator
+from git_sniff_otter.modules.llm_stub import LLMStubServer, StubSettings
+from git_sniff_otter.modules.report_stream import ReportSink
+
+
+class FirstSectionSink(ReportSink):
+    """Remembers when the first section arrived."""
+
+    def __init__(self):
+        self.first_at = None
+
+    def write_section(self, section):
+        if self.first_at is None:
+            self.first_at = time.perf_counter()
+
+
+def synthetic_data(num_repos):
+    """Transform a few commits per repository."""
+    start = datetime.now(timezone.utc) - timedelta(days=3)
+    repositories = []
+    for r in range(num_repos):
+        repo_data = RepositoryData(f"/repos/repo-{r}", f"repo-{r}")
+        for i in range(30):
+            repo_data.commits.append(
+                CommitData.from_fields(
+                    sha=f"{r:04x}{i:036x}",
+                    author_name=f"Author {(r + i) % 12}",
+                    author_email=f"author{(r + i) % 12}@example.com",
+                    message=f"Change {i} in repo {r}",
+                    date=start + timedelta(hours=i),
+                    files_changed=[f"src/module_{i % 7}.py"],
+                    insertions=i,
+                    deletions=i // 2,
+                    lines_changed=i + i // 2,
+                )
+            )
+        repositories.append(repo_data)
+    return DataTransformer(start.replace(tzinfo=None), datetime.now()).transform(
+        repositories
+    )
+
+
+def main(jobs, num_repos):
+    transformed = synthetic_data(num_repos)
+    server = LLMStubServer(
+        StubSettings(latency_ms=400, tokens_per_second=200, response_tokens=400)
+    ).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(f"{tmp}/repo", 1)
+        config = Config(
+            openai_api_key="bench",
+            llm_base_url=server.base_url,
+            llm_cache=False,
+            llm_concurrency=8,
+            repository_paths=[repo_path],
+            slack_channel="#bench",
+            slack_token="bench",
+        )
+
+        def run(mode):
+            generator = LLMReportGenerator(
+                config.model_copy(update={"llm_map_reduce": mode == "map-reduce"})
+            )
+            if mode == "streaming":
+                sink = FirstSectionSink()
+                started = time.perf_counter()
+                asyncio.run(generator.stream_report(transformed, [sink]))
+                return sink.first_at - started
+            generator.generate_report(transformed)
+            return None
+
+        print(f"{jobs} concurrent reports over {num_repos} repositories")
+        for mode in ("single prompt", "map-reduce", "streaming"):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(lambda _: run(mode), range(jobs)))
+            elapsed = time.perf_counter() - started
+            line = (
+                f"  {mode:<14} {elapsed:7.2f} s total, {jobs / elapsed:5.2f} reports/s"
+            )
+            if mode == "streaming":
+                line += f", first section after {max(results):.2f} s"
+            print(line)
+    server.close()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
@@ -0,0 +1,94 @@
+"""Measure splitting of large reports into Slack messages.
+
+Compares split_markdown with the previous splitter (reproduced below), which
+grew every message by string concatenation and did not look at code blocks,
+tables or over-long lines, on synthetic reports of several megabytes. Also
+counts the messages each one produces that exceed the 4000 character limit.
+
+Usage: python benchmarks/bench_markdown_split.py [MEGABYTES ...]
+"""
+
+import random
+import sys
+import time
+
+from git_sniff_otter.modules.markdown_split import split_markdown
+
+MAX_LENGTH = 4000
+
+
+def previous_split(report, max_length=MAX_LENGTH):
+    """Split a report the way SlackSender did before split_markdown."""
+    sections = []
+    current_section = ""
+
+    lines = report.split("\n")
+
+    for line in lines:
+        if len(current_section) + len(line) + 1 > max_length:
+            if current_section.strip():
+                sections.append(current_section.strip())
+            current_section = line
+        else:
+            if current_section:
+                current_section += "\n" + line
+            else:
+                current_section = line
+
+        if line.startswith("##") and current_section.strip():
+            if len(current_section) > max_length * 0.7:
+                sections.append(current_section.strip())
+                current_section = ""
+
+    if current_section.strip():
+        sections.append(current_section.strip())
+
+    return sections
+
+
+def synthetic_report(megabytes, seed=0):
+    """Build a report of sections with prose, tables, code and long lines."""
+    rng = random.Random(seed)
+    parts = ["# Git Repository Analysis Report"]
+    size = 0
+    while size < megabytes * 1024 * 1024:
+        section = [f"## Repository {rng.randrange(10000)}"]
+        section += [
+            " ".join(
+                rng.choice(["commits", "tests", "refactor", "fix"]) for _ in range(40)
+            )
+            for _ in range(rng.randrange(5, 40))
+        ]
+        section += ["| Author | Commits |", "|---|---:|"]
+        section += [
+            f"| Author {i} | {rng.randrange(100)} |" for i in range(rng.randrange(200))
+        ]
+        section += (
+            ["```diff"] + [f"+ line {i}" for i in range(rng.randrange(300))] + ["```"]
+        )
+        if rng.random() < 0.1:
+            section.append("z" * rng.randrange(4000, 20000))
+        text = "\n".join(section)
+        parts.append(text)
+        size += len(text)
+    return "\n\n".join(parts)
+
+
+def main():
+    sizes = [float(arg) for arg in sys.argv[1:]] or [1, 4, 16]
+    print(f"{'MB':>6} {'splitter':>10} {'seconds':>9} {'messages':>9} {'too long':>9}")
+    for megabytes in sizes:
+        report = synthetic_report(megabytes)
+        for name, split in (("previous", previous_split), ("markdown", split_markdown)):
+            start = time.perf_counter()
+            chunks = split(report, MAX_LENGTH)
+            elapsed = time.perf_counter() - start
+            too_long = sum(1 for chunk in chunks if len(chunk) > MAX_LENGTH)
+            print(
+                f"{len(report) / 2**20:6.1f} {name:>10} {elapsed:9.3f} "
+                f"{len(chunks):9d} {too_long:9d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
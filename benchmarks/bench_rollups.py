@@ -0,0 +1,59 @@
+"""Time 90-day reports answered from daily rollups against fresh collection.
+
+Builds a repository with commits every hour over the last 90 days, then
+times collecting commits and transforming them directly (GitInspector not
+included), building the rollups (cold) and answering from them (warm).
+
+Usage: python benchmarks/bench_rollups.py [DAYS]
+"""
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from synthetic_repo import create_synthetic_repo
+
+from git_sniff_otter.config import Config
+from git_sniff_otter.modules.data_collector import DataCollector, RepositoryData
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.rollups import align_window
+
+
+def main(days: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = create_synthetic_repo(f"{tmp}/repo", days * 24)
+        start_date, end_date = align_window(
+            datetime.now() - timedelta(days=days), datetime.now()
+        )
+        config = Config(
+            openai_api_key="bench",
+            repository_paths=[repo_path],
+            slack_channel="#bench",
+            slack_token="bench",
+            start_date=start_date,
+            end_date=end_date,
+            cache_dir=f"{tmp}/cache",
+            rollups=True,
+        )
+
+        timings = {}
+        started = time.perf_counter()
+        repo_data = RepositoryData(repo_path, "repo")
+        repo_data.commits = DataCollector(config)._collect_commits(repo_path)
+        DataTransformer(start_date, end_date).transform([repo_data])
+        timings["direct"] = time.perf_counter() - started
+        for label in ("rollups (cold)", "rollups (warm)"):
+            started = time.perf_counter()
+            DataTransformer(start_date, end_date).transform_aggregates(
+                DataCollector(config).collect_rollups()
+            )
+            timings[label] = time.perf_counter() - started
+
+    print(f"{days}-day report over {days * 24} commits")
+    for label, seconds in timings.items():
+        print(f"  {label:<16} {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 90)
@@ -0,0 +1,107 @@
+"""Time Slack webhook posts with and without a pooled keep-alive session.
+
+Posts messages to a local HTTP/1.1 webhook stub, once opening a new
+connection per message (``requests.post``) and once over the shared session
+used by SlackSender, and prints the per-message latency. With ``tls`` the
+stub serves HTTPS with a throwaway certificate (needs the openssl command),
+so the saved handshake includes TLS as it does against Slack.
+
+Usage: python benchmarks/bench_slack_webhook.py [MESSAGES] [tls]
+"""
+
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from git_sniff_otter.modules.slack_sender import shared_session
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def self_signed_certificate(directory):
+    """Create a certificate and key for 127.0.0.1, returning their paths."""
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes"]
+        + ["-keyout", key, "-out", cert, "-days", "1", "-subj", "/CN=127.0.0.1"]
+        + ["-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+def time_posts(post, url, messages, verify):
+    """Post messages one after another, returning each latency in ms."""
+    payload = json.dumps({"text": "x" * 2000, "channel": "#bench"})
+    latencies = []
+    for _ in range(messages):
+        start = time.perf_counter()
+        response = post(
+            url,
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=30,
+            verify=verify,
+        )
+        assert response.status_code == 200
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    tls = "tls" in sys.argv[2:]
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    verify = True
+    if tls:
+        cert, key = self_signed_certificate(tempfile.mkdtemp())
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+        verify = cert
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    scheme = "https" if tls else "http"
+    url = f"{scheme}://127.0.0.1:{httpd.server_port}/hook"
+
+    print(f"{messages} webhook posts to a local {scheme.upper()} stub")
+    for label, post in (
+        ("new connection", requests.post),
+        ("pooled session", shared_session().post),
+    ):
+        latencies = time_posts(post, url, messages, verify)
+        print(
+            f"  {label:16} median {statistics.median(latencies):6.2f} ms, "
+            f"mean {statistics.mean(latencies):6.2f} ms"
+        )
+
+    httpd.shutdown()
+    httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
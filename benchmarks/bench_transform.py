@@ -0,0 +1,95 @@
+"""Measure DataTransformer.transform throughput in commits per second.
+
+Compares the single-pass transform with the previous approach (reproduced
+below): one walk over all commits for RepositoryStats, a second walk for
+AuthorStats, splitting every path for its extension in both, and summing
+overall stats from the repository stats afterwards.
+
+Usage: python benchmarks/bench_transform.py [COMMITS ...]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from git_sniff_otter.modules.data_collector import CommitData, RepositoryData
+from git_sniff_otter.modules.data_transformer import (
+    AuthorStats,
+    DataTransformer,
+    RepositoryStats,
+)
+
+NUM_REPOS = 20
+
+
+def synthetic_repositories(num_commits):
+    """Build repositories with repeating authors and paths, like a real fleet."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    repositories = [
+        RepositoryData(f"/repos/repo-{r}", f"repo-{r}") for r in range(NUM_REPOS)
+    ]
+    for i in range(num_commits):
+        author = (i * 31) % 300
+        repositories[i % NUM_REPOS].commits.append(
+            CommitData.from_fields(
+                sha=f"{i:040x}",
+                author_name=f"Author {author}",
+                author_email=f"author{author}@example.com",
+                message=f"Commit {i}: refactor the thing",
+                date=start - timedelta(minutes=i),
+                files_changed=[
+                    f"svc_{(i + j) % 50}/module_{(i * 7 + j) % 400}."
+                    + ("py", "md", "ts", "yml")[(i + j) % 4]
+                    for j in range(3)
+                ],
+                insertions=i % 40,
+                deletions=i % 15,
+                lines_changed=i % 40 + i % 15,
+            )
+        )
+    return repositories
+
+
+def transform_separate_walks(transformer, repositories):
+    """The previous transform: one walk per statistics class."""
+    repository_stats = [RepositoryStats(repo_data) for repo_data in repositories]
+    author_map = {}
+    for repo_data in repositories:
+        for commit in repo_data.commits:
+            author_key = f"{commit.author_name}:{commit.author_email}"
+            if author_key not in author_map:
+                author_map[author_key] = AuthorStats(
+                    commit.author_name, commit.author_email
+                )
+            author_map[author_key].add_commit(commit, repo_data.name)
+    return transformer._build_transformed(repository_stats, list(author_map.values()))
+
+
+def commits_per_second(transform, num_commits):
+    """Return the best of three runs in commits per second."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        transform()
+        best = min(best, time.perf_counter() - started)
+    return num_commits / best
+
+
+def main(sizes):
+    transformer = DataTransformer(datetime(2023, 1, 1), datetime(2024, 1, 1))
+
+    print(f"{'commits':>10} {'separate walks':>16} {'single pass':>16} {'speedup':>8}")
+    for size in sizes:
+        repositories = synthetic_repositories(size)
+        before = commits_per_second(
+            lambda: transform_separate_walks(transformer, repositories), size
+        )
+        after = commits_per_second(lambda: transformer.transform(repositories), size)
+        print(
+            f"{size:>10} {before:>12.0f} c/s {after:>12.0f} c/s "
+            f"{after / before:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,75 @@
+"""Compare the python and numpy transform engines on a synthetic commit table.
+
+Both engines aggregate the same CommitTable; the time to build the table is
+not included.
+
+Usage: python benchmarks/bench_transform_engines.py [COMMITS ...]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from git_sniff_otter.modules.commit_table import CommitTable
+from git_sniff_otter.modules.data_collector import CommitData, RepositoryData
+from git_sniff_otter.modules.data_transformer import DataTransformer
+
+NUM_REPOS = 20
+
+
+def synthetic_table(num_commits):
+    """Build a table of commits spread over repositories, authors and paths."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    repositories = [
+        RepositoryData(f"/repos/repo-{r}", f"repo-{r}") for r in range(NUM_REPOS)
+    ]
+    for i in range(num_commits):
+        author = (i * 31) % 300
+        repositories[i % NUM_REPOS].commits.append(
+            CommitData.from_fields(
+                sha=f"{i:040x}",
+                author_name=f"Author {author}",
+                author_email=f"author{author}@example.com",
+                message=f"Commit {i}: refactor the thing",
+                date=start - timedelta(minutes=i),
+                files_changed=[
+                    f"svc_{(i + j) % 50}/module_{(i * 7 + j) % 400}."
+                    + ("py", "md", "ts", "yml")[(i + j) % 4]
+                    for j in range(3)
+                ],
+                insertions=i % 40,
+                deletions=i % 15,
+                lines_changed=i % 40 + i % 15,
+            )
+        )
+    return CommitTable.from_repository_data(repositories)
+
+
+def timed(transformer, table):
+    """Return the best of three transform times in seconds."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        transformer.transform_table(table)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(sizes):
+    start, end = datetime(2023, 1, 1), datetime(2024, 1, 1)
+    python_engine = DataTransformer(start, end)
+    numpy_engine = DataTransformer(start, end, engine="numpy")
+
+    print(f"{'commits':>10} {'python':>10} {'numpy':>10} {'speedup':>8}")
+    for size in sizes:
+        table = synthetic_table(size)
+        python_time = timed(python_engine, table)
+        numpy_time = timed(numpy_engine, table)
+        print(
+            f"{size:>10} {python_time:>9.3f}s {numpy_time:>9.3f}s "
+            f"{python_time / numpy_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 500_000])
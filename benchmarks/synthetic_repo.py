@@ -0,0 +1,58 @@
+"""Helpers for building throwaway Git repositories for benchmarks."""
+
+import os
+import subprocess
+import time
+from typing import Optional
+
+
+def create_synthetic_repo(
+    path: str,
+    num_commits: int,
+    files_per_commit: int = 3,
+    num_authors: int = 5,
+    end_timestamp: Optional[int] = None,
+) -> str:
+    """Create a repository with ``num_commits`` commits using `git fast-import`.
+
+    Commits are spread one hour apart, ending at ``end_timestamp`` (defaults to
+    now), so they fall inside a time window of ``num_commits`` hours.
+    """
+    os.makedirs(path, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", path], check=True)
+
+    end_timestamp = end_timestamp or int(time.time())
+    extensions = ["py", "js", "md", "yml", "go"]
+    stream = []
+
+    for i in range(num_commits):
+        author = i % num_authors
+        timestamp = end_timestamp - (num_commits - i) * 3600
+        message = f"Commit {i}: change things\n".encode()
+        stream.append(b"commit refs/heads/main\n")
+        stream.append(
+            f"author Author {author} <author{author}@example.com> "
+            f"{timestamp} +0000\n".encode()
+        )
+        stream.append(
+            f"committer Author {author} <author{author}@example.com> "
+            f"{timestamp} +0000\n".encode()
+        )
+        stream.append(f"data {len(message)}\n".encode() + message)
+        for j in range(files_per_commit):
+            file_index = (i * files_per_commit + j) % 200
+            extension = extensions[file_index % len(extensions)]
+            content = f"line {i}\n".encode() * (1 + j)
+            stream.append(
+                f"M 644 inline src/module_{file_index}.{extension}\n".encode()
+            )
+            stream.append(f"data {len(content)}\n".encode() + content)
+        stream.append(b"\n")
+
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        input=b"".join(stream),
+        cwd=path,
+        check=True,
+    )
+    return path
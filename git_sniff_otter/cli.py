@@ -1,9 +1,10 @@
 """Command line interface for Git Sniff Otter."""
 
+import asyncio
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional, Tuple
 
 try:
     import click
@@ -31,6 +32,10 @@ from .config import Config, load_config
 from .modules.data_collector import DataCollector
 from .modules.data_transformer import DataTransformer
 from .modules.llm_generator import LLMReportGenerator
+from .modules.llm_stub import LLMStubServer, StubSettings
+from .modules.report_plan import ReportPlan, run_report_plan
+from .modules.report_stream import FileSink, ReportSink, SlackSink
+from .modules.rollups import align_window
 from .modules.slack_sender import SlackSender
 
 console = Console()
@@ -67,7 +72,16 @@ def cli():
     "--config", "-c", type=click.Path(exists=True), help="Path to configuration file"
 )
 @click.option(
-    "--channel", default=None, help="Slack channel to send report to (overrides config)"
+    "--channel",
+    multiple=True,
+    help="Slack channel to send report to (overrides config, can be repeated)",
+)
+@click.option(
+    "--slack-mode",
+    type=click.Choice(["messages", "file", "auto"]),
+    default=None,
+    help="Post the report as chat messages, or upload it as a file with a "
+    "summary message (overrides config)",
 )
 @click.option(
     "--dry-run", is_flag=True, help="Generate report but do not send to Slack"
@@ -75,15 +89,100 @@ def cli():
 @click.option(
     "--save-report", type=click.Path(), help="Save the generated report to a file"
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of repositories to collect in parallel (overrides config)",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["python", "numpy"]),
+    default=None,
+    help="Statistics engine; 'numpy' uses vectorized aggregation (overrides config)",
+)
+@click.option(
+    "--prompt-budget",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Token budget for the LLM prompt; 0 sends all data (overrides config)",
+)
+@click.option(
+    "--map-reduce",
+    is_flag=True,
+    default=False,
+    help="Summarize each repository in a separate, concurrent LLM request first",
+)
+@click.option(
+    "--llm-concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of concurrent LLM requests (overrides config)",
+)
+@click.option(
+    "--stream-report",
+    is_flag=True,
+    default=False,
+    help="Stream the LLM response and deliver each report section once it is done",
+)
+@click.option(
+    "--llm-base-url",
+    default=None,
+    help="Base URL of an OpenAI-compatible API, e.g. serve-llm-stub (overrides config)",
+)
+@click.option(
+    "--no-llm-cache",
+    is_flag=True,
+    default=False,
+    help="Always request a new LLM response instead of reusing a cached one",
+)
+@click.option(
+    "--commit-cache",
+    is_flag=True,
+    default=False,
+    help="Reuse commit stats cached by previous runs (see CACHE_DIR)",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Reuse previous results for repositories whose refs have not moved",
+)
+@click.option(
+    "--use-rollups",
+    is_flag=True,
+    default=False,
+    help="Answer from per-day rollups; the window start is aligned to midnight",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Stream commits into the statistics without holding them in memory",
+)
 def analyze(
     repos: tuple,
     days: int,
     start_date: Optional[datetime],
     end_date: Optional[datetime],
     config: Optional[str],
-    channel: Optional[str],
+    channel: tuple,
+    slack_mode: Optional[str],
     dry_run: bool,
     save_report: Optional[str],
+    jobs: Optional[int],
+    engine: Optional[str],
+    prompt_budget: Optional[int],
+    map_reduce: bool,
+    llm_concurrency: Optional[int],
+    stream_report: bool,
+    llm_base_url: Optional[str],
+    no_llm_cache: bool,
+    commit_cache: bool,
+    incremental: bool,
+    use_rollups: bool,
+    stream: bool,
 ):
     """Analyze Git repositories and generate a report."""
 
@@ -97,8 +196,30 @@ def analyze(
 
         # Override configuration with CLI parameters
         app_config.repository_paths = list(repos)
-        if channel:
-            app_config.slack_channel = channel
+        channels = list(channel) or [app_config.slack_channel]
+        app_config.slack_channel = channels[0]
+        if slack_mode:
+            app_config.slack_delivery_mode = slack_mode
+        if jobs:
+            app_config.collection_jobs = jobs
+        if engine:
+            app_config.transform_engine = engine
+        if prompt_budget is not None:
+            app_config.prompt_token_budget = prompt_budget
+        if map_reduce:
+            app_config.llm_map_reduce = True
+        if llm_concurrency:
+            app_config.llm_concurrency = llm_concurrency
+        if stream_report:
+            app_config.llm_streaming = True
+        if llm_base_url:
+            app_config.llm_base_url = llm_base_url
+        if no_llm_cache:
+            app_config.llm_cache = False
+        if commit_cache:
+            app_config.commit_cache = True
+        if incremental:
+            app_config.skip_unchanged_repos = True
         if start_date and end_date:
             app_config.start_date = start_date
             app_config.end_date = end_date
@@ -110,12 +231,20 @@ def analyze(
             app_config.end_date = end_date
         else:
             app_config.time_window_days = days
+        if use_rollups:
+            app_config.rollups = True
+            app_config.start_date, app_config.end_date = align_window(
+                app_config.analysis_start_date, app_config.analysis_end_date
+            )
+
+        if stream and use_rollups:
+            raise click.ClickException("--stream cannot be combined with --use-rollups")
 
         # Validate repositories
         _validate_repositories(repos)
 
         # Show analysis parameters
-        _show_analysis_parameters(app_config)
+        _show_analysis_parameters(app_config, channels)
 
         with Progress(
             SpinnerColumn(),
@@ -125,47 +254,85 @@ def analyze(
             # Step 1: Data Collection
             task1 = progress.add_task("Collecting repository data...", total=None)
             collector = DataCollector(app_config)
-            repo_data = collector.collect_all_data()
+            if use_rollups:
+                aggregates = collector.collect_rollups()
+            elif stream:
+                # Commits are read while the transformer consumes them below
+                repository_stream = collector.stream_repositories()
+            else:
+                repo_data = collector.collect_all_data()
             progress.update(task1, completed=True)
 
             # Step 2: Data Transformation
             task2 = progress.add_task("Transforming data...", total=None)
             transformer = DataTransformer(
-                app_config.analysis_start_date, app_config.analysis_end_date
+                app_config.analysis_start_date,
+                app_config.analysis_end_date,
+                engine=app_config.transform_engine,
             )
-            transformed_data = transformer.transform(repo_data)
+            if use_rollups:
+                transformed_data = transformer.transform_aggregates(aggregates)
+            elif stream:
+                transformed_data = transformer.transform_stream(repository_stream)
+            else:
+                transformed_data = transformer.transform(repo_data)
             progress.update(task2, completed=True)
 
             # Step 3: Report Generation
-            task3 = progress.add_task("Generating LLM report...", total=None)
             generator = LLMReportGenerator(app_config)
-            report = generator.generate_report(transformed_data)
-            progress.update(task3, completed=True)
+            slack_sink = None
+            if app_config.llm_streaming:
+                # Sections are saved and sent while the report is generated
+                task3 = progress.add_task(
+                    "Generating and delivering LLM report...", total=None
+                )
+                sinks: List[ReportSink] = []
+                if save_report:
+                    sinks.append(FileSink(save_report))
+                if not dry_run:
+                    slack_sink = SlackSink(SlackSender(app_config, channels))
+                    sinks.append(slack_sink)
+                report = asyncio.run(generator.stream_report(transformed_data, sinks))
+                progress.update(task3, completed=True)
+            else:
+                task3 = progress.add_task("Generating LLM report...", total=None)
+                report = generator.generate_report(transformed_data)
+                progress.update(task3, completed=True)
 
             # Step 4: Output
             if save_report:
-                task4 = progress.add_task("Saving report to file...", total=None)
-                with open(save_report, "w", encoding="utf-8") as f:
-                    f.write(report)
-                progress.update(task4, completed=True)
+                if not app_config.llm_streaming:
+                    task4 = progress.add_task("Saving report to file...", total=None)
+                    with open(save_report, "w", encoding="utf-8") as f:
+                        f.write(report)
+                    progress.update(task4, completed=True)
                 console.print(
                     f"✅ Report saved to: [bold green]{save_report}[/bold green]"
                 )
 
             if not dry_run:
-                task5 = progress.add_task("Sending to Slack...", total=None)
-                slack_sender = SlackSender(app_config)
-                success = slack_sender.send_report(report)
-                progress.update(task5, completed=True)
+                if slack_sink is not None:
+                    success = slack_sink.ok
+                else:
+                    task5 = progress.add_task("Sending to Slack...", total=None)
+                    slack_sender = SlackSender(app_config, channels)
+                    success = slack_sender.send_report(report)
+                    progress.update(task5, completed=True)
 
                 if success:
                     console.print(
-                        f"✅ Report sent successfully to [bold green]{app_config.slack_channel}[/bold green]"
+                        "✅ Report sent successfully to "
+                        f"[bold green]{', '.join(channels)}[/bold green]"
                     )
                 else:
                     console.print(
                         "❌ [bold red]Failed to send report to Slack[/bold red]"
                     )
+                    if app_config.slack_outbox:
+                        console.print(
+                            "📮 Unsent messages are kept in the outbox; run "
+                            "[bold]git-sniff-otter resend[/bold] to deliver them"
+                        )
                     return 1
             else:
                 console.print(
@@ -176,6 +343,12 @@ def analyze(
                 console.print(report[:500] + "..." if len(report) > 500 else report)
 
         console.print("\n🎉 [bold green]Analysis completed successfully![/bold green]")
+        if generator.response_cache and generator.response_cache.hits:
+            cache = generator.response_cache
+            console.print(
+                f"💾 LLM response cache: {cache.hits} of {cache.hits + cache.misses} "
+                "requests answered without calling the LLM"
+            )
         return 0
 
     except Exception as e:
@@ -183,6 +356,86 @@ def analyze(
         return 1
 
 
+@cli.command("analyze-plan")
+@click.argument("plan_file", type=click.Path(exists=True))
+@click.option(
+    "--config", "-c", type=click.Path(exists=True), help="Path to configuration file"
+)
+@click.option(
+    "--dry-run", is_flag=True, help="Generate reports but do not send to Slack"
+)
+@click.option(
+    "--llm-concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of reports generated at once (overrides config)",
+)
+def analyze_plan(
+    plan_file: str, config: Optional[str], dry_run: bool, llm_concurrency: Optional[int]
+):
+    """Generate every report of a plan from one collection pass."""
+
+    console.print(
+        "🔍 [bold blue]Git Sniff Otter[/bold blue] - Starting report plan...",
+        style="bold",
+    )
+
+    try:
+        app_config = load_config(config)
+        if llm_concurrency:
+            app_config.llm_concurrency = llm_concurrency
+        plan = ReportPlan.load(plan_file, app_config)
+        _validate_repositories(tuple(plan.repository_paths))
+
+        table = Table(title="Report Plan")
+        table.add_column("Job", style="cyan")
+        table.add_column("Repositories", justify="right")
+        table.add_column("Window", style="magenta")
+        table.add_column("Channels", style="green")
+        for job in plan.jobs:
+            table.add_row(
+                job.name,
+                str(len(job.repository_paths)),
+                f"{job.start_date.strftime('%Y-%m-%d')} to "
+                f"{job.end_date.strftime('%Y-%m-%d')}",
+                ", ".join(job.channels),
+            )
+        console.print(table)
+        console.print(
+            f"Collecting {len(plan.repository_paths)} repositories once for "
+            f"{len(plan.jobs)} reports"
+        )
+
+        results = run_report_plan(app_config, plan, dry_run=dry_run)
+
+        failed = [
+            result["name"]
+            for result in results
+            if result["error"] or result["sent"] is False
+        ]
+        for result in results:
+            status = "🏃 not sent (dry run)"
+            if result["error"]:
+                status = f"❌ [bold red]failed:[/bold red] {result['error']}"
+            elif result["sent"]:
+                status = "✅ sent"
+            elif result["sent"] is False:
+                status = "❌ [bold red]not sent[/bold red]"
+            console.print(f"{result['name']}: {result['commits']} commits, {status}")
+
+        if failed:
+            console.print(f"❌ [bold red]Failed jobs: {', '.join(failed)}[/bold red]")
+            return 1
+        console.print(
+            "\n🎉 [bold green]Report plan completed successfully![/bold green]"
+        )
+        return 0
+
+    except Exception as e:
+        console.print(f"❌ [bold red]Error running report plan: {e}[/bold red]")
+        return 1
+
+
 @cli.command()
 @click.option(
     "--config", "-c", type=click.Path(exists=True), help="Path to configuration file"
@@ -208,6 +461,91 @@ def test_slack(config: Optional[str]):
         return 1
 
 
+@cli.command()
+@click.option(
+    "--config", "-c", type=click.Path(exists=True), help="Path to configuration file"
+)
+@click.option("--list", "list_only", is_flag=True, help="List pending reports only")
+@click.option(
+    "--discard",
+    is_flag=True,
+    help="Drop the given reports unsent, or all pending reports if none are given",
+)
+@click.argument("report_ids", nargs=-1, type=int)
+def resend(
+    config: Optional[str], list_only: bool, discard: bool, report_ids: Tuple[int, ...]
+):
+    """Send reports left in the Slack outbox by failed deliveries.
+
+    REPORT_IDS select the reports to discard with --discard.
+    """
+
+    if report_ids and not discard:
+        console.print(
+            "❌ [bold red]Report IDs can only be given with --discard[/bold red]"
+        )
+        return 1
+
+    try:
+        app_config = load_config(config)
+        slack_sender = SlackSender(app_config)
+        outbox = slack_sender.outbox
+        if outbox is None:
+            console.print("❌ [bold red]The Slack outbox is disabled[/bold red]")
+            return 1
+
+        pending = outbox.pending_reports()
+        if not pending:
+            console.print("📭 No unsent reports in the outbox")
+            return 0
+
+        table = Table(title="Unsent Reports")
+        table.add_column("ID", style="cyan")
+        table.add_column("Title", style="magenta")
+        table.add_column("Created", style="green")
+        table.add_column("Unsent Messages", justify="right")
+        table.add_column("Last Error", style="red")
+        for report in pending:
+            table.add_row(
+                str(report["id"]),
+                report["title"],
+                datetime.fromtimestamp(report["created_at"]).strftime("%Y-%m-%d %H:%M"),
+                str(report["pending"]),
+                report["last_error"] or "",
+            )
+        console.print(table)
+
+        if list_only:
+            return 0
+        if discard:
+            unknown = set(report_ids) - {report["id"] for report in pending}
+            if unknown:
+                console.print(
+                    "❌ [bold red]No unsent report "
+                    f"{', '.join(map(str, sorted(unknown)))}[/bold red]"
+                )
+                return 1
+            for report_id in report_ids or [None]:
+                outbox.discard(report_id)
+            console.print(
+                f"🗑️  Discarded {len(report_ids) or len(pending)} unsent reports"
+            )
+            return 0
+
+        deliveries = slack_sender.flush_outbox()
+        for report_id, delivery in deliveries.items():
+            console.print(f"Report {report_id}:\n{delivery.summary()}")
+        if all(delivery.ok for delivery in deliveries.values()):
+            console.print("✅ [bold green]All unsent reports delivered[/bold green]")
+            return 0
+        console.print("❌ [bold red]Some messages are still unsent[/bold red]")
+        return 1
+
+    except Exception as e:
+        console.print(f"❌ [bold red]Error resending reports: {e}[/bold red]")
+        return 1
+
+
 @cli.command()
 @click.argument("repositories", nargs=-1, required=True)
 def validate_repos(repositories):
@@ -253,6 +591,96 @@ def validate_repos(repositories):
         return 1
 
 
+@cli.command("serve-llm-stub")
+@click.option("--host", default="127.0.0.1", help="Interface to listen on")
+@click.option(
+    "--port", default=8399, type=int, help="Port to listen on (default: 8399)"
+)
+@click.option(
+    "--latency-ms",
+    default=500.0,
+    type=click.FloatRange(min=0),
+    help="Median time to first token in milliseconds (default: 500)",
+)
+@click.option(
+    "--latency-sigma",
+    default=0.5,
+    type=click.FloatRange(min=0),
+    help="Spread of the lognormal latency distribution; 0 is fixed (default: 0.5)",
+)
+@click.option(
+    "--tokens-per-second",
+    default=50.0,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Rate at which tokens are produced (default: 50)",
+)
+@click.option(
+    "--response-tokens",
+    default=600,
+    type=click.IntRange(min=1),
+    help="Tokens per response, capped by the request's max_tokens (default: 600)",
+)
+@click.option(
+    "--error-rate",
+    default=0.0,
+    type=click.FloatRange(0, 1),
+    help="Fraction of requests answered with a 500 error",
+)
+@click.option(
+    "--rate-limit-rate",
+    default=0.0,
+    type=click.FloatRange(0, 1),
+    help="Fraction of requests answered with a 429 and Retry-After",
+)
+@click.option(
+    "--retry-after",
+    default=1.0,
+    type=click.FloatRange(min=0),
+    help="Retry-After seconds sent with 429 responses (default: 1)",
+)
+@click.option("--seed", default=0, type=int, help="Seed for responses and errors")
+def serve_llm_stub(
+    host: str,
+    port: int,
+    latency_ms: float,
+    latency_sigma: float,
+    tokens_per_second: float,
+    response_tokens: int,
+    error_rate: float,
+    rate_limit_rate: float,
+    retry_after: float,
+    seed: int,
+):
+    """Serve a local OpenAI-compatible stand-in for offline runs and benchmarks."""
+    server = LLMStubServer(
+        StubSettings(
+            latency_ms=latency_ms,
+            latency_sigma=latency_sigma,
+            tokens_per_second=tokens_per_second,
+            response_tokens=response_tokens,
+            error_rate=error_rate,
+            rate_limit_rate=rate_limit_rate,
+            retry_after=retry_after,
+            seed=seed,
+        ),
+        host=host,
+        port=port,
+    )
+    console.print(
+        f"🤖 [bold blue]LLM stub serving at {server.base_url}[/bold blue] "
+        f"(set LLM_BASE_URL={server.base_url}; Ctrl+C to stop)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        console.print(
+            f"Served {server.requests} requests, {server.errors} with injected errors"
+        )
+
+
 def _validate_repositories(repos: tuple) -> None:
     """Validate repository paths."""
     for repo_path in repos:
@@ -262,7 +690,9 @@ def _validate_repositories(repos: tuple) -> None:
             raise click.ClickException(f"Path is not a Git repository: {repo_path}")
 
 
-def _show_analysis_parameters(config: Config) -> None:
+def _show_analysis_parameters(
+    config: Config, channels: Optional[List[str]] = None
+) -> None:
     """Display analysis parameters in a formatted table."""
     table = Table(title="Analysis Parameters")
     table.add_column("Parameter", style="cyan")
@@ -275,8 +705,19 @@ def _show_analysis_parameters(config: Config) -> None:
         "Duration",
         f"{(config.analysis_end_date - config.analysis_start_date).days} days",
     )
+    table.add_row("Collection Jobs", str(config.collection_jobs))
+    table.add_row("Transform Engine", config.transform_engine)
     table.add_row("LLM Model", config.llm_model)
-    table.add_row("Slack Channel", config.slack_channel)
+    if config.llm_base_url:
+        table.add_row("LLM Base URL", config.llm_base_url)
+    table.add_row(
+        "Prompt Budget",
+        f"{config.prompt_token_budget} tokens"
+        if config.prompt_token_budget
+        else "none",
+    )
+    table.add_row("Slack Channel", ", ".join(channels or [config.slack_channel]))
+    table.add_row("Slack Delivery", config.slack_delivery_mode)
 
     console.print(table)
 
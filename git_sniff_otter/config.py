@@ -7,6 +7,8 @@ from typing import List, Optional
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "git-sniff-otter")
+
 
 class Config(BaseModel):
     """Configuration model for the Git Sniff Otter application."""
@@ -14,11 +16,82 @@ class Config(BaseModel):
     # LLM Configuration
     openai_api_key: str = Field(..., description="OpenAI API key")
     llm_model: str = Field(default="gpt-4", description="LLM model to use")
+    llm_base_url: Optional[str] = Field(
+        None,
+        description="Base URL of an OpenAI-compatible API, e.g. a local stub server",
+    )
+    llm_system_prompt: Optional[str] = Field(
+        None, description="System prompt replacing the built-in report instructions"
+    )
+    prompt_token_budget: int = Field(
+        default=12000,
+        ge=0,
+        description="Token budget for the report prompt's data (0 sends everything)",
+    )
+
+    llm_map_reduce: bool = Field(
+        default=False,
+        description="Summarize each repository in its own request before the report",
+    )
+    llm_concurrency: int = Field(
+        default=4, ge=1, description="Maximum number of concurrent LLM requests"
+    )
+    llm_streaming: bool = Field(
+        default=False,
+        description="Stream the report and deliver each section as soon as it is done",
+    )
+    llm_max_attempts: int = Field(
+        default=5, ge=1, description="Attempts per LLM request before giving up"
+    )
+    llm_retry_deadline: float = Field(
+        default=300,
+        ge=0,
+        description="Seconds after which a failing LLM request is not retried "
+        "(0 never)",
+    )
+    llm_requests_per_minute: float = Field(
+        default=0,
+        ge=0,
+        description="LLM requests per minute shared by all report jobs (0 unlimited)",
+    )
+    llm_cache: bool = Field(
+        default=True, description="Reuse cached responses to identical LLM requests"
+    )
+    llm_cache_ttl_hours: float = Field(
+        default=24,
+        ge=0,
+        description="Hours a cached LLM response stays valid (0 keeps it forever)",
+    )
+    llm_cache_max_mb: int = Field(
+        default=50,
+        ge=1,
+        description="Size of cached LLM responses kept, least recently used evicted",
+    )
 
     # Slack Configuration
     slack_token: Optional[str] = Field(None, description="Slack bot token")
     slack_webhook_url: Optional[str] = Field(None, description="Slack webhook URL")
     slack_channel: str = Field(..., description="Slack channel to send reports to")
+    slack_pool_size: int = Field(
+        default=4,
+        ge=1,
+        description="Keep-alive connections per host kept open for webhook posts",
+    )
+    slack_delivery_mode: str = Field(
+        default="messages",
+        description="How reports reach Slack: 'messages' (split into chat "
+        "messages), 'file' (a summary message and the report as a file) or "
+        "'auto' (file for reports longer than a few messages)",
+    )
+    slack_outbox: bool = Field(
+        default=True,
+        description="Spool Slack messages in the cache directory until they are sent",
+    )
+    slack_outbox_max_attempts: int = Field(
+        default=5,
+        ge=1,
+        description="Failed deliveries after which a spooled report is dropped",
+    )
 
     # Git Configuration
     repository_paths: List[str] = Field(..., description="List of git repository paths")
@@ -30,6 +103,49 @@ class Config(BaseModel):
     gitinspector_path: str = Field(
         default="gitinspector", description="Path to gitinspector tool"
     )
+    gitinspector_timeout: Optional[float] = Field(
+        default=600,
+        description="Seconds GitInspector may run per repository (0 disables)",
+    )
+    gitinspector_max_output_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum GitInspector output captured per run",
+    )
+    gitinspector_text_fallback: bool = Field(
+        default=True,
+        description="Rerun GitInspector in text mode when the JSON run fails",
+    )
+    commit_backend: str = Field(
+        default="numstat",
+        description="Commit collection backend: 'numstat' (one git log per "
+        "repository) or 'gitpython' (one git diff per commit)",
+    )
+    collection_jobs: int = Field(
+        default=1,
+        ge=1,
+        description="Number of worker processes used to collect repositories",
+    )
+    transform_engine: str = Field(
+        default="python",
+        description="Statistics engine: 'python' (per-commit loops) or 'numpy' "
+        "(vectorized grouped reductions, requires numpy)",
+    )
+
+    # Cache Configuration
+    cache_dir: str = Field(
+        default=DEFAULT_CACHE_DIR, description="Directory for on-disk caches"
+    )
+    commit_cache: bool = Field(
+        default=False, description="Reuse commit stats cached from previous runs"
+    )
+    skip_unchanged_repos: bool = Field(
+        default=False,
+        description="Reuse previous results for repositories whose refs did not move",
+    )
+    rollups: bool = Field(
+        default=False,
+        description="Keep per-day rollups of collected commits in the cache directory",
+    )
 
     @field_validator("repository_paths")
     @classmethod
@@ -42,6 +158,36 @@ class Config(BaseModel):
                 raise ValueError(f"Path is not a git repository: {path}")
         return v
 
+    @field_validator("commit_backend")
+    @classmethod
+    def validate_commit_backend(cls, v):
+        """Validate the commit collection backend name."""
+        if v not in ("numstat", "gitpython"):
+            raise ValueError(f"Unknown commit backend: {v}")
+        return v
+
+    @field_validator("transform_engine")
+    @classmethod
+    def validate_transform_engine(cls, v):
+        """Validate the transform engine name."""
+        if v not in ("python", "numpy"):
+            raise ValueError(f"Unknown transform engine: {v}")
+        return v
+
+    @field_validator("slack_delivery_mode")
+    @classmethod
+    def validate_slack_delivery_mode(cls, v):
+        """Validate the Slack delivery mode."""
+        if v not in ("messages", "file", "auto"):
+            raise ValueError(f"Unknown Slack delivery mode: {v}")
+        return v
+
+    @field_validator("cache_dir")
+    @classmethod
+    def expand_cache_dir(cls, v):
+        """Expand a leading ~ in the cache directory."""
+        return os.path.expanduser(v)
+
     @model_validator(mode="after")
     def validate_slack_config(self):
         """Ensure at least one Slack configuration method is provided."""
@@ -74,12 +220,47 @@ def load_config(config_file: Optional[str] = None) -> Config:
     return Config(
         openai_api_key=os.getenv("OPENAI_API_KEY", ""),
         llm_model=os.getenv("LLM_MODEL", "gpt-4"),
+        llm_base_url=os.getenv("LLM_BASE_URL") or None,
+        prompt_token_budget=int(os.getenv("PROMPT_TOKEN_BUDGET", "12000")),
+        llm_map_reduce=_env_flag("LLM_MAP_REDUCE"),
+        llm_concurrency=int(os.getenv("LLM_CONCURRENCY", "4")),
+        llm_streaming=_env_flag("LLM_STREAMING"),
+        llm_max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "5")),
+        llm_retry_deadline=float(os.getenv("LLM_RETRY_DEADLINE", "300")),
+        llm_requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")),
+        llm_cache=_env_flag("LLM_CACHE", True),
+        llm_cache_ttl_hours=float(os.getenv("LLM_CACHE_TTL_HOURS", "24")),
+        llm_cache_max_mb=int(os.getenv("LLM_CACHE_MAX_MB", "50")),
         slack_token=os.getenv("SLACK_TOKEN"),
         slack_webhook_url=os.getenv("SLACK_WEBHOOK_URL"),
         slack_channel=os.getenv("SLACK_CHANNEL", "#general"),
+        slack_pool_size=int(os.getenv("SLACK_POOL_SIZE", "4")),
+        slack_delivery_mode=os.getenv("SLACK_DELIVERY_MODE", "messages"),
+        slack_outbox=_env_flag("SLACK_OUTBOX", True),
+        slack_outbox_max_attempts=int(os.getenv("SLACK_OUTBOX_MAX_ATTEMPTS", "5")),
         repository_paths=[],  # Will be set via CLI
         time_window_days=int(os.getenv("TIME_WINDOW_DAYS", "7")),
         start_date=None,
         end_date=None,
         gitinspector_path=os.getenv("GITINSPECTOR_PATH", "gitinspector"),
+        gitinspector_timeout=float(os.getenv("GITINSPECTOR_TIMEOUT", "600")),
+        gitinspector_max_output_bytes=int(
+            os.getenv("GITINSPECTOR_MAX_OUTPUT_BYTES", str(64 * 1024 * 1024))
+        ),
+        gitinspector_text_fallback=_env_flag("GITINSPECTOR_TEXT_FALLBACK", True),
+        commit_backend=os.getenv("COMMIT_BACKEND", "numstat"),
+        collection_jobs=int(os.getenv("COLLECTION_JOBS", "1")),
+        transform_engine=os.getenv("TRANSFORM_ENGINE", "python"),
+        cache_dir=os.getenv("CACHE_DIR", DEFAULT_CACHE_DIR),
+        commit_cache=_env_flag("COMMIT_CACHE"),
+        skip_unchanged_repos=_env_flag("SKIP_UNCHANGED_REPOS"),
+        rollups=_env_flag("ROLLUPS"),
     )
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag such as "true"/"1"/"yes" from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
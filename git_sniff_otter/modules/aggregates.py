@@ -0,0 +1,506 @@
+"""Mergeable partial aggregates of repository and author statistics.
+
+A partial summarizes any subset of commits (a repository, a day of a
+repository, a worker's share) and ``merge`` combines two partials into the
+partial of their union. Merging is associative and commutative, and folding
+any set of partials gives the same TransformedData as transforming the
+commits directly, so partials can be computed in parallel or cached and
+combined later without re-reading commits.
+
+The scalar transform depends on commit order (first-seen file types and
+authors, the most recent messages). Partials therefore record an explicit
+ordering key per commit, ``(repo_position, -timestamp, seq)``, which matches
+the collector's order: repositories as configured, commits newest first, and
+``seq`` keeping the original order of commits with identical timestamps.
+"""
+
+import heapq
+from collections import Counter
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .commit_table import EPOCH, MICROSECOND, NAIVE_EPOCH, file_extension
+from .data_collector import CommitData, RepositoryData
+from .data_transformer import (
+    RECENT_COMMIT_MESSAGES,
+    RECENT_COMMITS,
+    AuthorStats,
+    RepositoryStats,
+)
+
+# Bump when the serialized layout changes
+AGGREGATE_VERSION = 1
+
+CommitKey = Tuple[int, int, int]
+
+
+def commit_key(repo_position: int, date: datetime, seq: int) -> CommitKey:
+    """Build the ordering key of a commit; smaller keys were seen first."""
+    if date.utcoffset() is None:
+        timestamp = (date - NAIVE_EPOCH) // MICROSECOND
+    else:
+        timestamp = (date - EPOCH) // MICROSECOND
+    return (repo_position, -timestamp, seq)
+
+
+def _reposition(key: tuple, repo_position: int) -> tuple:
+    """Replace the repository position of a commit or file key."""
+    return (repo_position,) + tuple(key[1:])
+
+
+class FileTypeCounts:
+    """Extension counts that remember where each extension was first seen."""
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        # extension -> [count, key of first occurrence]
+        self.counts: Dict[str, list] = {}
+
+    def add(self, extension: str, key: tuple) -> None:
+        """Count one file with an extension."""
+        entry = self.counts.get(extension)
+        if entry is None:
+            self.counts[extension] = [1, key]
+        else:
+            entry[0] += 1
+            if key < entry[1]:
+                entry[1] = key
+
+    def update(self, other: "FileTypeCounts") -> None:
+        """Add another set of counts in place."""
+        for extension, (count, key) in other.counts.items():
+            entry = self.counts.get(extension)
+            if entry is None:
+                self.counts[extension] = [count, key]
+            else:
+                entry[0] += count
+                if key < entry[1]:
+                    entry[1] = key
+
+    def to_counter(self) -> Counter:
+        """Build a Counter filled in first-seen order, as the scalar engine does."""
+        ordered = sorted(self.counts.items(), key=lambda item: item[1][1])
+        return Counter({extension: entry[0] for extension, entry in ordered})
+
+    def to_list(self) -> List[list]:
+        """Serialize the counts."""
+        return [[ext, count, list(key)] for ext, (count, key) in self.counts.items()]
+
+    @classmethod
+    def from_list(cls, items: List[list]) -> "FileTypeCounts":
+        """Deserialize counts written by ``to_list``."""
+        counts = cls()
+        for extension, count, key in items:
+            counts.counts[extension] = [count, tuple(key)]
+        return counts
+
+
+class RepositoryAggregate:
+    """Partial statistics of one repository."""
+
+    __slots__ = (
+        "path",
+        "name",
+        "position",
+        "total_commits",
+        "unique_authors",
+        "total_insertions",
+        "total_deletions",
+        "files",
+        "file_types",
+        "timeline",
+    )
+
+    def __init__(self, path: str, name: str, position: int):
+        self.path = path
+        self.name = name
+        self.position = position
+        self.total_commits = 0
+        self.unique_authors = set()
+        self.total_insertions = 0
+        self.total_deletions = 0
+        self.files = set()
+        self.file_types = FileTypeCounts()
+        self.timeline: List[Tuple[CommitKey, Dict[str, Any]]] = []
+
+    def add_commit(self, commit: CommitData, key: CommitKey) -> None:
+        """Add a single commit."""
+        self.total_commits += 1
+        self.unique_authors.add(commit.author_email)
+        self.total_insertions += commit.insertions
+        self.total_deletions += commit.deletions
+        self.files.update(commit.files_changed)
+        for index, file_path in enumerate(commit.files_changed):
+            extension = file_extension(file_path)
+            if extension is not None:
+                self.file_types.add(extension, key + (index,))
+
+        # The timeline is kept sorted, so most commits are rejected right away
+        if len(self.timeline) < RECENT_COMMITS or key < self.timeline[-1][0]:
+            entry = {
+                "date": commit.date.isoformat(),
+                "author": commit.author_name,
+                "message": commit.message[:100],
+                "changes": commit.lines_changed,
+            }
+            self.timeline = heapq.nsmallest(
+                RECENT_COMMITS, self.timeline + [(key, entry)], key=itemgetter(0)
+            )
+
+    def update(self, other: "RepositoryAggregate") -> None:
+        """Merge another partial of the same repository in place."""
+        self.position = min(self.position, other.position)
+        self.total_commits += other.total_commits
+        self.unique_authors.update(other.unique_authors)
+        self.total_insertions += other.total_insertions
+        self.total_deletions += other.total_deletions
+        self.files.update(other.files)
+        self.file_types.update(other.file_types)
+        self.timeline = heapq.nsmallest(
+            RECENT_COMMITS, self.timeline + other.timeline, key=itemgetter(0)
+        )
+
+    def reposition(self, position: int) -> None:
+        """Move the repository to another position in the report order."""
+        self.position = position
+        self.file_types.counts = {
+            extension: [count, _reposition(key, position)]
+            for extension, (count, key) in self.file_types.counts.items()
+        }
+        self.timeline = [
+            (_reposition(key, position), entry) for key, entry in self.timeline
+        ]
+
+    def to_stats(self) -> RepositoryStats:
+        """Build the RepositoryStats this partial stands for."""
+        stats = RepositoryStats(RepositoryData(self.path, self.name))
+        stats.total_commits = self.total_commits
+        stats.unique_authors = set(self.unique_authors)
+        stats.total_insertions = self.total_insertions
+        stats.total_deletions = self.total_deletions
+        stats.total_files_changed = set(self.files)
+        stats.file_types = self.file_types.to_counter()
+        stats.commit_timeline = [dict(entry) for _, entry in self.timeline]
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible data."""
+        return {
+            "path": self.path,
+            "name": self.name,
+            "position": self.position,
+            "total_commits": self.total_commits,
+            "unique_authors": sorted(self.unique_authors),
+            "total_insertions": self.total_insertions,
+            "total_deletions": self.total_deletions,
+            "files": sorted(self.files),
+            "file_types": self.file_types.to_list(),
+            "timeline": [[list(key), entry] for key, entry in self.timeline],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RepositoryAggregate":
+        """Deserialize data written by ``to_dict``."""
+        aggregate = cls(data["path"], data["name"], data["position"])
+        aggregate.total_commits = data["total_commits"]
+        aggregate.unique_authors = set(data["unique_authors"])
+        aggregate.total_insertions = data["total_insertions"]
+        aggregate.total_deletions = data["total_deletions"]
+        aggregate.files = set(data["files"])
+        aggregate.file_types = FileTypeCounts.from_list(data["file_types"])
+        aggregate.timeline = [(tuple(key), entry) for key, entry in data["timeline"]]
+        return aggregate
+
+
+class AuthorAggregate:
+    """Partial statistics of one author."""
+
+    __slots__ = (
+        "name",
+        "email",
+        "first_key",
+        "total_commits",
+        "total_insertions",
+        "total_deletions",
+        "total_files_changed",
+        "repositories",
+        "file_types",
+        "messages",
+        "earliest",
+        "latest",
+    )
+
+    def __init__(self, name: str, email: str):
+        self.name = name
+        self.email = email
+        self.first_key: Optional[CommitKey] = None
+        self.total_commits = 0
+        self.total_insertions = 0
+        self.total_deletions = 0
+        self.total_files_changed = 0
+        self.repositories = set()
+        self.file_types = FileTypeCounts()
+        self.messages: List[Tuple[CommitKey, str]] = []
+        # (key, date) of the earliest and latest commit
+        self.earliest: Optional[Tuple[CommitKey, datetime]] = None
+        self.latest: Optional[Tuple[CommitKey, datetime]] = None
+
+    def add_commit(self, commit: CommitData, repo_name: str, key: CommitKey) -> None:
+        """Add a single commit."""
+        if self.first_key is None or key < self.first_key:
+            self.first_key = key
+        self.total_commits += 1
+        self.total_insertions += commit.insertions
+        self.total_deletions += commit.deletions
+        self.total_files_changed += len(commit.files_changed)
+        self.repositories.add(repo_name)
+        for index, file_path in enumerate(commit.files_changed):
+            extension = file_extension(file_path)
+            if extension is not None:
+                self.file_types.add(extension, key + (index,))
+        if len(self.messages) < RECENT_COMMIT_MESSAGES or key < self.messages[-1][0]:
+            self._merge_recent([(key, commit.message)])
+        self._merge_dates((key, commit.date), (key, commit.date))
+
+    def update(self, other: "AuthorAggregate") -> None:
+        """Merge another partial of the same author in place."""
+        if other.first_key is None:
+            return
+        if self.first_key is None or other.first_key < self.first_key:
+            self.first_key = other.first_key
+        self.total_commits += other.total_commits
+        self.total_insertions += other.total_insertions
+        self.total_deletions += other.total_deletions
+        self.total_files_changed += other.total_files_changed
+        self.repositories.update(other.repositories)
+        self.file_types.update(other.file_types)
+        self._merge_recent(other.messages)
+        self._merge_dates(other.earliest, other.latest)
+
+    def _merge_recent(self, messages: List[Tuple[CommitKey, str]]) -> None:
+        """Keep the first-seen messages of both lists."""
+        self.messages = heapq.nsmallest(
+            RECENT_COMMIT_MESSAGES, self.messages + messages, key=itemgetter(0)
+        )
+
+    def _merge_dates(self, earliest, latest) -> None:
+        """Keep the earliest and latest commits; equal dates keep the first seen."""
+        # key[1] is the negated timestamp
+        if self.earliest is None or (-earliest[0][1], earliest[0]) < (
+            -self.earliest[0][1],
+            self.earliest[0],
+        ):
+            self.earliest = earliest
+        if self.latest is None or (latest[0][1], latest[0]) < (
+            self.latest[0][1],
+            self.latest[0],
+        ):
+            self.latest = latest
+
+    def reposition(self, old_position: int, new_position: int) -> None:
+        """Rewrite the keys of commits from one repository position to another."""
+
+        def move(key):
+            return _reposition(key, new_position) if key[0] == old_position else key
+
+        if self.first_key is not None:
+            self.first_key = move(self.first_key)
+        self.file_types.counts = {
+            extension: [count, move(key)]
+            for extension, (count, key) in self.file_types.counts.items()
+        }
+        self.messages = sorted(
+            ((move(key), message) for key, message in self.messages), key=itemgetter(0)
+        )
+        if self.earliest is not None:
+            self.earliest = (move(self.earliest[0]), self.earliest[1])
+        if self.latest is not None:
+            self.latest = (move(self.latest[0]), self.latest[1])
+
+    def to_stats(self) -> AuthorStats:
+        """Build the AuthorStats this partial stands for."""
+        stats = AuthorStats(self.name, self.email)
+        stats.total_commits = self.total_commits
+        stats.total_insertions = self.total_insertions
+        stats.total_deletions = self.total_deletions
+        stats.total_files_changed = self.total_files_changed
+        stats.repositories = set(self.repositories)
+        stats.file_types = self.file_types.to_counter()
+        stats.commit_messages = [message for _, message in self.messages]
+        stats.first_commit_date = self.earliest[1] if self.earliest else None
+        stats.last_commit_date = self.latest[1] if self.latest else None
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible data."""
+
+        def dated(value):
+            return None if value is None else [list(value[0]), value[1].isoformat()]
+
+        return {
+            "name": self.name,
+            "email": self.email,
+            "first_key": None if self.first_key is None else list(self.first_key),
+            "total_commits": self.total_commits,
+            "total_insertions": self.total_insertions,
+            "total_deletions": self.total_deletions,
+            "total_files_changed": self.total_files_changed,
+            "repositories": sorted(self.repositories),
+            "file_types": self.file_types.to_list(),
+            "messages": [[list(key), message] for key, message in self.messages],
+            "earliest": dated(self.earliest),
+            "latest": dated(self.latest),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AuthorAggregate":
+        """Deserialize data written by ``to_dict``."""
+
+        def dated(value):
+            if value is None:
+                return None
+            return (tuple(value[0]), datetime.fromisoformat(value[1]))
+
+        aggregate = cls(data["name"], data["email"])
+        if data["first_key"] is not None:
+            aggregate.first_key = tuple(data["first_key"])
+        aggregate.total_commits = data["total_commits"]
+        aggregate.total_insertions = data["total_insertions"]
+        aggregate.total_deletions = data["total_deletions"]
+        aggregate.total_files_changed = data["total_files_changed"]
+        aggregate.repositories = set(data["repositories"])
+        aggregate.file_types = FileTypeCounts.from_list(data["file_types"])
+        aggregate.messages = [
+            (tuple(key), message) for key, message in data["messages"]
+        ]
+        aggregate.earliest = dated(data["earliest"])
+        aggregate.latest = dated(data["latest"])
+        return aggregate
+
+
+class AggregateState:
+    """Partial statistics of any set of commits; the empty state is the identity."""
+
+    __slots__ = ("repositories", "authors")
+
+    def __init__(self):
+        self.repositories: Dict[str, RepositoryAggregate] = {}
+        self.authors: Dict[Tuple[str, str], AuthorAggregate] = {}
+
+    @classmethod
+    def from_repository_data(
+        cls,
+        repo_data: RepositoryData,
+        position: int,
+        rows: Optional[Iterable[int]] = None,
+        first_seq: int = 0,
+    ) -> "AggregateState":
+        """Summarize a repository's commits, or only those at the given indices.
+
+        The repository is reported even without commits. ``first_seq`` offsets
+        the sequence numbers, placing these commits after ones with the same
+        timestamp that were summarized earlier.
+        """
+        if rows is None:
+            rows = range(len(repo_data.commits))
+        state = cls()
+        state.add_commits(
+            repo_data.path,
+            repo_data.name,
+            position,
+            ((first_seq + row, repo_data.commits[row]) for row in rows),
+        )
+        return state
+
+    def add_commits(
+        self,
+        path: str,
+        name: str,
+        position: int,
+        commits: Iterable[Tuple[int, CommitData]],
+    ) -> None:
+        """Add a repository's commits, given with their sequence numbers.
+
+        Commits are consumed one at a time, so they can be streamed. The
+        repository is added even without commits.
+        """
+        repo = self.repositories.get(path)
+        if repo is None:
+            repo = self.repositories[path] = RepositoryAggregate(path, name, position)
+        for seq, commit in commits:
+            key = commit_key(position, commit.date, seq)
+            repo.add_commit(commit, key)
+            author_key = (commit.author_name, commit.author_email)
+            author = self.authors.get(author_key)
+            if author is None:
+                author = self.authors[author_key] = AuthorAggregate(*author_key)
+            author.add_commit(commit, name, key)
+
+    def copy(self) -> "AggregateState":
+        """Make an independent copy."""
+        return AggregateState.from_dict(self.to_dict())
+
+    def update(self, other: "AggregateState") -> "AggregateState":
+        """Merge another state into this one in place."""
+        for path, repo in other.repositories.items():
+            if path in self.repositories:
+                self.repositories[path].update(repo)
+            else:
+                self.repositories[path] = RepositoryAggregate.from_dict(repo.to_dict())
+        for author_key, author in other.authors.items():
+            if author_key not in self.authors:
+                self.authors[author_key] = AuthorAggregate(*author_key)
+            self.authors[author_key].update(author)
+        return self
+
+    def merge(self, other: "AggregateState") -> "AggregateState":
+        """Return the state of both sets of commits, leaving both unchanged."""
+        return self.copy().update(other)
+
+    def reposition(self, path: str, position: int) -> None:
+        """Move a repository to another position in the report order.
+
+        Only valid for states holding that single repository, such as cached
+        per-repository partials loaded for a different repository list.
+        """
+        repo = self.repositories[path]
+        old_position = repo.position
+        repo.reposition(position)
+        for author in self.authors.values():
+            author.reposition(old_position, position)
+
+    def to_stats(self) -> Tuple[List[RepositoryStats], List[AuthorStats]]:
+        """Build repository stats in report order and authors in first-seen order."""
+        repositories = sorted(self.repositories.values(), key=lambda r: r.position)
+        authors = sorted(
+            (a for a in self.authors.values() if a.first_key is not None),
+            key=lambda a: a.first_key,
+        )
+        return (
+            [repo.to_stats() for repo in repositories],
+            [author.to_stats() for author in authors],
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible data."""
+        return {
+            "version": AGGREGATE_VERSION,
+            "repositories": [repo.to_dict() for repo in self.repositories.values()],
+            "authors": [author.to_dict() for author in self.authors.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AggregateState":
+        """Deserialize data written by ``to_dict``."""
+        if data.get("version") != AGGREGATE_VERSION:
+            raise ValueError(f"Unsupported aggregate version: {data.get('version')}")
+        state = cls()
+        for repo_data in data["repositories"]:
+            repo = RepositoryAggregate.from_dict(repo_data)
+            state.repositories[repo.path] = repo
+        for author_data in data["authors"]:
+            author = AuthorAggregate.from_dict(author_data)
+            state.authors[(author.name, author.email)] = author
+        return state
@@ -0,0 +1,108 @@
+"""Persistent SQLite store of collected commit data keyed by commit SHA."""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    author_name TEXT NOT NULL,
+    author_email TEXT NOT NULL,
+    message TEXT NOT NULL,
+    date TEXT NOT NULL,
+    files_changed TEXT NOT NULL,
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL,
+    lines_changed INTEGER NOT NULL
+)
+"""
+
+# SQLite limits the number of bound parameters per statement
+LOOKUP_BATCH_SIZE = 500
+
+
+class CommitCache:
+    """On-disk cache of commit fields keyed by SHA.
+
+    A commit's stats never change once it exists, so entries never expire.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the SQLite connection, creating the database on first use."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Parallel collectors share the file, so wait for locks instead of failing
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute(SCHEMA)
+        return self._connection
+
+    def get_many(self, shas: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up cached commit fields, counting hits and misses."""
+        shas = list(shas)
+        found: Dict[str, Dict[str, Any]] = {}
+
+        for i in range(0, len(shas), LOOKUP_BATCH_SIZE):
+            batch = shas[i : i + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT * FROM commits WHERE sha IN ({placeholders})", batch
+            )
+            for row in rows:
+                found[row[0]] = self._row_to_fields(row)
+
+        self.hits += len(found)
+        self.misses += len(shas) - len(found)
+        return found
+
+    def put_many(self, commits: Iterable[Any]) -> None:
+        """Store CommitData objects, replacing any previous entry for the same SHA."""
+        rows = [
+            (
+                commit.sha,
+                commit.author_name,
+                commit.author_email,
+                commit.message,
+                commit.date.isoformat(),
+                json.dumps(list(commit.files_changed)),
+                commit.insertions,
+                commit.deletions,
+                commit.lines_changed,
+            )
+            for commit in commits
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @staticmethod
+    def _row_to_fields(row) -> Dict[str, Any]:
+        """Convert a database row into CommitData fields."""
+        return {
+            "sha": row[0],
+            "author_name": row[1],
+            "author_email": row[2],
+            "message": row[3],
+            "date": datetime.fromisoformat(row[4]),
+            "files_changed": json.loads(row[5]),
+            "insertions": row[6],
+            "deletions": row[7],
+            "lines_changed": row[8],
+        }
@@ -0,0 +1,155 @@
+"""Columnar commit storage shared between the collector and the transformer."""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .data_collector import CommitData, GitInspectorData, RepositoryData
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# Offset column marker for naive dates, which are stored as wall-clock time
+NAIVE_OFFSET = -(2**31)
+
+
+def file_extension(file_path: str) -> Optional[str]:
+    """Get the lower-cased extension the statistics group a file under."""
+    if "." in file_path:
+        return file_path.split(".")[-1].lower()
+    return None
+
+
+class CommitTable:
+    """Commits stored as parallel columns instead of one object per commit.
+
+    Numeric fields live in ``array`` columns, authors, repositories and file
+    paths are dictionary-encoded, and the files of commit ``i`` are
+    ``file_ids[file_offsets[i]:file_offsets[i + 1]]`` (CSR layout). Rows are
+    appended repository by repository, in the order the repositories were
+    added, so each repository's rows are contiguous.
+    """
+
+    def __init__(self):
+        # Dictionaries
+        self.repositories: List[Tuple[str, str]] = []  # (path, name)
+        self.authors: List[Tuple[str, str]] = []  # (name, email)
+        self.paths: List[str] = []
+        self.gitinspector_data: List[Optional[GitInspectorData]] = []
+        self._author_ids: Dict[Tuple[str, str], int] = {}
+        self._path_ids: Dict[str, int] = {}
+
+        # Per-commit columns
+        self.shas: List[str] = []
+        self.messages: List[str] = []
+        self.timestamps = array("q")  # microseconds since the epoch
+        self.utc_offsets = array("i")  # seconds, or NAIVE_OFFSET
+        self.repo_ids = array("I")
+        self.author_ids = array("I")
+        self.insertions = array("q")
+        self.deletions = array("q")
+        self.lines_changed = array("q")
+
+        # File path index (CSR)
+        self.file_offsets = array("q", [0])
+        self.file_ids = array("I")
+
+    def __len__(self) -> int:
+        return len(self.shas)
+
+    @classmethod
+    def from_repository_data(
+        cls, repository_data_list: List[RepositoryData]
+    ) -> "CommitTable":
+        """Build a table from collected repository data."""
+        table = cls()
+        for repo_data in repository_data_list:
+            table.add_repository_data(repo_data)
+        return table
+
+    def add_repository_data(self, repo_data: RepositoryData) -> int:
+        """Append a repository and all of its commits, returning its ID."""
+        repo_id = len(self.repositories)
+        self.repositories.append((repo_data.path, repo_data.name))
+        self.gitinspector_data.append(repo_data.gitinspector_data)
+        for commit in repo_data.commits:
+            self._append_commit(repo_id, commit)
+        return repo_id
+
+    def _append_commit(self, repo_id: int, commit: CommitData) -> None:
+        """Append a single commit row."""
+        author_key = (commit.author_name, commit.author_email)
+        author_id = self._author_ids.get(author_key)
+        if author_id is None:
+            author_id = self._author_ids[author_key] = len(self.authors)
+            self.authors.append(author_key)
+
+        for path in commit.files_changed:
+            path_id = self._path_ids.get(path)
+            if path_id is None:
+                path_id = self._path_ids[path] = len(self.paths)
+                self.paths.append(path)
+            self.file_ids.append(path_id)
+        self.file_offsets.append(len(self.file_ids))
+
+        date = commit.date
+        offset = date.utcoffset()
+        self.shas.append(commit.sha)
+        self.messages.append(commit.message)
+        if offset is None:
+            self.timestamps.append((date - NAIVE_EPOCH) // MICROSECOND)
+            self.utc_offsets.append(NAIVE_OFFSET)
+        else:
+            self.timestamps.append((date - EPOCH) // MICROSECOND)
+            self.utc_offsets.append(int(offset.total_seconds()))
+        self.repo_ids.append(repo_id)
+        self.author_ids.append(author_id)
+        self.insertions.append(commit.insertions)
+        self.deletions.append(commit.deletions)
+        self.lines_changed.append(commit.lines_changed)
+
+    def date(self, row: int) -> datetime:
+        """Rebuild the commit date of a row with its original UTC offset."""
+        since_epoch = timedelta(microseconds=self.timestamps[row])
+        offset = self.utc_offsets[row]
+        if offset == NAIVE_OFFSET:
+            return NAIVE_EPOCH + since_epoch
+        return (EPOCH + since_epoch).astimezone(timezone(timedelta(seconds=offset)))
+
+    def file_paths(self, row: int) -> List[str]:
+        """Get the file paths changed by a row's commit."""
+        start, end = self.file_offsets[row], self.file_offsets[row + 1]
+        return [self.paths[path_id] for path_id in self.file_ids[start:end]]
+
+    def commit(self, row: int) -> CommitData:
+        """Materialize a row as a CommitData object."""
+        author_name, author_email = self.authors[self.author_ids[row]]
+        return CommitData.from_fields(
+            sha=self.shas[row],
+            author_name=author_name,
+            author_email=author_email,
+            message=self.messages[row],
+            date=self.date(row),
+            files_changed=self.file_paths(row),
+            insertions=self.insertions[row],
+            deletions=self.deletions[row],
+            lines_changed=self.lines_changed[row],
+        )
+
+    def iter_commits(self) -> Iterator[CommitData]:
+        """Yield every row as a CommitData object, for row-oriented callers."""
+        for row in range(len(self)):
+            yield self.commit(row)
+
+    def to_repository_data(self) -> List[RepositoryData]:
+        """Rebuild the row-oriented RepositoryData list the table was made from."""
+        repository_data_list = [
+            RepositoryData(path, name) for path, name in self.repositories
+        ]
+        for repo_data, gitinspector_data in zip(
+            repository_data_list, self.gitinspector_data
+        ):
+            repo_data.gitinspector_data = gitinspector_data
+        for row in range(len(self)):
+            repository_data_list[self.repo_ids[row]].commits.append(self.commit(row))
+        return repository_data_list
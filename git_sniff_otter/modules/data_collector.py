@@ -2,8 +2,13 @@
 
 import json
 import os
+import re
 import subprocess
-from typing import Any, Dict, List, Optional
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     from git import Commit, Repo
@@ -36,6 +41,29 @@ except ImportError:
     GitCommandError = Exception  # type: ignore
 
 from ..config import Config
+from ..utils.process import OutputLimitExceeded, ProcessTimeoutError, run_capped
+from .commit_cache import CommitCache
+from .git_log import (
+    LogRecord,
+    list_commit_shas,
+    list_dropped_commit_shas,
+    list_new_commit_shas,
+    stream_log,
+)
+from .repo_snapshots import (
+    RepositorySnapshot,
+    RepositorySnapshotStore,
+    read_ref_tips,
+    ref_tips_hash,
+)
+
+if TYPE_CHECKING:
+    # These modules build on the containers defined here
+    from .aggregates import AggregateState
+    from .commit_table import CommitTable
+    from .rollups import RollupCoverage
+
+OBJECT_ID = re.compile(r"[0-9a-f]{40}([0-9a-f]{24})?")
 
 
 class GitInspectorData:
@@ -62,19 +90,78 @@ class GitInspectorData:
 
 
 class CommitData:
-    """Container for commit information."""
+    """Container for commit information.
+
+    Instances are slotted and share interned author and path strings, since a
+    report can hold hundreds of thousands of them.
+    """
+
+    __slots__ = (
+        "sha",
+        "author_name",
+        "author_email",
+        "message",
+        "date",
+        "files_changed",
+        "insertions",
+        "deletions",
+        "lines_changed",
+    )
 
     def __init__(self, commit):
         self.sha = commit.hexsha
-        self.author_name = commit.author.name
-        self.author_email = commit.author.email
+        self.author_name = sys.intern(commit.author.name)
+        self.author_email = sys.intern(commit.author.email)
         self.message = commit.message.strip()
         self.date = commit.committed_datetime
-        self.files_changed = list(commit.stats.files.keys())
+        self.files_changed = tuple(sys.intern(path) for path in commit.stats.files)
         self.insertions = commit.stats.total["insertions"]
         self.deletions = commit.stats.total["deletions"]
         self.lines_changed = commit.stats.total["lines"]
 
+    @classmethod
+    def from_fields(
+        cls,
+        sha: str,
+        author_name: str,
+        author_email: str,
+        message: str,
+        date: datetime,
+        files_changed: Iterable[str],
+        insertions: int,
+        deletions: int,
+        lines_changed: int,
+    ) -> "CommitData":
+        """Create commit data from already extracted fields."""
+        commit_data = cls.__new__(cls)
+        commit_data.sha = sha
+        commit_data.author_name = sys.intern(author_name)
+        commit_data.author_email = sys.intern(author_email)
+        commit_data.message = message
+        commit_data.date = date
+        commit_data.files_changed = tuple(sys.intern(path) for path in files_changed)
+        commit_data.insertions = insertions
+        commit_data.deletions = deletions
+        commit_data.lines_changed = lines_changed
+        return commit_data
+
+    @classmethod
+    def from_log_record(cls, record: LogRecord) -> "CommitData":
+        """Create commit data from a parsed `git log --numstat` record."""
+        insertions = record.insertions
+        deletions = record.deletions
+        return cls.from_fields(
+            sha=record.sha,
+            author_name=record.author_name,
+            author_email=record.author_email,
+            message=record.message,
+            date=record.date,
+            files_changed=record.files_changed,
+            insertions=insertions,
+            deletions=deletions,
+            lines_changed=insertions + deletions,
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert commit data to dictionary."""
         return {
@@ -83,7 +170,7 @@ class CommitData:
             "author_email": self.author_email,
             "message": self.message,
             "date": self.date.isoformat(),
-            "files_changed": self.files_changed,
+            "files_changed": list(self.files_changed),
             "insertions": self.insertions,
             "deletions": self.deletions,
             "lines_changed": self.lines_changed,
@@ -98,6 +185,13 @@ class RepositoryData:
         self.name = name
         self.gitinspector_data: Optional[GitInspectorData] = None
         self.commits: List[CommitData] = []
+        self.timings: Dict[str, float] = {}
+        self.cache_stats: Dict[str, int] = {}
+        # "collected", "reused" (nothing re-run) or "reused-commits" (only
+        # GitInspector re-run) when unchanged repositories may be skipped
+        self.snapshot_status = "collected"
+        self.errors: Dict[str, str] = {}
+        self.gitinspector_failure: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert repository data to dictionary."""
@@ -124,41 +218,567 @@ class DataCollector:
 
     def __init__(self, config: Config):
         self.config = config
+        self.gitinspector_failures: List[Dict[str, Any]] = []
+        self.commit_cache: Optional[CommitCache] = None
+
+        if config.commit_cache:
+            self.commit_cache = CommitCache(
+                os.path.join(config.cache_dir, "commits.sqlite3")
+            )
+
+        self.snapshot_store: Optional[RepositorySnapshotStore] = None
+        if config.skip_unchanged_repos:
+            self.snapshot_store = RepositorySnapshotStore(
+                os.path.join(config.cache_dir, "snapshots")
+            )
+
+        self.rollup_store: Optional["RollupStore"] = None
+        if config.rollups:
+            from .rollups import RollupStore
+
+            self.rollup_store = RollupStore(
+                os.path.join(config.cache_dir, "rollups.sqlite3")
+            )
 
     def collect_all_data(self) -> List[RepositoryData]:
         """Collect data from all configured repositories."""
+        all_repo_data = list(self.iter_repository_data())
+        self._report_collection(all_repo_data)
+        return all_repo_data
+
+    def collect_table(self) -> "CommitTable":
+        """Collect all repositories into a columnar CommitTable.
+
+        Each repository's commits are moved into the table as soon as it is
+        collected, so only one repository's CommitData objects exist at a time
+        when collecting sequentially.
+        """
+        from .commit_table import CommitTable
+
+        table = CommitTable()
         all_repo_data = []
+        for repo_data in self.iter_repository_data():
+            table.add_repository_data(repo_data)
+            repo_data.commits = []
+            all_repo_data.append(repo_data)
+
+        self._report_collection(all_repo_data)
+        return table
+
+    def stream_repositories(
+        self,
+    ) -> Iterator[Tuple[RepositoryData, Iterator[CommitData]]]:
+        """Yield each repository with a lazy iterator over its commits.
 
+        Commits are parsed as git produces them and are not kept, so memory
+        does not grow with the number of commits. Each commit iterator must be
+        consumed before the next repository is requested. Commits arrive in
+        `git log` order rather than sorted by date. Repositories are processed
+        sequentially, and GitInspector, snapshots and rollups are not used.
+        """
         for repo_path in self.config.repository_paths:
             print(f"Processing repository: {repo_path}")
-            repo_data = self._collect_repository_data(repo_path)
-            all_repo_data.append(repo_data)
+            repo_data = RepositoryData(repo_path, os.path.basename(repo_path))
+            yield repo_data, self._iter_commits(repo_data)
+
+    def _iter_commits(self, repo_data: RepositoryData) -> Iterator[CommitData]:
+        """Yield a repository's commits in the configured window as they are read.
+
+        A failure ends the repository's commits early and is recorded in its
+        errors, like a failed collection.
+        """
+        repo_path = repo_data.path
+        since = self.config.analysis_start_date
+        until = self.config.analysis_end_date
+        started = time.perf_counter()
+        try:
+            if self.commit_cache:
+                # Cache lookups are batched, so cached commits come per repository
+                yield from self._collect_commits_cached(
+                    repo_path, self.commit_cache, since, until
+                )
+            elif self.config.commit_backend == "numstat":
+                for record in stream_log(repo_path, since=since, until=until):
+                    yield CommitData.from_log_record(record)
+            else:
+                repo = Repo(repo_path)
+                for commit in repo.iter_commits(all=True, since=since, until=until):
+                    yield CommitData(commit)
+        except Exception as e:
+            print(f"Warning: Failed to collect commits from {repo_path}: {e}")
+            repo_data.errors["commits"] = str(e)
+        finally:
+            repo_data.timings["commits"] = time.perf_counter() - started
+
+    def collect_rollups(self) -> List["AggregateState"]:
+        """Summarize every repository's window from daily rollups.
+
+        Whole days are loaded from the rollup store; days it does not cover
+        yet are collected and stored first, and partial days at the edges of
+        the window are collected live. GitInspector is not run. Returns one
+        AggregateState per repository, in input order.
+        """
+        from .aggregates import AggregateState
+
+        states = []
+        for position, repo_path in enumerate(self.config.repository_paths):
+            print(f"Processing repository: {repo_path}")
+            repo_data = RepositoryData(repo_path, os.path.basename(repo_path))
+            state = AggregateState.from_repository_data(repo_data, position)
+            try:
+                for partial in self._collect_repository_rollups(repo_data, position):
+                    state.update(partial)
+            except Exception as e:
+                print(f"Warning: Cannot use rollups for {repo_path}: {e}")
+                repo_data.commits = self._collect_commits(repo_path)
+                state.update(AggregateState.from_repository_data(repo_data, position))
+            states.append(state)
+        return states
+
+    def _collect_repository_rollups(
+        self, repo_data: RepositoryData, position: int
+    ) -> List["AggregateState"]:
+        """Get a repository's partials for the window: stored days plus live edges."""
+        from .aggregates import AggregateState
+        from .rollups import day_start, full_days, group_by_day
+
+        assert self.rollup_store is not None
+        repo_path, name = repo_data.path, repo_data.name
+        start_date = self.config.analysis_start_date
+        end_date = self.config.analysis_end_date
+        # Read the ref tips before collecting, like the snapshot store does
+        ref_tips = read_ref_tips(repo_path)
+        days = full_days(start_date, end_date)
+        partials = []
+        live_windows = [(start_date, end_date)]
+        collected_days = 0
+
+        if days is not None:
+            first_day, last_day = days
+            coverage = self._refresh_rollups(repo_path, name, ref_tips)
+            for gap_first, gap_last in self._missing_days(
+                coverage, first_day, last_day
+            ):
+                commits = self._collect_commits(
+                    repo_path, day_start(gap_first), self._day_end(gap_last)
+                )
+                self.rollup_store.save_days(
+                    repo_path,
+                    group_by_day(repo_path, name, commits, gap_first, gap_last),
+                    gap_first,
+                    gap_last,
+                    ref_tips,
+                )
+                collected_days += (gap_last - gap_first).days + 1
+
+            partials = self.rollup_store.load_days(repo_path, first_day, last_day)
+            for partial in partials:
+                partial.reposition(repo_path, position)
+
+            live_windows = [(day_start(last_day + timedelta(days=1)), end_date)]
+            if start_date < day_start(first_day):
+                live_windows.append((start_date, self._day_end(first_day, -1)))
+
+        for since, until in live_windows:
+            live = RepositoryData(repo_path, name)
+            live.commits = self._collect_commits(repo_path, since, until)
+            partials.append(AggregateState.from_repository_data(live, position))
+
+        if days is not None:
+            total_days = (days[1] - days[0]).days + 1
+            print(
+                f"Rollups for {name}: {total_days - collected_days} days reused, "
+                f"{collected_days} days collected"
+            )
+        return partials
+
+    def _refresh_rollups(
+        self, repo_path: str, name: str, ref_tips: Dict[str, str]
+    ) -> Optional["RollupCoverage"]:
+        """Bring a repository's rollups up to its current refs.
+
+        Commits that appeared since the rollups were computed (new commits,
+        merged branches with old dates) are added to the days they fall on.
+        Returns the coverage, or None if the rollups had to be dropped.
+        """
+        from .rollups import current_utc_offset, group_by_day
+
+        assert self.rollup_store is not None
+        coverage = self.rollup_store.coverage(repo_path)
+        if coverage is None:
+            return None
+        if coverage.utc_offset != current_utc_offset():
+            print(f"Rebuilding rollups of {repo_path}: the local UTC offset changed")
+            self.rollup_store.drop(repo_path)
+            return None
+        if coverage.ref_tips == ref_tips:
+            return coverage
+
+        known_tips = [
+            sha for sha in coverage.ref_tips.values() if OBJECT_ID.fullmatch(sha)
+        ]
+        try:
+            dropped = list_dropped_commit_shas(repo_path, known_tips)
+            if not dropped:
+                new_commits = self._read_commits(
+                    repo_path, list_new_commit_shas(repo_path, known_tips)
+                )
+        except Exception as e:
+            # e.g. history was rewritten and an old tip was garbage collected
+            print(f"Rebuilding rollups of {repo_path}: {e}")
+            self.rollup_store.drop(repo_path)
+            return None
+        if dropped:
+            # Stored days still count the commits that were rewritten away
+            print(
+                f"Rebuilding rollups of {repo_path}: history was rewritten, "
+                f"{len(dropped)} commits are no longer reachable"
+            )
+            self.rollup_store.drop(repo_path)
+            return None
 
-        return all_repo_data
+        self.rollup_store.add_commits(
+            repo_path,
+            group_by_day(
+                repo_path, name, new_commits, coverage.first_day, coverage.last_day
+            ),
+            ref_tips,
+        )
+        coverage.ref_tips = ref_tips
+        return coverage
+
+    def _record_rollups(
+        self, repo_data: RepositoryData, ref_tips: Dict[str, str]
+    ) -> None:
+        """Store the whole days of a freshly collected window as rollups."""
+        from .rollups import full_days, group_by_day
+
+        assert self.rollup_store is not None
+        days = full_days(self.config.analysis_start_date, self.config.analysis_end_date)
+        if days is None:
+            return
+
+        try:
+            self._refresh_rollups(repo_data.path, repo_data.name, ref_tips)
+            self.rollup_store.save_days(
+                repo_data.path,
+                group_by_day(repo_data.path, repo_data.name, repo_data.commits, *days),
+                *days,
+                ref_tips,
+            )
+        except Exception as e:
+            print(f"Warning: Failed to update rollups of {repo_data.path}: {e}")
+
+    @staticmethod
+    def _missing_days(
+        coverage: Optional["RollupCoverage"], first_day: date, last_day: date
+    ) -> List[Tuple[date, date]]:
+        """Get the ranges of days to collect so coverage includes a range.
+
+        Gaps between the range and the coverage are included, so coverage
+        stays contiguous.
+        """
+        if coverage is None:
+            return [(first_day, last_day)]
+
+        missing = []
+        if first_day < coverage.first_day:
+            missing.append((first_day, coverage.first_day - timedelta(days=1)))
+        if last_day > coverage.last_day:
+            missing.append((coverage.last_day + timedelta(days=1), last_day))
+        return missing
+
+    @staticmethod
+    def _day_end(day: date, offset_days: int = 0) -> datetime:
+        """Get the last second of a day; git windows are inclusive and in seconds."""
+        next_day = datetime.combine(
+            day + timedelta(days=offset_days + 1), datetime.min.time()
+        )
+        return next_day - timedelta(seconds=1)
+
+    def iter_repository_data(self) -> Iterator[RepositoryData]:
+        """Collect the configured repositories one by one, in input order."""
+        if self.config.collection_jobs > 1 and len(self.config.repository_paths) > 1:
+            yield from self._iter_repository_data_parallel()
+            return
+
+        for repo_path in self.config.repository_paths:
+            print(f"Processing repository: {repo_path}")
+            yield self._collect_repository_data(repo_path)
+
+    def _report_collection(self, all_repo_data: List[RepositoryData]) -> None:
+        """Print collection summaries and record GitInspector failures."""
+        self._print_timing_summary(all_repo_data)
+        self._print_cache_summary(all_repo_data)
+        self._print_snapshot_summary(all_repo_data)
+
+        self.gitinspector_failures = [
+            dict(repository=r.path, **r.gitinspector_failure)
+            for r in all_repo_data
+            if r.gitinspector_failure
+        ]
+        timed_out = [
+            f["repository"]
+            for f in self.gitinspector_failures
+            if f["reason"] == "timeout"
+        ]
+        if timed_out:
+            print(f"GitInspector timed out on: {', '.join(timed_out)}")
+
+    def _iter_repository_data_parallel(self) -> Iterator[RepositoryData]:
+        """Collect repositories in a process pool, keeping the input order."""
+        repo_paths = self.config.repository_paths
+        workers = min(self.config.collection_jobs, len(repo_paths))
+        print(f"Processing {len(repo_paths)} repositories with {workers} workers")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_collect_repository_worker, self.config, repo_path)
+                for repo_path in repo_paths
+            ]
+
+            for repo_path, future in zip(repo_paths, futures):
+                try:
+                    repo_data = future.result()
+                except Exception as e:
+                    # A crashed worker only costs this repository its data
+                    print(f"Warning: Failed to process repository {repo_path}: {e}")
+                    repo_data = RepositoryData(repo_path, os.path.basename(repo_path))
+                yield repo_data
 
     def _collect_repository_data(self, repo_path: str) -> RepositoryData:
-        """Collect data for a single repository."""
-        repo_name = os.path.basename(repo_path)
-        repo_data = RepositoryData(repo_path, repo_name)
+        """Collect data for a single repository, keeping its rollups current."""
+        if self.rollup_store is None:
+            return self._collect_repository_data_or_snapshot(repo_path)
 
-        # Collect GitInspector data
         try:
-            repo_data.gitinspector_data = self._run_gitinspector(repo_path)
+            ref_tips = read_ref_tips(repo_path)
         except Exception as e:
-            print(f"Warning: Failed to run GitInspector on {repo_path}: {e}")
+            print(
+                f"Warning: Cannot read refs of {repo_path}, not updating rollups: {e}"
+            )
+            return self._collect_repository_data_or_snapshot(repo_path)
+
+        repo_data = self._collect_repository_data_or_snapshot(repo_path)
+        if "commits" not in repo_data.errors:
+            self._record_rollups(repo_data, ref_tips)
+        return repo_data
+
+    def _collect_repository_data_or_snapshot(self, repo_path: str) -> RepositoryData:
+        """Collect data for a single repository, or reuse its snapshot."""
+        if self.snapshot_store is None:
+            return self._collect_repository_data_fresh(repo_path)
 
-        # Collect commit data
+        # Read the ref tips before collecting, so anything that moves while
+        # we collect invalidates the snapshot on the next run
         try:
-            repo_data.commits = self._collect_commits(repo_path)
+            ref_hash = ref_tips_hash(repo_path)
         except Exception as e:
-            print(f"Warning: Failed to collect commits from {repo_path}: {e}")
+            print(f"Warning: Cannot read refs of {repo_path}, not skipping: {e}")
+            return self._collect_repository_data_fresh(repo_path)
+
+        reused = self._reuse_snapshot(repo_path, ref_hash)
+        if reused is not None:
+            return reused
+
+        collected_at = datetime.now()
+        repo_data = self._collect_repository_data_fresh(repo_path)
+        if "commits" in repo_data.errors:
+            return repo_data
+
+        self.snapshot_store.save(
+            repo_path,
+            RepositorySnapshot(
+                ref_hash=ref_hash,
+                start_date=self.config.analysis_start_date,
+                end_date=self.config.analysis_end_date,
+                collected_at=collected_at,
+                repo_data=repo_data,
+            ),
+        )
+        return repo_data
+
+    def _reuse_snapshot(
+        self, repo_path: str, ref_hash: str
+    ) -> Optional[RepositoryData]:
+        """Rebuild repository data from a snapshot if the refs have not moved."""
+        assert self.snapshot_store is not None
+        snapshot = self.snapshot_store.load(repo_path)
+        start_date = self.config.analysis_start_date
+        end_date = self.config.analysis_end_date
+
+        if snapshot is None or snapshot.ref_hash != ref_hash:
+            return None
+        if not snapshot.covers(start_date, end_date):
+            return None
+
+        previous = snapshot.repo_data
+        repo_data = RepositoryData(repo_path, previous.name)
+        repo_data.commits = snapshot.commits_in_window(start_date, end_date)
+
+        # GitInspector only sees whole days, so its output can be reused as
+        # long as the window covers the same days and GitInspector succeeded
+        same_window = self._gitinspector_window(
+            snapshot.start_date, snapshot.end_date
+        ) == self._gitinspector_window(start_date, end_date)
+        failed = "gitinspector" in previous.errors
+        if same_window and not failed:
+            repo_data.gitinspector_data = previous.gitinspector_data
+            repo_data.snapshot_status = "reused"
+            print(
+                f"Skipping {repo_data.name}: refs unchanged since "
+                f"{snapshot.collected_at:%Y-%m-%d %H:%M}, reusing previous results"
+            )
+            return repo_data
+
+        repo_data.snapshot_status = "reused-commits"
+        reason = "it failed last time" if failed else "the window changed"
+        print(
+            f"Reusing commits for {repo_data.name}: refs unchanged since "
+            f"{snapshot.collected_at:%Y-%m-%d %H:%M}, re-running GitInspector "
+            f"as {reason}"
+        )
+        try:
+            repo_data.gitinspector_data = self._timed(
+                repo_data.timings, "gitinspector", self._run_gitinspector, repo_path
+            )
+        except Exception as e:
+            print(f"Warning: Failed to run GitInspector on {repo_path}: {e}")
+            repo_data.errors["gitinspector"] = str(e)
+            repo_data.gitinspector_failure = self._describe_gitinspector_failure(
+                e, repo_data.timings.get("gitinspector", 0.0)
+            )
+            return repo_data
+
+        if same_window:
+            # Keep the successful run so later runs can skip GitInspector
+            previous.gitinspector_data = repo_data.gitinspector_data
+            del previous.errors["gitinspector"]
+            previous.gitinspector_failure = None
+            self.snapshot_store.save(repo_path, snapshot)
+        return repo_data
+
+    @staticmethod
+    def _describe_gitinspector_failure(
+        error: Exception, elapsed: float
+    ) -> Dict[str, Any]:
+        """Build a structured record of why GitInspector failed."""
+        if isinstance(error, ProcessTimeoutError):
+            reason = "timeout"
+        elif isinstance(error, OutputLimitExceeded):
+            reason = "output_limit"
+        else:
+            reason = "error"
+        return {"reason": reason, "message": str(error), "elapsed": round(elapsed, 3)}
+
+    @staticmethod
+    def _gitinspector_window(start_date: datetime, end_date: datetime):
+        """Get the (since, until) day strings passed to GitInspector."""
+        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+
+    def _collect_repository_data_fresh(self, repo_path: str) -> RepositoryData:
+        """Collect data for a single repository from scratch."""
+        repo_name = os.path.basename(repo_path)
+        repo_data = RepositoryData(repo_path, repo_name)
+        started = time.perf_counter()
+
+        # GitInspector and the commit walk are independent, so the GitInspector
+        # subprocess runs in a helper thread while commits are parsed here
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            gitinspector_future = executor.submit(
+                self._timed,
+                repo_data.timings,
+                "gitinspector",
+                self._run_gitinspector,
+                repo_path,
+            )
+
+            # Collect commit data
+            if self.commit_cache:
+                hits, misses = self.commit_cache.hits, self.commit_cache.misses
+            try:
+                repo_data.commits = self._timed(
+                    repo_data.timings, "commits", self._collect_commits, repo_path
+                )
+            except Exception as e:
+                print(f"Warning: Failed to collect commits from {repo_path}: {e}")
+                repo_data.errors["commits"] = str(e)
+            if self.commit_cache:
+                repo_data.cache_stats = {
+                    "hits": self.commit_cache.hits - hits,
+                    "misses": self.commit_cache.misses - misses,
+                }
+
+            # Collect GitInspector data
+            try:
+                repo_data.gitinspector_data = gitinspector_future.result()
+            except Exception as e:
+                print(f"Warning: Failed to run GitInspector on {repo_path}: {e}")
+                repo_data.errors["gitinspector"] = str(e)
+                repo_data.gitinspector_failure = self._describe_gitinspector_failure(
+                    e, repo_data.timings.get("gitinspector", 0.0)
+                )
+
+        repo_data.timings["total"] = time.perf_counter() - started
+        print(f"Collected {repo_name}: {self._format_timings(repo_data.timings)}")
 
         return repo_data
 
+    @staticmethod
+    def _timed(timings: Dict[str, float], phase: str, func, *args):
+        """Call a function, recording its wall time under ``timings[phase]``."""
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            timings[phase] = time.perf_counter() - started
+
+    def _print_timing_summary(self, all_repo_data: List[RepositoryData]) -> None:
+        """Print the time spent in each collection phase, summed over repositories."""
+        totals: Dict[str, float] = {}
+        for repo_data in all_repo_data:
+            for phase, seconds in repo_data.timings.items():
+                totals[phase] = totals.get(phase, 0.0) + seconds
+
+        if totals:
+            print(f"Collection phase totals: {self._format_timings(totals)}")
+
+    def _print_cache_summary(self, all_repo_data: List[RepositoryData]) -> None:
+        """Print commit cache hit/miss counts summed over repositories."""
+        if not self.commit_cache:
+            return
+
+        hits = sum(r.cache_stats.get("hits", 0) for r in all_repo_data)
+        misses = sum(r.cache_stats.get("misses", 0) for r in all_repo_data)
+        print(f"Commit cache: {hits} hits, {misses} misses")
+
+    def _print_snapshot_summary(self, all_repo_data: List[RepositoryData]) -> None:
+        """Print how many repositories were skipped because their refs did not move."""
+        if not self.snapshot_store:
+            return
+
+        reused = sum(r.snapshot_status != "collected" for r in all_repo_data)
+        print(
+            f"Unchanged repositories: {reused} of {len(all_repo_data)} "
+            "reused from previous runs"
+        )
+
+    @staticmethod
+    def _format_timings(timings: Dict[str, float]) -> str:
+        """Format per-phase timings, e.g. 'commits 0.12s, gitinspector 1.50s'."""
+        return ", ".join(
+            f"{phase} {timings[phase]:.2f}s"
+            for phase in ("commits", "gitinspector", "total")
+            if phase in timings
+        )
+
     def _run_gitinspector(self, repo_path: str) -> GitInspectorData:
         """Run GitInspector on a repository and parse the output."""
         start_date = self.config.analysis_start_date.strftime("%Y-%m-%d")
         end_date = self.config.analysis_end_date.strftime("%Y-%m-%d")
+        # The time budget covers the JSON run and the text-mode rerun together
+        timeout = self.config.gitinspector_timeout
+        deadline = time.monotonic() + timeout if timeout else None
 
         # Run GitInspector with JSON output
         cmd = [
@@ -170,15 +790,16 @@ class DataCollector:
         ]
 
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, check=True, cwd=repo_path
-            )
+            output = self._run_gitinspector_command(cmd, repo_path, deadline)
 
             # Parse JSON output
-            json_data = json.loads(result.stdout)
-            return GitInspectorData(result.stdout, json_data)
+            json_data = json.loads(output)
+            return GitInspectorData(output, json_data)
 
         except subprocess.CalledProcessError:
+            if not self.config.gitinspector_text_fallback:
+                raise
+
             # If JSON format fails, try with text format
             cmd_text = [
                 self.config.gitinspector_path,
@@ -187,19 +808,17 @@ class DataCollector:
                 repo_path,
             ]
 
-            result = subprocess.run(
-                cmd_text, capture_output=True, text=True, check=True, cwd=repo_path
-            )
+            output = self._run_gitinspector_command(cmd_text, repo_path, deadline)
 
             # Create minimal JSON structure from text output
             json_data = {
                 "authors": [],
                 "file_types": {},
                 "timeline": [],
-                "raw_text": result.stdout,
+                "raw_text": output,
             }
 
-            return GitInspectorData(result.stdout, json_data)
+            return GitInspectorData(output, json_data)
 
         except json.JSONDecodeError:
             # Fallback to empty structure if JSON parsing fails
@@ -207,28 +826,116 @@ class DataCollector:
                 "authors": [],
                 "file_types": {},
                 "timeline": [],
-                "raw_text": result.stdout,
+                "raw_text": output,
             }
-            return GitInspectorData(result.stdout, json_data)
+            return GitInspectorData(output, json_data)
+
+    def _run_gitinspector_command(
+        self, cmd: List[str], repo_path: str, deadline: Optional[float]
+    ) -> str:
+        """Run a GitInspector command within what is left of the time budget."""
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                raise ProcessTimeoutError(cmd, self.config.gitinspector_timeout or 0)
+
+        return run_capped(
+            cmd,
+            cwd=repo_path,
+            timeout=timeout,
+            max_output_bytes=self.config.gitinspector_max_output_bytes,
+        )
+
+    def _collect_commits(
+        self,
+        repo_path: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[CommitData]:
+        """Collect commit data from a Git repository.
+
+        The window defaults to the configured analysis window.
+        """
+        if since is None:
+            since = self.config.analysis_start_date
+        if until is None:
+            until = self.config.analysis_end_date
+
+        if self.commit_cache:
+            commits = self._collect_commits_cached(
+                repo_path, self.commit_cache, since, until
+            )
+        elif self.config.commit_backend == "numstat":
+            commits = self._collect_commits_numstat(repo_path, since, until)
+        else:
+            commits = self._collect_commits_gitpython(repo_path, since, until)
+
+        # Sort commits by date (newest first)
+        commits.sort(key=lambda c: c.date, reverse=True)
+
+        return commits
+
+    def _collect_commits_cached(
+        self, repo_path: str, cache: CommitCache, since: datetime, until: datetime
+    ) -> List[CommitData]:
+        """Collect commits, computing stats only for SHAs missing from the cache."""
+        shas = list_commit_shas(repo_path, since=since, until=until)
+
+        commits_by_sha = {
+            sha: CommitData.from_fields(**fields)
+            for sha, fields in cache.get_many(shas).items()
+        }
+        missing = [sha for sha in shas if sha not in commits_by_sha]
+
+        if missing:
+            new_commits = self._read_commits(repo_path, missing)
+            cache.put_many(new_commits)
+            commits_by_sha.update((commit.sha, commit) for commit in new_commits)
+
+        # Keep `git log` order so the final date sort breaks ties the same way
+        return [commits_by_sha[sha] for sha in shas if sha in commits_by_sha]
+
+    def _read_commits(self, repo_path: str, shas: List[str]) -> List[CommitData]:
+        """Compute commit data for specific SHAs with the configured backend."""
+        if self.config.commit_backend == "numstat":
+            return [
+                CommitData.from_log_record(record)
+                for record in stream_log(repo_path, shas=shas)
+            ]
 
-    def _collect_commits(self, repo_path: str) -> List[CommitData]:
-        """Collect commit data from a Git repository."""
         repo = Repo(repo_path)
-        commits = []
+        return [CommitData(repo.commit(sha)) for sha in shas]
+
+    def _collect_commits_numstat(
+        self, repo_path: str, since: datetime, until: datetime
+    ) -> List[CommitData]:
+        """Collect commits with a single streamed `git log --numstat` run."""
+        return [
+            CommitData.from_log_record(record)
+            for record in stream_log(repo_path, since=since, until=until)
+        ]
 
-        start_date = self.config.analysis_start_date
-        end_date = self.config.analysis_end_date
+    def _collect_commits_gitpython(
+        self, repo_path: str, since: datetime, until: datetime
+    ) -> List[CommitData]:
+        """Collect commits through GitPython (one `git diff` per commit)."""
+        repo = Repo(repo_path)
+        commits = []
 
         try:
             # Get commits from all branches within the time window
-            for commit in repo.iter_commits(all=True, since=start_date, until=end_date):
+            for commit in repo.iter_commits(all=True, since=since, until=until):
                 commit_data = CommitData(commit)
                 commits.append(commit_data)
 
         except GitCommandError as e:
             print(f"Warning: Git command error in {repo_path}: {e}")
 
-        # Sort commits by date (newest first)
-        commits.sort(key=lambda c: c.date, reverse=True)
-
         return commits
+
+
+def _collect_repository_worker(config: Config, repo_path: str) -> RepositoryData:
+    """Process pool entry point collecting a single repository."""
+    print(f"Processing repository: {repo_path}")
+    return DataCollector(config)._collect_repository_data(repo_path)
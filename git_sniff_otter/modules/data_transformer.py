@@ -2,14 +2,35 @@
 
 from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from .commit_table import CommitTable, file_extension
 from .data_collector import CommitData, RepositoryData
 
+# Only this many messages/timeline entries are reported, so no more are kept
+RECENT_COMMIT_MESSAGES = 10
+RECENT_COMMITS = 20
+
+TRANSFORM_ENGINES = ("python", "numpy")
+
 
 class AuthorStats:
     """Statistics for a single author across all repositories."""
 
+    __slots__ = (
+        "name",
+        "email",
+        "total_commits",
+        "total_insertions",
+        "total_deletions",
+        "total_files_changed",
+        "repositories",
+        "file_types",
+        "commit_messages",
+        "first_commit_date",
+        "last_commit_date",
+    )
+
     def __init__(self, name: str, email: str):
         self.name = name
         self.email = email
@@ -30,12 +51,13 @@ class AuthorStats:
         self.total_deletions += commit.deletions
         self.total_files_changed += len(commit.files_changed)
         self.repositories.add(repo_name)
-        self.commit_messages.append(commit.message)
+        if len(self.commit_messages) < RECENT_COMMIT_MESSAGES:
+            self.commit_messages.append(commit.message)
 
         # Track file types
         for file_path in commit.files_changed:
-            if "." in file_path:
-                extension = file_path.split(".")[-1].lower()
+            extension = file_extension(file_path)
+            if extension is not None:
                 self.file_types[extension] += 1
 
         # Track date range
@@ -56,7 +78,7 @@ class AuthorStats:
             "total_files_changed": self.total_files_changed,
             "repositories": list(self.repositories),
             "top_file_types": dict(self.file_types.most_common(5)),
-            "recent_commit_messages": self.commit_messages[:10],  # Last 10 commits
+            "recent_commit_messages": self.commit_messages[:RECENT_COMMIT_MESSAGES],
             "first_commit_date": self.first_commit_date.isoformat()
             if self.first_commit_date
             else None,
@@ -76,6 +98,18 @@ class AuthorStats:
 class RepositoryStats:
     """Statistics for a single repository."""
 
+    __slots__ = (
+        "name",
+        "path",
+        "total_commits",
+        "unique_authors",
+        "total_insertions",
+        "total_deletions",
+        "total_files_changed",
+        "file_types",
+        "commit_timeline",
+    )
+
     def __init__(self, repo_data: RepositoryData):
         self.name = repo_data.name
         self.path = repo_data.path
@@ -95,18 +129,19 @@ class RepositoryStats:
 
             # Track file types
             for file_path in commit.files_changed:
-                if "." in file_path:
-                    extension = file_path.split(".")[-1].lower()
+                extension = file_extension(file_path)
+                if extension is not None:
                     self.file_types[extension] += 1
 
-            self.commit_timeline.append(
-                {
-                    "date": commit.date.isoformat(),
-                    "author": commit.author_name,
-                    "message": commit.message[:100],  # Truncate long messages
-                    "changes": commit.lines_changed,
-                }
-            )
+            if len(self.commit_timeline) < RECENT_COMMITS:
+                self.commit_timeline.append(
+                    {
+                        "date": commit.date.isoformat(),
+                        "author": commit.author_name,
+                        "message": commit.message[:100],  # Truncate long messages
+                        "changes": commit.lines_changed,
+                    }
+                )
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert repository stats to dictionary."""
@@ -120,10 +155,33 @@ class RepositoryStats:
             "net_lines": self.total_insertions - self.total_deletions,
             "total_files_changed": len(self.total_files_changed),
             "top_file_types": dict(self.file_types.most_common(10)),
-            "recent_commits": self.commit_timeline[:20],  # Last 20 commits
+            "recent_commits": self.commit_timeline[:RECENT_COMMITS],
         }
 
 
+class OverallStats:
+    """Totals across all repositories, accumulated alongside the per-repo stats."""
+
+    __slots__ = ("total_commits", "total_insertions", "total_deletions", "file_types")
+
+    def __init__(self):
+        self.total_commits = 0
+        self.total_insertions = 0
+        self.total_deletions = 0
+        self.file_types = Counter()
+
+    @classmethod
+    def from_repository_stats(cls, repo_stats: List[RepositoryStats]) -> "OverallStats":
+        """Sum up already computed repository statistics."""
+        overall = cls()
+        for repo in repo_stats:
+            overall.total_commits += repo.total_commits
+            overall.total_insertions += repo.total_insertions
+            overall.total_deletions += repo.total_deletions
+            overall.file_types.update(repo.file_types)
+        return overall
+
+
 class TransformedData:
     """Container for all transformed data ready for LLM processing."""
 
@@ -165,12 +223,235 @@ class TransformedData:
 class DataTransformer:
     """Main data transformation class."""
 
-    def __init__(self, start_date: datetime, end_date: datetime):
+    def __init__(
+        self, start_date: datetime, end_date: datetime, engine: str = "python"
+    ):
+        if engine not in TRANSFORM_ENGINES:
+            raise ValueError(f"Unknown transform engine: {engine}")
+        if engine == "numpy":
+            from . import numpy_engine
+
+            if not numpy_engine.is_available():
+                print("Warning: NumPy not installed. Using the python transform engine")
+                engine = "python"
+
         self.start_date = start_date
         self.end_date = end_date
+        self.engine = engine
 
     def transform(self, repository_data_list: List[RepositoryData]) -> TransformedData:
-        """Transform raw repository data into structured format for LLM."""
+        """Transform raw repository data into structured format for LLM.
+
+        Each commit is visited once: repository, author and overall statistics
+        are filled together, and each distinct path's extension is computed once.
+        """
+        if self.engine == "numpy":
+            return self.transform_table(
+                CommitTable.from_repository_data(repository_data_list)
+            )
+
+        repository_stats = []
+        authors: Dict[Tuple[str, str], AuthorStats] = {}
+        overall = OverallStats()
+        # Splitting paths is the costly part, so each distinct path is split once
+        extensions: Dict[str, Optional[str]] = {}
+
+        for repo_data in repository_data_list:
+            repo = RepositoryStats(RepositoryData(repo_data.path, repo_data.name))
+            repository_stats.append(repo)
+
+            for commit in repo_data.commits:
+                author_key = (commit.author_name, commit.author_email)
+                author = authors.get(author_key)
+                if author is None:
+                    author = authors[author_key] = AuthorStats(*author_key)
+
+                insertions = commit.insertions
+                deletions = commit.deletions
+                files_changed = commit.files_changed
+                date = commit.date
+
+                repo.total_commits += 1
+                repo.unique_authors.add(commit.author_email)
+                repo.total_insertions += insertions
+                repo.total_deletions += deletions
+                repo.total_files_changed.update(files_changed)
+
+                author.total_commits += 1
+                author.total_insertions += insertions
+                author.total_deletions += deletions
+                author.total_files_changed += len(files_changed)
+                author.repositories.add(repo.name)
+                if len(author.commit_messages) < RECENT_COMMIT_MESSAGES:
+                    author.commit_messages.append(commit.message)
+
+                overall.total_commits += 1
+                overall.total_insertions += insertions
+                overall.total_deletions += deletions
+
+                for file_path in files_changed:
+                    if file_path in extensions:
+                        extension = extensions[file_path]
+                    else:
+                        extension = extensions[file_path] = file_extension(file_path)
+                    if extension is not None:
+                        repo.file_types[extension] += 1
+                        author.file_types[extension] += 1
+                        overall.file_types[extension] += 1
+
+                if len(repo.commit_timeline) < RECENT_COMMITS:
+                    repo.commit_timeline.append(
+                        {
+                            "date": date.isoformat(),
+                            "author": commit.author_name,
+                            "message": commit.message[:100],
+                            "changes": commit.lines_changed,
+                        }
+                    )
+
+                if author.first_commit_date is None or date < author.first_commit_date:
+                    author.first_commit_date = date
+                if author.last_commit_date is None or date > author.last_commit_date:
+                    author.last_commit_date = date
+
+        return self._build_transformed(
+            repository_stats, list(authors.values()), overall
+        )
+
+    def transform_table(self, table: CommitTable) -> TransformedData:
+        """Transform a columnar commit table; same result as ``transform``.
+
+        Repository and author statistics are filled together in one pass over
+        the columns, and each distinct path's extension is computed once. The
+        numpy engine computes them with grouped reductions instead.
+        """
+        if self.engine == "numpy":
+            # Imported here because the engine builds on this module's classes
+            from . import numpy_engine
+
+            return self._build_transformed(*numpy_engine.aggregate(table))
+
+        repository_stats = [
+            RepositoryStats(RepositoryData(path, name))
+            for path, name in table.repositories
+        ]
+        authors: Dict[int, AuthorStats] = {}
+        overall = OverallStats()
+        extensions = [file_extension(path) for path in table.paths]
+        # First/last commit rows per author, resolved to dates at the end
+        first_rows: Dict[int, int] = {}
+        last_rows: Dict[int, int] = {}
+
+        paths = table.paths
+        timestamps = table.timestamps
+        file_offsets = table.file_offsets
+        file_ids = table.file_ids
+
+        for row in range(len(table)):
+            repo = repository_stats[table.repo_ids[row]]
+            author_id = table.author_ids[row]
+            author = authors.get(author_id)
+            if author is None:
+                author = authors[author_id] = AuthorStats(*table.authors[author_id])
+                first_rows[author_id] = last_rows[author_id] = row
+
+            insertions = table.insertions[row]
+            deletions = table.deletions[row]
+            row_file_ids = file_ids[file_offsets[row] : file_offsets[row + 1]]
+
+            repo.total_commits += 1
+            repo.unique_authors.add(author.email)
+            repo.total_insertions += insertions
+            repo.total_deletions += deletions
+
+            author.total_commits += 1
+            author.total_insertions += insertions
+            author.total_deletions += deletions
+            author.total_files_changed += len(row_file_ids)
+            author.repositories.add(repo.name)
+            if len(author.commit_messages) < RECENT_COMMIT_MESSAGES:
+                author.commit_messages.append(table.messages[row])
+
+            overall.total_commits += 1
+            overall.total_insertions += insertions
+            overall.total_deletions += deletions
+
+            for path_id in row_file_ids:
+                repo.total_files_changed.add(paths[path_id])
+                extension = extensions[path_id]
+                if extension is not None:
+                    repo.file_types[extension] += 1
+                    author.file_types[extension] += 1
+                    overall.file_types[extension] += 1
+
+            if len(repo.commit_timeline) < RECENT_COMMITS:
+                repo.commit_timeline.append(
+                    {
+                        "date": table.date(row).isoformat(),
+                        "author": author.name,
+                        "message": table.messages[row][:100],
+                        "changes": table.lines_changed[row],
+                    }
+                )
+
+            if timestamps[row] < timestamps[first_rows[author_id]]:
+                first_rows[author_id] = row
+            if timestamps[row] > timestamps[last_rows[author_id]]:
+                last_rows[author_id] = row
+
+        for author_id, author in authors.items():
+            author.first_commit_date = table.date(first_rows[author_id])
+            author.last_commit_date = table.date(last_rows[author_id])
+
+        return self._build_transformed(
+            repository_stats, list(authors.values()), overall
+        )
+
+    def transform_stream(
+        self, repositories: Iterable[Tuple[RepositoryData, Iterable[CommitData]]]
+    ) -> TransformedData:
+        """Transform repositories whose commits arrive as iterators.
+
+        Commits are folded into accumulators one at a time and never stored,
+        so memory grows with the number of authors and distinct files rather
+        than commits. Gives the same result as ``transform`` on the commits
+        sorted newest first, whatever order they arrive in.
+        """
+        # Imported here because aggregates builds on this module's classes
+        from .aggregates import AggregateState
+
+        state = AggregateState()
+        for position, (repo_data, commits) in enumerate(repositories):
+            state.add_commits(
+                repo_data.path, repo_data.name, position, enumerate(commits)
+            )
+        return self._build_transformed(*state.to_stats())
+
+    def transform_aggregates(self, states: Iterable[Any]) -> TransformedData:
+        """Fold partial aggregates (see ``aggregates.AggregateState``).
+
+        Gives the same result as transforming the commits they summarize,
+        whatever the order the partials arrive in.
+        """
+        # Imported here because aggregates builds on this module's classes
+        from .aggregates import AggregateState
+
+        folded = AggregateState()
+        for state in states:
+            folded.update(state)
+        return self._build_transformed(*folded.to_stats())
+
+    def _build_transformed(
+        self,
+        repository_stats: List[RepositoryStats],
+        author_stats: List[AuthorStats],
+        overall: Optional[OverallStats] = None,
+    ) -> TransformedData:
+        """Assemble the final TransformedData from repository and author stats.
+
+        Overall totals are summed from the repository stats unless they were
+        already accumulated during the transform.
+        """
         transformed = TransformedData()
 
         # Set time window information
@@ -180,65 +461,44 @@ class DataTransformer:
             "duration_days": (self.end_date - self.start_date).days,
         }
 
-        # Process repository statistics
-        transformed.repository_stats = [
-            RepositoryStats(repo_data) for repo_data in repository_data_list
-        ]
-
-        # Aggregate author statistics across all repositories
-        author_map = {}
-
-        for repo_data in repository_data_list:
-            for commit in repo_data.commits:
-                author_key = f"{commit.author_name}:{commit.author_email}"
-
-                if author_key not in author_map:
-                    author_map[author_key] = AuthorStats(
-                        commit.author_name, commit.author_email
-                    )
-
-                author_map[author_key].add_commit(commit, repo_data.name)
-
-        transformed.author_stats = list(author_map.values())
+        transformed.repository_stats = repository_stats
+        transformed.author_stats = author_stats
 
         # Sort authors by total commits (descending)
         transformed.author_stats.sort(key=lambda a: a.total_commits, reverse=True)
 
         # Generate overall statistics
         transformed.overall_stats = self._calculate_overall_stats(
-            transformed.repository_stats, transformed.author_stats
+            transformed.repository_stats, transformed.author_stats, overall
         )
 
         return transformed
 
     def _calculate_overall_stats(
-        self, repo_stats: List[RepositoryStats], author_stats: List[AuthorStats]
+        self,
+        repo_stats: List[RepositoryStats],
+        author_stats: List[AuthorStats],
+        overall: Optional[OverallStats] = None,
     ) -> Dict[str, Any]:
         """Calculate overall statistics across all repositories and authors."""
-        total_commits = sum(repo.total_commits for repo in repo_stats)
-        total_insertions = sum(repo.total_insertions for repo in repo_stats)
-        total_deletions = sum(repo.total_deletions for repo in repo_stats)
-
-        # Aggregate file types across all repositories
-        all_file_types = Counter()
-        for repo in repo_stats:
-            all_file_types.update(repo.file_types)
+        if overall is None:
+            overall = OverallStats.from_repository_stats(repo_stats)
 
         # Find most active authors
         top_authors = author_stats[:5]  # Top 5 authors by commits
 
         return {
-            "total_commits": total_commits,
-            "total_insertions": total_insertions,
-            "total_deletions": total_deletions,
-            "net_lines": total_insertions - total_deletions,
+            "total_commits": overall.total_commits,
+            "total_insertions": overall.total_insertions,
+            "total_deletions": overall.total_deletions,
+            "net_lines": overall.total_insertions - overall.total_deletions,
             "total_repositories": len(repo_stats),
             "total_authors": len(author_stats),
-            "top_file_types": dict(all_file_types.most_common(10)),
+            "top_file_types": dict(overall.file_types.most_common(10)),
             "top_authors_by_commits": [
                 {"name": author.name, "commits": author.total_commits}
                 for author in top_authors
             ],
-            "avg_commits_per_day": total_commits
+            "avg_commits_per_day": overall.total_commits
             / max((self.end_date - self.start_date).days, 1),
         }
@@ -0,0 +1,253 @@
+"""Streaming `git log --numstat` reader used as a fast commit collection backend."""
+
+import re
+import subprocess
+import tempfile
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Every record starts with an ASCII record separator so the stream can be cut
+# into commits without knowing where the (multi-line) message ends. Messages,
+# names and paths may contain the separator too, so it only starts a record
+# at the start of the output or after a NUL, when followed by a full (SHA-1 or
+# SHA-256) commit hash and a NUL: none of these fields can hold a NUL.
+RECORD_SEPARATOR = b"\x1e"
+RECORD_HASH = re.compile(rb"[0-9a-f]{40}(?:[0-9a-f]{24})?\0")
+# A separator this close to the end of the data read so far may still turn out
+# to start a record once the rest of its hash arrives
+RECORD_START_LENGTH = 66
+LOG_FORMAT = "--format=%x1e%H%x00%an%x00%ae%x00%cI%x00%B%x00"
+READ_CHUNK_SIZE = 64 * 1024
+
+# Mirror what GitPython's ``Commit.stats`` diffs against: the first parent,
+# with rename detection disabled.
+NUMSTAT_ARGS = ["--numstat", "-z", "--no-renames", "--diff-merges=first-parent"]
+
+
+class LogRecord:
+    """A single commit parsed from `git log --numstat` output."""
+
+    def __init__(
+        self,
+        sha: str,
+        author_name: str,
+        author_email: str,
+        message: str,
+        date: datetime,
+        files: List[Tuple[str, int, int]],
+    ):
+        self.sha = sha
+        self.author_name = author_name
+        self.author_email = author_email
+        self.message = message
+        self.date = date
+        self.files = files
+
+    @property
+    def files_changed(self) -> List[str]:
+        """Get the paths touched by the commit, in diff order."""
+        return [path for path, _, _ in self.files]
+
+    @property
+    def insertions(self) -> int:
+        """Get the total number of inserted lines."""
+        return sum(added for _, added, _ in self.files)
+
+    @property
+    def deletions(self) -> int:
+        """Get the total number of deleted lines."""
+        return sum(removed for _, _, removed in self.files)
+
+
+def parse_record(raw: bytes) -> LogRecord:
+    """Parse one record (without its leading separator) into a LogRecord."""
+    sha, author_name, author_email, date, message, numstat = raw.split(b"\0", 5)
+
+    files: List[Tuple[str, int, int]] = []
+    seen = {}
+    for entry in numstat.split(b"\0"):
+        # Only the newline ending the message precedes an entry; paths are
+        # NUL-terminated and kept verbatim
+        entry = entry.lstrip(b"\n")
+        if not entry:
+            continue
+        raw_added, raw_removed, raw_path = entry.split(b"\t", 2)
+        # Binary files are reported as "-" and count as zero lines, like GitPython
+        added = int(raw_added) if raw_added != b"-" else 0
+        removed = int(raw_removed) if raw_removed != b"-" else 0
+        path = raw_path.decode("utf-8", errors="replace")
+        if path in seen:
+            # GitPython keys stats by path, so a repeated path keeps its first
+            # position but the last counts
+            files[seen[path]] = (path, added, removed)
+        else:
+            seen[path] = len(files)
+            files.append((path, added, removed))
+
+    return LogRecord(
+        sha=sha.decode("ascii"),
+        author_name=author_name.decode("utf-8", errors="replace"),
+        author_email=author_email.decode("utf-8", errors="replace"),
+        message=message.decode("utf-8", errors="replace").strip(),
+        date=datetime.fromisoformat(date.decode("ascii")),
+        files=files,
+    )
+
+
+def iter_records(chunks: Iterator[bytes]) -> Iterator[LogRecord]:
+    """Incrementally cut a stream of output chunks into parsed records."""
+    # Unparsed output, trimmed once per chunk; only the data added since the
+    # last chunk is searched, so a record spanning many chunks is not re-scanned
+    pending = bytearray()
+    scan_from = 0
+    for chunk in chunks:
+        pending += chunk
+        start = 0
+        separator = pending.find(RECORD_SEPARATOR, scan_from)
+        while separator != -1:
+            if (separator == 0 or pending[separator - 1] == 0) and RECORD_HASH.match(
+                pending, separator + 1
+            ):
+                if separator > start:
+                    yield parse_record(bytes(pending[start:separator]))
+                start = separator + 1
+            separator = pending.find(RECORD_SEPARATOR, separator + 1)
+        del pending[:start]
+        scan_from = max(0, len(pending) - RECORD_START_LENGTH)
+
+    if pending:
+        yield parse_record(bytes(pending))
+
+
+def build_log_command(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    revisions: Sequence[str] = ("--all",),
+    git_path: str = "git",
+) -> List[str]:
+    """Build the `git log` command line for a time window."""
+    cmd = [git_path, "log", *NUMSTAT_ARGS, LOG_FORMAT]
+    cmd.extend(_window_args(since, until))
+    cmd.extend(revisions)
+    cmd.append("--")
+    return cmd
+
+
+def _window_args(since: Optional[datetime], until: Optional[datetime]) -> List[str]:
+    """Build --since/--until arguments for a time window."""
+    # Same string conversion GitPython applies to ``iter_commits`` kwargs
+    args = []
+    if since is not None:
+        args.append(f"--since={since}")
+    if until is not None:
+        args.append(f"--until={until}")
+    return args
+
+
+def list_commit_shas(
+    repo_path: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    git_path: str = "git",
+) -> List[str]:
+    """List the SHAs of all commits in a time window, in `git log` order."""
+    cmd = [git_path, "rev-list", *_window_args(since, until), "--all", "--"]
+    result = subprocess.run(
+        cmd, cwd=repo_path, capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+def list_new_commit_shas(
+    repo_path: str, known_tips: Sequence[str], git_path: str = "git"
+) -> List[str]:
+    """List commits reachable from any ref but not from the known tips.
+
+    These are all commits that appeared since the known tips were read,
+    whatever their dates. Fails if a known tip no longer exists.
+    """
+    cmd = [git_path, "rev-list", "--all", "--stdin", "--"]
+    result = subprocess.run(
+        cmd,
+        cwd=repo_path,
+        input="".join(f"^{sha}\n" for sha in known_tips),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def list_dropped_commit_shas(
+    repo_path: str, known_tips: Sequence[str], git_path: str = "git"
+) -> List[str]:
+    """List commits reachable from the known tips but no longer from any ref.
+
+    These are the commits an amend, rebase, force-push or branch deletion
+    removed from the history. Fails if a known tip no longer exists.
+    """
+    # Revisions read from stdin are not affected by the --not before them
+    cmd = [git_path, "rev-list", "--stdin", "--not", "--all", "--"]
+    result = subprocess.run(
+        cmd,
+        cwd=repo_path,
+        input="".join(f"{sha}\n" for sha in known_tips),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def stream_log(
+    repo_path: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    git_path: str = "git",
+    shas: Optional[Sequence[str]] = None,
+) -> Iterator[LogRecord]:
+    """Run a single `git log --all --numstat` and yield commits as they arrive.
+
+    When ``shas`` is given, only those commits are read (without walking their
+    history) and the time window is ignored.
+    """
+    if shas is not None:
+        if not shas:
+            return
+        cmd = [git_path, "log", *NUMSTAT_ARGS, LOG_FORMAT]
+        cmd.extend(["--no-walk=unsorted", "--stdin", "--"])
+    else:
+        cmd = build_log_command(since, until, git_path=git_path)
+
+    # stderr goes to a file so a chatty git cannot block on a full pipe while
+    # we are busy reading stdout
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(
+            cmd,
+            cwd=repo_path,
+            stdin=subprocess.PIPE if shas is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+        )
+        stdout = process.stdout
+        assert stdout is not None
+
+        if shas is not None and process.stdin is not None:
+            # git reads every revision from stdin before it starts writing
+            process.stdin.write("".join(f"{sha}\n" for sha in shas).encode())
+            process.stdin.close()
+
+        try:
+            chunks = iter(lambda: stdout.read(READ_CHUNK_SIZE), b"")
+            yield from iter_records(chunks)
+        finally:
+            stdout.close()
+            returncode = process.wait()
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(
+                returncode,
+                cmd,
+                stderr=stderr_file.read().decode("utf-8", errors="replace"),
+            )
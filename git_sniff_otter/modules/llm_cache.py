@@ -0,0 +1,134 @@
+"""Persistent SQLite cache of LLM responses keyed by a hash of the request."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def request_key(
+    endpoint: str, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]
+) -> str:
+    """Hash everything that determines a chat completion request.
+
+    The endpoint is part of the key, so responses of another API (such as a
+    local stub server) are never returned for the same model and prompt.
+    """
+    request = {
+        "endpoint": endpoint,
+        "model": model,
+        "messages": messages,
+        "params": params,
+    }
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """On-disk cache of LLM responses with a time to live and LRU eviction.
+
+    Entries older than ``ttl_seconds`` are never returned (0 keeps them
+    forever). When the stored responses grow beyond ``max_bytes``, the least
+    recently used ones are evicted. The connection is shared between
+    threads behind a lock, so the cache can be used off the event loop.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the SQLite connection, creating the database on first use."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False
+            )
+            self._connection.execute(SCHEMA)
+        return self._connection
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a fresh response, counting hits and misses."""
+        now = time.time()
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                with self.connection:
+                    self.connection.execute(
+                        "DELETE FROM responses WHERE key = ?", (key,)
+                    )
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, content: str) -> None:
+        """Store a response, then evict the least recently used ones over the limit."""
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, content, size, now, now),
+            )
+            self._evict()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _evict(self) -> None:
+        """Delete expired entries and the least recently used ones over the limit."""
+        if self.ttl_seconds:
+            self.connection.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+
+        (total,) = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self.connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_used, created_at"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self.connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
@@ -1,16 +1,18 @@
 """LLM integration module for generating human-readable reports."""
 
-import json
-from typing import Any, Dict
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 try:
-    from openai import OpenAI
+    from openai import APIConnectionError, AsyncOpenAI, OpenAI
 except ImportError:
     # Handle case where OpenAI library is not installed
     print("Warning: OpenAI library not installed. LLM features may not work.")
 
     class MockOpenAI:
-        def __init__(self, api_key: str):
+        def __init__(self, api_key: str, **kwargs):
             self.api_key = api_key
 
         @property
@@ -32,9 +34,21 @@ except ImportError:
             return MockChat()
 
     OpenAI = MockOpenAI  # type: ignore
+    AsyncOpenAI = None  # type: ignore
+    APIConnectionError = ConnectionError  # type: ignore
 
 from ..config import Config
+from ..utils.retry import RetryPolicy, shared_limiter
 from .data_transformer import TransformedData
+from .llm_cache import ResponseCache, request_key
+from .prompt_builder import PromptBuilder
+from .report_stream import ReportSink, SectionDelivery
+
+# Sampling parameters sent with every report request
+COMPLETION_PARAMS = {"max_tokens": 4000, "temperature": 0.7}
+
+# Sampling parameters of per-repository summaries in map-reduce mode
+REPOSITORY_COMPLETION_PARAMS = {"max_tokens": 400, "temperature": 0.7}
 
 
 class LLMReportGenerator:
@@ -42,7 +56,34 @@ class LLMReportGenerator:
 
     def __init__(self, config: Config):
         self.config = config
-        self.client = OpenAI(api_key=config.openai_api_key)
+        # Retries are left to the retry policy, which shares its limiter
+        # with every other generator in the process
+        client_options = {"api_key": config.openai_api_key, "max_retries": 0}
+        if config.llm_base_url:
+            client_options["base_url"] = config.llm_base_url
+        self.client = OpenAI(**client_options)
+        self.async_client = AsyncOpenAI(**client_options) if AsyncOpenAI else None
+        self.retry_policy = RetryPolicy(
+            max_attempts=config.llm_max_attempts,
+            deadline=config.llm_retry_deadline or None,
+            limiter=shared_limiter(
+                f"llm:{config.llm_base_url or 'openai'}",
+                config.llm_requests_per_minute,
+                burst=config.llm_concurrency,
+            ),
+            transient_errors=(APIConnectionError,),
+        )
+        self.prompt_builder = PromptBuilder(
+            config.prompt_token_budget, model=config.llm_model
+        )
+        self.last_prompt = None
+        self.response_cache: Optional[ResponseCache] = None
+        if config.llm_cache:
+            self.response_cache = ResponseCache(
+                os.path.join(config.cache_dir, "llm_responses.sqlite3"),
+                ttl_seconds=config.llm_cache_ttl_hours * 3600,
+                max_bytes=config.llm_cache_max_mb * 1024 * 1024,
+            )
 
     def generate_report(self, transformed_data: TransformedData) -> str:
         """Generate a comprehensive report from transformed data."""
@@ -50,33 +91,169 @@ class LLMReportGenerator:
         # Prepare the data for the LLM
         data_dict = transformed_data.to_dict()
 
-        # Create the system prompt
-        system_prompt = self._create_system_prompt()
+        messages = self._create_messages(data_dict)
+        (content,) = self._complete_all([messages], COMPLETION_PARAMS)
+        if isinstance(content, Exception):
+            print(f"Error generating LLM report: {content}")
+            # Return a fallback report
+            return self._generate_fallback_report(data_dict)
+        return content or "No response from LLM"
+
+    async def stream_report(
+        self, transformed_data: TransformedData, sinks: List[ReportSink]
+    ) -> str:
+        """Generate the report with a streamed response, section by section.
+
+        Every markdown section is passed to the sinks as soon as it has been
+        generated, instead of once the whole report is complete. Building the
+        prompt (which may summarize repositories first) and the cache lookups
+        run in worker threads, so the sinks keep running meanwhile.
+        """
+        loop = asyncio.get_running_loop()
+        data_dict = transformed_data.to_dict()
+        messages = await loop.run_in_executor(None, self._create_messages, data_dict)
+        delivery = SectionDelivery(sinks)
 
-        # Create the user prompt with data
-        user_prompt = self._create_user_prompt(data_dict)
+        key = self._request_key(messages, COMPLETION_PARAMS)
+        cached = None
+        if self.response_cache:
+            cached = await loop.run_in_executor(None, self.response_cache.get, key)
+        if cached is not None:
+            delivery.feed(cached)
+            return await delivery.finish()
 
         try:
-            response = self.client.chat.completions.create(
+            if self.async_client is None:
+                raise RuntimeError("OpenAI library not installed")
+            # Only opening the stream is retried; sections may already be
+            # delivered once it is read
+            stream = await self.retry_policy.acall(
+                self.async_client.chat.completions.create,
                 model=self.config.llm_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                max_tokens=4000,
-                temperature=0.7,
+                messages=messages,
+                stream=True,
+                **COMPLETION_PARAMS,
             )
-
-            content = response.choices[0].message.content
-            return content.strip() if content else "No response from LLM"
-
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    delivery.feed(chunk.choices[0].delta.content)
         except Exception as e:
             print(f"Error generating LLM report: {e}")
-            # Return a fallback report
-            return self._generate_fallback_report(data_dict)
+            # Sections already sent cannot be taken back, so only a report
+            # that failed before its first section is replaced
+            if delivery.restart():
+                delivery.feed(self._generate_fallback_report(data_dict))
+            return await delivery.finish()
+
+        content = await delivery.finish()
+        if not content:
+            return "No response from LLM"
+        if self.response_cache:
+            await loop.run_in_executor(
+                None, self.response_cache.put, key, self.config.llm_model, content
+            )
+        return content
+
+    def _create_messages(self, data: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Create the chat messages requesting the report."""
+        # Summarize repositories separately first in map-reduce mode
+        repository_summaries = None
+        if self.config.llm_map_reduce and data.get("repository_stats"):
+            repository_summaries = self._summarize_repositories(data)
+
+        user_prompt = self._create_user_prompt(data, repository_summaries)
+        print(self.last_prompt.describe(self.config.prompt_token_budget))
+        return [
+            {"role": "system", "content": self._create_system_prompt()},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _summarize_repositories(self, data: Dict[str, Any]) -> List[str]:
+        """Summarize every repository in its own, concurrently sent request."""
+        repositories = data["repository_stats"]
+        system_prompt = self._create_repository_system_prompt()
+        requests = [
+            [
+                {"role": "system", "content": system_prompt},
+                {
+                    "role": "user",
+                    "content": self.prompt_builder.build_repository(
+                        repo, data.get("time_window", {})
+                    ).text,
+                },
+            ]
+            for repo in repositories
+        ]
+
+        summaries = []
+        results = self._complete_all(requests, REPOSITORY_COMPLETION_PARAMS)
+        for repo, result in zip(repositories, results):
+            if isinstance(result, Exception) or not result:
+                print(
+                    f"Error summarizing {repo.get('name')}: {result or 'no response'}"
+                )
+                result = self._generate_fallback_summary(repo)
+            summaries.append(result)
+        return summaries
+
+    def _request_key(
+        self, messages: List[Dict[str, str]], params: Dict[str, Any]
+    ) -> str:
+        """Get the response cache key of a request to the configured endpoint."""
+        return request_key(
+            self.config.llm_base_url or "openai",
+            self.config.llm_model,
+            messages,
+            params,
+        )
+
+    def _complete_all(
+        self, requests: List[List[Dict[str, str]]], params: Dict[str, Any]
+    ) -> List[Any]:
+        """Get chat completions from the response cache or concurrently from the LLM.
+
+        At most ``llm_concurrency`` requests are in flight. The cache is only
+        used from the calling thread. A failed request's result is its exception.
+        """
+        keys = [self._request_key(m, params) for m in requests]
+        results: List[Any] = [
+            self.response_cache.get(key) if self.response_cache else None
+            for key in keys
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        workers = min(self.config.llm_concurrency, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                i: executor.submit(self._request, requests[i], params) for i in missing
+            }
+            for i, future in futures.items():
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = e
+                    continue
+                if self.response_cache and results[i]:
+                    self.response_cache.put(keys[i], self.config.llm_model, results[i])
+        return results
+
+    def _request(self, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """Send a chat completion request with retries; return its stripped content."""
+        response = self.retry_policy.call(
+            self.client.chat.completions.create,
+            model=self.config.llm_model,
+            messages=messages,
+            **params,
+        )
+        content = response.choices[0].message.content
+        return content.strip() if content else ""
 
     def _create_system_prompt(self) -> str:
         """Create the system prompt for the LLM."""
+        if self.config.llm_system_prompt:
+            return self.config.llm_system_prompt
         return """You are a technical report writer specializing in Git repository analysis. 
         
 Your task is to create comprehensive, well-structured reports based on Git repository statistics and commit data. The reports should be:
@@ -95,42 +272,31 @@ Report Structure:
 
 Use markdown formatting for better readability. Focus on trends, patterns, and notable contributions rather than just listing numbers."""
 
-    def _create_user_prompt(self, data: Dict[str, Any]) -> str:
-        """Create the user prompt with the data."""
-        time_window = data.get("time_window", {})
-        start_date = time_window.get("start_date", "Unknown")
-        end_date = time_window.get("end_date", "Unknown")
-        duration = time_window.get("duration_days", 0)
-
-        prompt = f"""Please generate a comprehensive Git repository analysis report for the period from {start_date} to {end_date} ({duration} days).
-
-Here is the data to analyze:
-
-## Overall Statistics
-{json.dumps(data.get("overall_stats", {}), indent=2)}
-
-## Summary
-{json.dumps(data.get("summary", {}), indent=2)}
-
-## Repository Details
-{json.dumps(data.get("repository_stats", []), indent=2)}
-
-## Author Contributions
-{json.dumps(data.get("author_stats", []), indent=2)}
-
-## Time Window
-{json.dumps(time_window, indent=2)}
-
-Please create a report that includes:
-1. An executive summary highlighting the most important findings
-2. Overall activity analysis (total commits, contributors, repositories)
-3. Per-repository breakdown with key metrics
-4. Individual contributor analysis with their key contributions
-5. Notable patterns, trends, or insights from the data
-
-Make the report engaging and informative for both technical and non-technical stakeholders."""
-
-        return prompt
+    def _create_repository_system_prompt(self) -> str:
+        """Create the system prompt for per-repository summaries."""
+        return (
+            "You are a technical report writer specializing in Git repository "
+            "analysis.\n\n"
+            "You summarize the statistics of a single repository for a larger team "
+            "report. Be concise and factual, and mention specific contributors and "
+            "changes where they stand out."
+        )
+
+    def _create_user_prompt(
+        self, data: Dict[str, Any], repository_summaries: Optional[List[str]] = None
+    ) -> str:
+        """Create the user prompt with the data, compacted to the token budget."""
+        self.last_prompt = self.prompt_builder.build(data, repository_summaries)
+        return self.last_prompt.text
+
+    def _generate_fallback_summary(self, repo: Dict[str, Any]) -> str:
+        """Generate a basic repository summary if its LLM request fails."""
+        return (
+            f"{repo.get('total_commits', 0)} commits by "
+            f"{repo.get('unique_authors', 0)} contributors, "
+            f"+{repo.get('total_insertions', 0):,}/-{repo.get('total_deletions', 0):,} "
+            f"lines in {repo.get('total_files_changed', 0)} files."
+        )
 
     def _generate_fallback_report(self, data: Dict[str, Any]) -> str:
         """Generate a basic fallback report if LLM fails."""
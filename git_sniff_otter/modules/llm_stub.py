@@ -0,0 +1,246 @@
+"""Local OpenAI-compatible chat completion server with simulated model behavior.
+
+Responses are deterministic for a given request and seed, so runs against the
+stub can be compared; latency, streaming speed and injected errors follow the
+configured settings.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from .prompt_builder import estimate_tokens
+
+WORDS = (
+    "commits repository contributors changes activity release refactoring tests "
+    "documentation feature fixes review pipeline module performance cleanup "
+    "dependencies configuration migration steady notable increase focus team"
+).split()
+
+SECTIONS = (
+    "Executive Summary",
+    "Overall Repository Activity",
+    "Repository-Specific Analysis",
+    "Individual Contributor Analysis",
+    "Key Insights and Observations",
+)
+
+
+class StubSettings:
+    """Simulated model behavior of the stub server."""
+
+    def __init__(
+        self,
+        latency_ms: float = 500,
+        latency_sigma: float = 0.5,
+        tokens_per_second: float = 50,
+        response_tokens: int = 600,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        # Time to first token is lognormal with this median (sigma 0 is fixed)
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.response_tokens = response_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.seed = seed
+
+
+def generate_tokens(request: Dict[str, Any], settings: StubSettings) -> List[str]:
+    """Generate a markdown report, as tokens, determined by the request."""
+    canonical = json.dumps(
+        [request.get("model"), request.get("messages")], sort_keys=True
+    )
+    digest = hashlib.sha256(f"{settings.seed}:{canonical}".encode("utf-8")).digest()
+    rng = random.Random(digest)
+
+    max_tokens = request.get("max_tokens") or settings.response_tokens
+    count = min(settings.response_tokens, max_tokens)
+    tokens = ["# Git Repository Analysis Report", "\n"]
+    section = 0
+    while len(tokens) < count:
+        if section < len(SECTIONS) and len(tokens) >= section * count / len(SECTIONS):
+            tokens.extend(["\n\n## ", SECTIONS[section], "\n"])
+            section += 1
+        tokens.append(rng.choice(WORDS) + rng.choice(("", "", "", ".", ",")) + " ")
+    return tokens[:count]
+
+
+class LLMStubServer:
+    """Threaded HTTP server answering `/v1/chat/completions` like the OpenAI API."""
+
+    def __init__(self, settings: StubSettings, host: str = "127.0.0.1", port: int = 0):
+        self.settings = settings
+        self.requests = 0
+        self.errors = 0
+        # Errors and latencies are drawn in request order from one seeded source
+        self._rng = random.Random(settings.seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """Get the base URL to configure as LLM_BASE_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def serve_forever(self) -> None:
+        """Serve requests until shut down."""
+        self.httpd.serve_forever()
+
+    def start(self) -> "LLMStubServer":
+        """Serve requests on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        """Stop serving and release the port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _draw(self) -> Tuple[Optional[int], float]:
+        """Draw the next request's injected error status and first token delay."""
+        settings = self.settings
+        with self._lock:
+            self.requests += 1
+            roll = self._rng.random()
+            latency = settings.latency_ms / 1000
+            if settings.latency_sigma > 0:
+                latency *= self._rng.lognormvariate(0, settings.latency_sigma)
+            status = None
+            if roll < settings.rate_limit_rate:
+                status = 429
+            elif roll < settings.rate_limit_rate + settings.error_rate:
+                status = 500
+            if status:
+                self.errors += 1
+        return status, latency
+
+    def _handler_class(self):
+        """Build the request handler bound to this server."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/models"):
+                    self._send_json(
+                        200,
+                        {"object": "list", "data": [{"id": "stub", "object": "model"}]},
+                    )
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send_json(400, {"error": {"message": "Invalid JSON"}})
+                    return
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "Not found"}})
+                    return
+
+                status, latency = stub._draw()
+                time.sleep(latency)
+                if status == 429:
+                    self._send_json(
+                        429,
+                        {"error": {"message": "Rate limited", "type": "rate_limit"}},
+                        {"Retry-After": str(stub.settings.retry_after)},
+                    )
+                    return
+                if status:
+                    self._send_json(
+                        status, {"error": {"message": "Injected server error"}}
+                    )
+                    return
+
+                tokens = generate_tokens(request, stub.settings)
+                if request.get("stream"):
+                    self._stream(request, tokens)
+                else:
+                    time.sleep(len(tokens) / stub.settings.tokens_per_second)
+                    self._send_json(200, self._completion(request, tokens))
+
+            def _completion(self, request, tokens):
+                prompt = "".join(
+                    m.get("content", "") for m in request.get("messages", [])
+                )
+                return {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": "".join(tokens),
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": estimate_tokens(prompt),
+                        "completion_tokens": len(tokens),
+                        "total_tokens": estimate_tokens(prompt) + len(tokens),
+                    },
+                }
+
+            def _stream(self, request, tokens):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                interval = 1 / stub.settings.tokens_per_second
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(interval)
+                    self._event(request, {"content": token}, None)
+                self._event(request, {}, "stop")
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _event(self, request, delta, finish_reason):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": request.get("model", "stub"),
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            def _send_json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
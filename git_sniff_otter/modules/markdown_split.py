@@ -0,0 +1,173 @@
+"""Splitting of markdown reports into messages of bounded length."""
+
+import re
+from typing import Iterator, List, Tuple
+
+FENCE = re.compile(r"\s*(`{3,}|~{3,})")
+TABLE_ROW = re.compile(r"\s*\|")
+TABLE_SEPARATOR = re.compile(r"\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+HEADING = re.compile(r"#{1,6} ")
+
+# A message is cut at a heading once it is this full, so sections start messages
+HEADING_BREAK_FILL = 0.7
+
+
+def split_markdown(text: str, max_length: int = 4000) -> List[str]:
+    """Split markdown into chunks of at most ``max_length`` characters.
+
+    Chunks are cut between lines, preferably before a heading. Code blocks
+    and tables are kept whole when they fit in a chunk; larger ones are cut
+    between lines, closing and reopening the code fence or repeating the
+    table header in every chunk. Lines longer than a chunk are cut at a
+    space where possible. Runs in time linear in the size of the text.
+    """
+    chunker = _Chunker(max_length)
+    for kind, lines in _blocks(text.split("\n")):
+        chunker.add(kind, lines)
+    return chunker.finish()
+
+
+def _blocks(lines: List[str]) -> Iterator[Tuple[str, List[str]]]:
+    """Group lines into code blocks, tables, headings and single text lines."""
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        fence = FENCE.match(line)
+        if fence:
+            marker = fence.group(1)
+            end = i + 1
+            while end < len(lines) and not lines[end].strip().startswith(marker):
+                end += 1
+            yield "code", lines[i : end + 1]
+            i = end + 1
+        elif TABLE_ROW.match(line):
+            end = i + 1
+            while end < len(lines) and TABLE_ROW.match(lines[end]):
+                end += 1
+            yield "table", lines[i:end]
+            i = end
+        else:
+            yield "heading" if HEADING.match(line) else "text", [line]
+            i += 1
+
+
+def _size(lines: List[str]) -> int:
+    """Get the length of lines joined by newlines."""
+    return sum(len(line) for line in lines) + len(lines) - 1
+
+
+def _wrap(line: str, width: int) -> List[str]:
+    """Cut a line into pieces of at most ``width``, at spaces where possible."""
+    pieces = []
+    while len(line) > width:
+        space = line.rfind(" ", width // 2, width)
+        cut = space + 1 if space >= 0 else width
+        pieces.append(line[:cut])
+        line = line[cut:]
+    pieces.append(line)
+    return pieces
+
+
+def _group(lines: List[str], budget: int) -> Iterator[List[str]]:
+    """Pack lines into groups of at most ``budget`` characters."""
+    group: List[str] = []
+    size = -1
+    for line in lines:
+        for piece in _wrap(line, budget) if len(line) > budget else [line]:
+            if group and size + 1 + len(piece) > budget:
+                yield group
+                group, size = [], -1
+            group.append(piece)
+            size += 1 + len(piece)
+    if group:
+        yield group
+
+
+class _Chunker:
+    """Packs blocks of lines into chunks of bounded length."""
+
+    def __init__(self, max_length: int):
+        self.max_length = max_length
+        self.chunks: List[str] = []
+        self._lines: List[str] = []
+        # Length of the lines joined by newlines, -1 when there are none
+        self._length = -1
+
+    def add(self, kind: str, lines: List[str]) -> None:
+        """Add a block, starting a new chunk if it does not fit."""
+        if kind == "heading" and self._length > self.max_length * HEADING_BREAK_FILL:
+            self._flush()
+
+        size = _size(lines)
+        if self._length + 1 + size <= self.max_length:
+            self._append(lines, size)
+            return
+
+        # Headings ending the full chunk move on with the block they introduce
+        self._flush(carry_headings=True)
+        if self._length + 1 + size <= self.max_length:
+            self._append(lines, size)
+            return
+        if size <= self.max_length:
+            self._flush()
+            self._append(lines, size)
+            return
+        for piece in self._pieces(kind, lines):
+            piece_size = _size(piece)
+            if self._length + 1 + piece_size > self.max_length:
+                self._flush()
+            self._append(piece, piece_size)
+
+    def finish(self) -> List[str]:
+        """Return all chunks, including the last one."""
+        self._flush()
+        return self.chunks
+
+    def _append(self, lines: List[str], size: int) -> None:
+        """Add lines known to fit to the current chunk."""
+        self._lines.extend(lines)
+        self._length += 1 + size
+
+    def _flush(self, carry_headings: bool = False) -> None:
+        """End the current chunk, optionally moving trailing headings to the next."""
+        carried: List[str] = []
+        if carry_headings:
+            keep = len(self._lines)
+            while keep > 1 and (
+                not self._lines[keep - 1].strip()
+                or HEADING.match(self._lines[keep - 1])
+            ):
+                keep -= 1
+            if any(HEADING.match(line) for line in self._lines[keep:]):
+                carried = self._lines[keep:]
+                del self._lines[keep:]
+
+        chunk = "\n".join(self._lines).strip()
+        if chunk:
+            self.chunks.append(chunk)
+        self._lines, self._length = [], -1
+        if carried:
+            self._append(carried, _size(carried))
+
+    def _pieces(self, kind: str, lines: List[str]) -> Iterator[List[str]]:
+        """Cut a block too large for a chunk into pieces that each fit one."""
+        if kind == "code" and len(lines) > 1:
+            opening = lines[0]
+            marker = FENCE.match(opening).group(1)
+            closed = lines[-1].strip().startswith(marker)
+            body = lines[1:-1] if closed else lines[1:]
+            budget = self.max_length - len(opening) - len(marker) - 2
+            if budget >= self.max_length // 2:
+                for group in _group(body, budget):
+                    yield [opening] + group + [marker]
+                return
+
+        if kind == "table" and len(lines) > 2 and TABLE_SEPARATOR.match(lines[1]):
+            header = lines[:2]
+            budget = self.max_length - _size(header) - 1
+            if budget >= self.max_length // 2:
+                for group in _group(lines[2:], budget):
+                    yield header + group
+                return
+
+        yield from _group(lines, self.max_length)
@@ -0,0 +1,220 @@
+"""NumPy-vectorized aggregation of a CommitTable into repository and author stats."""
+
+from collections import Counter
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore
+
+from .commit_table import CommitTable, file_extension
+from .data_collector import RepositoryData
+from .data_transformer import (
+    RECENT_COMMIT_MESSAGES,
+    RECENT_COMMITS,
+    AuthorStats,
+    RepositoryStats,
+)
+
+
+def is_available() -> bool:
+    """Check whether NumPy can be imported."""
+    return np is not None
+
+
+def _sums(group_ids, num_groups: int, values):
+    """Sum integer values per group."""
+    if len(group_ids) == 0:
+        return np.zeros(num_groups, dtype=np.int64)
+    return np.rint(np.bincount(group_ids, weights=values, minlength=num_groups)).astype(
+        np.int64
+    )
+
+
+def _group_starts(sorted_ids):
+    """Get the positions where a new group begins in sorted group IDs."""
+    if len(sorted_ids) == 0:
+        return np.array([], dtype=np.int64)
+    return np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+
+
+def _first_rows_per_group(group_ids, limit: int) -> Dict[int, List[int]]:
+    """Get the first ``limit`` row indices of each group, in row order."""
+    order = np.argsort(group_ids, kind="stable")
+    sorted_ids = group_ids[order]
+    starts = _group_starts(sorted_ids).tolist()
+    ends = starts[1:] + [len(sorted_ids)]
+    rows: Dict[int, List[int]] = {}
+    for start, end in zip(starts, ends):
+        group = int(sorted_ids[start])
+        rows[group] = order[start : min(start + limit, end)].tolist()
+    return rows
+
+
+def _ordered_counters(group_ids, value_ids, num_values: int, names) -> Dict:
+    """Count values per group into Counters filled in first-occurrence order.
+
+    ``Counter.most_common`` breaks ties by insertion order, so the counters
+    are built in the order the scalar engine would have first seen each value.
+    """
+    counters: Dict[int, Counter] = {}
+    if len(group_ids) == 0:
+        return counters
+
+    keys = group_ids.astype(np.int64) * num_values + value_ids
+    unique_keys, first_index, counts = np.unique(
+        keys, return_index=True, return_counts=True
+    )
+    for position in np.argsort(first_index, kind="stable").tolist():
+        group, value = divmod(int(unique_keys[position]), num_values)
+        counters.setdefault(group, Counter())[names[value]] = int(counts[position])
+    return counters
+
+
+def _unique_pairs(group_ids, value_ids, num_values: int) -> List[Tuple[int, int]]:
+    """Get the distinct (group, value) pairs."""
+    if len(group_ids) == 0:
+        return []
+    keys = np.unique(group_ids.astype(np.int64) * num_values + value_ids)
+    return [divmod(key, num_values) for key in keys.tolist()]
+
+
+def aggregate(table: CommitTable) -> Tuple[List[RepositoryStats], List[AuthorStats]]:
+    """Compute repository and (unsorted) author stats with grouped reductions.
+
+    The result is identical to the scalar engine: authors are returned in
+    first-appearance order and every Counter is filled in first-seen order.
+    """
+    num_rows = len(table)
+    num_repos = len(table.repositories)
+    num_authors = len(table.authors)
+
+    repo_ids = np.frombuffer(table.repo_ids, dtype=np.uint32).astype(np.int64)
+    author_ids = np.frombuffer(table.author_ids, dtype=np.uint32).astype(np.int64)
+    timestamps = np.frombuffer(table.timestamps, dtype=np.int64)
+    insertions = np.frombuffer(table.insertions, dtype=np.int64)
+    deletions = np.frombuffer(table.deletions, dtype=np.int64)
+    file_offsets = np.frombuffer(table.file_offsets, dtype=np.int64)
+    file_ids = np.frombuffer(table.file_ids, dtype=np.uint32).astype(np.int64)
+
+    # Expand per-commit columns to one entry per changed file
+    files_per_commit = np.diff(file_offsets)
+    file_repo_ids = np.repeat(repo_ids, files_per_commit)
+    file_author_ids = np.repeat(author_ids, files_per_commit)
+
+    # Extensions are dictionary-encoded once per distinct path
+    extension_names: List[str] = []
+    extension_index: Dict[str, int] = {}
+    path_extensions = np.full(len(table.paths), -1, dtype=np.int64)
+    for path_id, path in enumerate(table.paths):
+        extension = file_extension(path)
+        if extension is not None:
+            if extension not in extension_index:
+                extension_index[extension] = len(extension_names)
+                extension_names.append(extension)
+            path_extensions[path_id] = extension_index[extension]
+    file_extensions = path_extensions[file_ids]
+    has_extension = file_extensions >= 0
+    num_extensions = max(len(extension_names), 1)
+
+    # Email IDs, since repositories count distinct emails rather than authors
+    emails = [email for _, email in table.authors]
+    email_names = list(dict.fromkeys(emails))
+    email_index = {email: i for i, email in enumerate(email_names)}
+    author_email_ids = np.array(
+        [email_index[email] for email in emails], dtype=np.int64
+    )
+
+    # Repository statistics
+    repository_stats = [
+        RepositoryStats(RepositoryData(path, name)) for path, name in table.repositories
+    ]
+    repo_commits = np.bincount(repo_ids, minlength=num_repos)
+    repo_insertions = _sums(repo_ids, num_repos, insertions)
+    repo_deletions = _sums(repo_ids, num_repos, deletions)
+    repo_file_types = _ordered_counters(
+        file_repo_ids[has_extension],
+        file_extensions[has_extension],
+        num_extensions,
+        extension_names,
+    )
+    repo_timeline_rows = _first_rows_per_group(repo_ids, RECENT_COMMITS)
+
+    for repo_id, repo in enumerate(repository_stats):
+        repo.total_commits = int(repo_commits[repo_id])
+        repo.total_insertions = int(repo_insertions[repo_id])
+        repo.total_deletions = int(repo_deletions[repo_id])
+        repo.file_types = repo_file_types.get(repo_id, Counter())
+        repo.commit_timeline = [
+            {
+                "date": table.date(row).isoformat(),
+                "author": table.authors[table.author_ids[row]][0],
+                "message": table.messages[row][:100],
+                "changes": table.lines_changed[row],
+            }
+            for row in repo_timeline_rows.get(repo_id, [])
+        ]
+
+    if num_rows:
+        for repo_id, email_id in _unique_pairs(
+            repo_ids, author_email_ids[author_ids], len(email_names)
+        ):
+            repository_stats[repo_id].unique_authors.add(email_names[email_id])
+    for repo_id, path_id in _unique_pairs(file_repo_ids, file_ids, len(table.paths)):
+        repository_stats[repo_id].total_files_changed.add(table.paths[path_id])
+
+    # Author statistics, in order of first appearance
+    present_authors, first_rows = np.unique(author_ids, return_index=True)
+    author_order = present_authors[np.argsort(first_rows, kind="stable")].tolist()
+
+    author_commits = np.bincount(author_ids, minlength=num_authors)
+    author_insertions = _sums(author_ids, num_authors, insertions)
+    author_deletions = _sums(author_ids, num_authors, deletions)
+    author_files = _sums(author_ids, num_authors, files_per_commit)
+    author_file_types = _ordered_counters(
+        file_author_ids[has_extension],
+        file_extensions[has_extension],
+        num_extensions,
+        extension_names,
+    )
+    author_message_rows = _first_rows_per_group(author_ids, RECENT_COMMIT_MESSAGES)
+
+    author_repositories: Dict[int, set] = {}
+    for author_id, repo_id in _unique_pairs(author_ids, repo_ids, max(num_repos, 1)):
+        author_repositories.setdefault(author_id, set()).add(
+            table.repositories[repo_id][1]
+        )
+
+    # Earliest and latest commit per author; ties keep the first row, as the
+    # strict comparisons of the scalar engine do
+    rows = np.arange(num_rows)
+    earliest = np.lexsort((rows, timestamps, author_ids))
+    latest = np.lexsort((rows, -timestamps, author_ids))
+    group_starts = _group_starts(author_ids[earliest])
+    first_date_rows = dict(
+        zip(
+            author_ids[earliest[group_starts]].tolist(), earliest[group_starts].tolist()
+        )
+    )
+    last_date_rows = dict(
+        zip(author_ids[latest[group_starts]].tolist(), latest[group_starts].tolist())
+    )
+
+    author_stats = []
+    for author_id in author_order:
+        author = AuthorStats(*table.authors[author_id])
+        author.total_commits = int(author_commits[author_id])
+        author.total_insertions = int(author_insertions[author_id])
+        author.total_deletions = int(author_deletions[author_id])
+        author.total_files_changed = int(author_files[author_id])
+        author.repositories = author_repositories[author_id]
+        author.file_types = author_file_types.get(author_id, Counter())
+        author.commit_messages = [
+            table.messages[row] for row in author_message_rows[author_id]
+        ]
+        author.first_commit_date = table.date(first_date_rows[author_id])
+        author.last_commit_date = table.date(last_date_rows[author_id])
+        author_stats.append(author)
+
+    return repository_stats, author_stats
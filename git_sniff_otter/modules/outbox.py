@@ -0,0 +1,347 @@
+"""Persistent SQLite spool of Slack messages waiting to be delivered."""
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    mode TEXT NOT NULL DEFAULT 'messages',
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    report_id INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    sent_at REAL,
+    channel_id TEXT,
+    PRIMARY KEY (report_id, channel, position)
+);
+CREATE TABLE IF NOT EXISTS claims (
+    channel TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    claimed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS given_up (
+    report_id INTEGER PRIMARY KEY,
+    error TEXT,
+    given_up_at REAL NOT NULL
+);
+"""
+
+# A claim not renewed for this long is taken over, e.g. after a crash
+CLAIM_TIMEOUT = 600
+CLAIM_POLL_INTERVAL = 0.5
+# How long a sender can still learn that its report was given up by another
+GIVEN_UP_RETENTION = 7 * 24 * 3600
+
+
+def claim_owner() -> str:
+    """Get a new owner name for claims: host, process and a unique suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+
+
+def _owner_alive(owner: str) -> bool:
+    """Check whether the process holding a claim may still be running."""
+    host, pid = owner.split(":")[:2]
+    if host != socket.gethostname() or os.name == "nt":
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        pass
+    return True
+
+
+class Outbox:
+    """On-disk outbox of reports split into Slack messages.
+
+    A report's messages are stored before the first is posted, along with
+    the delivery mode they are meant for, and every message is marked as it
+    lands, with the channel ID Slack reported for it (file uploads need it),
+    so a delivery interrupted by a Slack outage (or a crash) can be resumed
+    later without generating the report again. Reports are removed once all
+    their messages are sent.
+
+    Messages are marked from the threads posting them, so the connection is
+    shared between threads behind a lock. Senders in several processes may
+    share the file: a channel's messages are only sent by the holder of its
+    claim, so no message is posted twice. A report whose delivery failed
+    ``max_attempts`` times is dropped, so it cannot hold up its channels;
+    a marker is kept so its sender can tell it apart from a delivered one.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 5):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the SQLite connection, creating the database on first use."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, timeout=30, check_same_thread=False
+            )
+            self._connection.executescript(SCHEMA)
+            columns = [
+                row[1] for row in self._connection.execute("PRAGMA table_info(reports)")
+            ]
+            if "mode" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE reports "
+                    "ADD COLUMN mode TEXT NOT NULL DEFAULT 'messages'"
+                )
+            columns = [
+                row[1]
+                for row in self._connection.execute("PRAGMA table_info(messages)")
+            ]
+            if "channel_id" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE messages ADD COLUMN channel_id TEXT"
+                )
+        return self._connection
+
+    def add(
+        self, title: str, messages: Dict[str, List[str]], mode: str = "messages"
+    ) -> int:
+        """Spool a report's messages per channel, returning the report id."""
+        with self._lock, self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO reports (title, mode, created_at) VALUES (?, ?, ?)",
+                (title, mode, time.time()),
+            )
+            report_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO messages (report_id, channel, position, text) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (report_id, channel, position, text)
+                    for channel, texts in messages.items()
+                    for position, text in enumerate(texts)
+                ],
+            )
+        return report_id
+
+    def pending_reports(self) -> List[Dict[str, Any]]:
+        """List reports with unsent messages, oldest first."""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT r.id, r.title, r.mode, r.created_at, r.attempts, r.last_error, "
+                "COUNT(m.position) FROM reports r JOIN messages m "
+                "ON m.report_id = r.id AND m.sent_at IS NULL "
+                "GROUP BY r.id ORDER BY r.id"
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "title": row[1],
+                "mode": row[2],
+                "created_at": row[3],
+                "attempts": row[4],
+                "last_error": row[5],
+                "pending": row[6],
+            }
+            for row in rows
+        ]
+
+    def pending_channels(self) -> List[str]:
+        """List the channels with unsent messages."""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT DISTINCT channel FROM messages WHERE sent_at IS NULL "
+                "ORDER BY channel"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def pending_channel_messages(
+        self, channel: str
+    ) -> List[Tuple[Dict[str, Any], List[Tuple[int, str]]]]:
+        """Get a channel's unsent ``(position, text)`` messages, oldest report first.
+
+        Each report comes with the channel ID Slack returned for its messages
+        already sent there, if any.
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT r.id, r.title, r.mode, m.position, m.text, "
+                "(SELECT MAX(s.channel_id) FROM messages s "
+                "WHERE s.report_id = r.id AND s.channel = m.channel) "
+                "FROM messages m JOIN reports r ON r.id = m.report_id "
+                "WHERE m.channel = ? AND m.sent_at IS NULL "
+                "ORDER BY r.id, m.position",
+                (channel,),
+            ).fetchall()
+        reports: List[Tuple[Dict[str, Any], List[Tuple[int, str]]]] = []
+        for report_id, title, mode, position, text, channel_id in rows:
+            if not reports or reports[-1][0]["id"] != report_id:
+                report = {
+                    "id": report_id,
+                    "title": title,
+                    "mode": mode,
+                    "channel_id": channel_id,
+                }
+                reports.append((report, []))
+            reports[-1][1].append((position, text))
+        return reports
+
+    def unsent_messages(self, report_id: int) -> Set[Tuple[str, int]]:
+        """Get the ``(channel, position)`` of a spooled report's unsent messages."""
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT channel, position FROM messages "
+                "WHERE report_id = ? AND sent_at IS NULL",
+                (report_id,),
+            ).fetchall()
+        return {(channel, position) for channel, position in rows}
+
+    def given_up(self, report_id: int) -> Optional[str]:
+        """Get the last error of a report that was given up, or None if it wasn't."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT error FROM given_up WHERE report_id = ?", (report_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0] or "Gave up delivering the report"
+
+    def claim(self, channel: str, owner: str, wait: bool = False) -> bool:
+        """Claim the right to send a channel's messages.
+
+        Fails if another owner holds a live claim, unless ``wait`` is set, in
+        which case this waits for the claim to be released or to expire.
+        """
+        while True:
+            with self._immediate():
+                row = self.connection.execute(
+                    "SELECT owner, claimed_at FROM claims WHERE channel = ?",
+                    (channel,),
+                ).fetchone()
+                now = time.time()
+                if (
+                    row is None
+                    or row[0] == owner
+                    or now - row[1] > CLAIM_TIMEOUT
+                    or not _owner_alive(row[0])
+                ):
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO claims VALUES (?, ?, ?)",
+                        (channel, owner, now),
+                    )
+                    return True
+            if not wait:
+                return False
+            time.sleep(CLAIM_POLL_INTERVAL)
+
+    def release(self, channel: str, owner: str) -> None:
+        """Release a claim on a channel."""
+        with self._immediate():
+            self.connection.execute(
+                "DELETE FROM claims WHERE channel = ? AND owner = ?", (channel, owner)
+            )
+
+    def mark_sent(
+        self,
+        report_id: int,
+        channel: str,
+        position: int,
+        channel_id: Optional[str] = None,
+    ) -> None:
+        """Record that a message was posted, renewing the channel's claim."""
+        now = time.time()
+        with self._lock, self.connection:
+            self.connection.execute(
+                "UPDATE messages SET sent_at = ?, channel_id = ? "
+                "WHERE report_id = ? AND channel = ? AND position = ?",
+                (now, channel_id, report_id, channel, position),
+            )
+            self.connection.execute(
+                "UPDATE claims SET claimed_at = ? WHERE channel = ?", (now, channel)
+            )
+
+    def record_attempt(self, report_id: int, error: Optional[str] = None) -> bool:
+        """Record a delivery attempt of a report, counting it if it failed.
+
+        The report is removed once nothing is left to send, or when it has
+        failed ``max_attempts`` times; returns whether it was given up.
+        """
+        with self._lock, self.connection:
+            if error is not None:
+                self.connection.execute(
+                    "UPDATE reports SET attempts = attempts + 1, last_error = ? "
+                    "WHERE id = ?",
+                    (error, report_id),
+                )
+            row = self.connection.execute(
+                "SELECT r.attempts, COUNT(m.position) FROM reports r "
+                "LEFT JOIN messages m ON m.report_id = r.id AND m.sent_at IS NULL "
+                "WHERE r.id = ? GROUP BY r.id",
+                (report_id,),
+            ).fetchone()
+            if row is None:
+                return False
+            attempts, pending = row
+            if pending and attempts < self.max_attempts:
+                return False
+            if pending:
+                now = time.time()
+                self.connection.execute(
+                    "DELETE FROM given_up WHERE given_up_at < ?",
+                    (now - GIVEN_UP_RETENTION,),
+                )
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO given_up "
+                    "SELECT id, last_error, ? FROM reports WHERE id = ?",
+                    (now, report_id),
+                )
+            self._delete(report_id)
+            return bool(pending)
+
+    def discard(self, report_id: Optional[int] = None) -> None:
+        """Drop a spooled report, or every report if no id is given."""
+        with self._lock, self.connection:
+            if report_id is None:
+                self.connection.execute("DELETE FROM messages")
+                self.connection.execute("DELETE FROM reports")
+                self.connection.execute("DELETE FROM given_up")
+            else:
+                self._delete(report_id)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @contextmanager
+    def _immediate(self) -> Iterator[None]:
+        """Run a transaction holding the database's write lock from its start."""
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self.connection.rollback()
+                raise
+            self.connection.commit()
+
+    def _delete(self, report_id: int) -> None:
+        """Delete a report and its messages."""
+        self.connection.execute(
+            "DELETE FROM messages WHERE report_id = ?", (report_id,)
+        )
+        self.connection.execute("DELETE FROM reports WHERE id = ?", (report_id,))
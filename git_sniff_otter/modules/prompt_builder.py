@@ -0,0 +1,281 @@
+"""Token-budgeted construction of the LLM user prompt."""
+
+import json
+import math
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - exercised only without tiktoken
+    tiktoken = None  # type: ignore
+
+# Without tiktoken, assume this many characters per token. Compact JSON full
+# of numbers, dates and e-mail addresses tokenizes densely, so this errs on
+# the side of overestimating.
+CHARS_PER_TOKEN = 3
+
+# Per-entry detail kept at each compaction level, as (recent commits per
+# repository, commit messages per author, message length)
+DETAIL_LEVELS = [(20, 10, 200), (10, 5, 100), (5, 3, 72), (2, 1, 72), (0, 0, 0)]
+
+PROMPT_TEMPLATE = (
+    "Please generate a comprehensive Git repository analysis report for the period "
+    "from {start_date} to {end_date} ({duration} days).\n\n"
+    'The data below is compact JSON. Repositories and authors have numeric "id"s; in '
+    '"recent_commits" the "author" is an author id and an author\'s "repositories" are '
+    "repository ids (a name is given instead when that entry was left out). Entries "
+    "are ranked by number of commits and the lowest ranked ones may have been left "
+    'out to save space; "omitted" counts what was left out, and the overall '
+    "statistics and summary always cover everything.\n\n"
+    "## Overall Statistics\n"
+    "{overall_stats}\n\n"
+    "## Summary\n"
+    "{summary}\n\n"
+    "## Repository Details\n"
+    "{repository_stats}\n\n"
+    "## Author Contributions\n"
+    "{author_stats}\n\n"
+    "## Omitted\n"
+    "{omitted}\n\n"
+    "Please create a report that includes:\n"
+    "1. An executive summary highlighting the most important findings\n"
+    "2. Overall activity analysis (total commits, contributors, repositories)\n"
+    "3. Per-repository breakdown with key metrics\n"
+    "4. Individual contributor analysis with their key contributions\n"
+    "5. Notable patterns, trends, or insights from the data\n\n"
+    "Make the report engaging and informative for both technical and non-technical "
+    "stakeholders."
+)
+
+REPOSITORY_PROMPT_TEMPLATE = (
+    'Summarize the activity in the Git repository "{name}" from {start_date} to '
+    "{end_date} ({duration} days) for a team report.\n\n"
+    "Here are the repository's statistics as compact JSON:\n"
+    "{repository}\n\n"
+    "Write at most 150 words of markdown without a heading: the amount and kind of "
+    "work, who was most active, and anything notable in the recent commits."
+)
+
+# Introduces per-repository summaries in place of repository statistics
+SUMMARIES_NOTE = "(Each repository was summarized from its full statistics.)"
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """Get the tiktoken encoding for a model, defaulting to cl100k_base."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def estimate_tokens(text: str, model: str = "gpt-4") -> int:
+    """Estimate the number of tokens in a text, exactly when tiktoken is installed."""
+    if tiktoken is not None:
+        return len(_encoding(model).encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def compact_json(value: Any) -> str:
+    """Serialize a value as JSON without insignificant whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _rank(entries: List[Dict[str, Any]]) -> List[int]:
+    """Get entry positions from most to least significant."""
+    return sorted(
+        range(len(entries)),
+        key=lambda i: (
+            -entries[i].get("total_commits", 0),
+            -(
+                entries[i].get("total_insertions", 0)
+                + entries[i].get("total_deletions", 0)
+            ),
+        ),
+    )
+
+
+def _window_fields(time_window: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the time window fields of the prompt templates."""
+    return {
+        # Day precision keeps reruns of a window ending "now" identical
+        "start_date": time_window.get("start_date", "Unknown")[:10],
+        "end_date": time_window.get("end_date", "Unknown")[:10],
+        "duration": time_window.get("duration_days", 0),
+    }
+
+
+class BuiltPrompt:
+    """A user prompt together with its estimated size and what was left out."""
+
+    def __init__(self, text: str, estimated_tokens: int, omitted: Dict[str, int]):
+        self.text = text
+        self.estimated_tokens = estimated_tokens
+        self.omitted = omitted
+
+    def describe(self, token_budget: int = 0) -> str:
+        """Describe the prompt's size and what was left out, for the console."""
+        method = "tiktoken" if tiktoken is not None else "estimated"
+        description = f"LLM prompt: ~{self.estimated_tokens} tokens ({method})"
+        if token_budget:
+            description += f", budget {token_budget}"
+        left_out = [f"{count} {what}" for what, count in self.omitted.items() if count]
+        if left_out:
+            description += f"; left out {', '.join(left_out)}"
+        return description
+
+
+class PromptBuilder:
+    """Builds the user prompt from transformed data within a token budget.
+
+    Statistics are written as compact JSON with repository and author strings
+    replaced by ids. While the prompt is over budget, recent commits and
+    messages are trimmed first, then the lowest ranked authors and finally
+    the lowest ranked repositories are left out. A budget of 0 keeps
+    everything.
+    """
+
+    def __init__(self, token_budget: int, model: str = "gpt-4"):
+        self.token_budget = token_budget
+        self.model = model
+
+    def build(
+        self, data: Dict[str, Any], repository_summaries: Optional[List[str]] = None
+    ) -> BuiltPrompt:
+        """Build the largest prompt that fits the budget.
+
+        With ``repository_summaries`` (one per repository), the summaries are
+        sent in place of the repositories' statistics.
+        """
+        repositories = data.get("repository_stats", [])
+        authors = data.get("author_stats", [])
+        repo_ranking = _rank(repositories)
+        author_ranking = _rank(authors)
+
+        detail = 0
+        num_repos = len(repositories)
+        num_authors = len(authors)
+        while True:
+            built = self._render(
+                data,
+                repository_summaries,
+                DETAIL_LEVELS[detail],
+                sorted(repo_ranking[:num_repos]),
+                sorted(author_ranking[:num_authors]),
+            )
+            if not self.token_budget or built.estimated_tokens <= self.token_budget:
+                return built
+            if detail < len(DETAIL_LEVELS) - 1:
+                detail += 1
+            elif num_authors > 1:
+                num_authors //= 2
+            elif num_repos > 1:
+                num_repos //= 2
+            else:
+                # Nothing left to drop; overall statistics are always sent
+                return built
+
+    def build_repository(
+        self, repository: Dict[str, Any], time_window: Dict[str, Any]
+    ) -> BuiltPrompt:
+        """Build the prompt summarizing a single repository's statistics."""
+        text = REPOSITORY_PROMPT_TEMPLATE.format(
+            name=repository.get("name", "Unknown"),
+            repository=compact_json(repository),
+            **_window_fields(time_window),
+        )
+        return BuiltPrompt(text, estimate_tokens(text, self.model), {})
+
+    def _render(
+        self,
+        data: Dict[str, Any],
+        repository_summaries: Optional[List[str]],
+        detail: Tuple[int, int, int],
+        repo_rows: List[int],
+        author_rows: List[int],
+    ) -> BuiltPrompt:
+        """Render the prompt keeping the given rows at a detail level."""
+        _, max_messages, message_length = detail
+        repositories = data.get("repository_stats", [])
+        authors = data.get("author_stats", [])
+        repo_ids: Dict[str, int] = {}
+        for row in repo_rows:
+            repo_ids.setdefault(repositories[row]["name"], row)
+        author_ids: Dict[str, int] = {}
+        for row in author_rows:
+            author_ids.setdefault(authors[row]["name"], row)
+
+        omitted = {
+            "repositories": len(repositories) - len(repo_rows),
+            "authors": len(authors) - len(author_rows),
+            "recent_commits": 0,
+            "commit_messages": 0,
+        }
+
+        author_entries = []
+        for row in author_rows:
+            author = dict(authors[row], id=row)
+            messages = author.get("recent_commit_messages", [])
+            omitted["commit_messages"] += max(len(messages) - max_messages, 0)
+            author["recent_commit_messages"] = [
+                message.split("\n", 1)[0][:message_length]
+                for message in messages[:max_messages]
+            ]
+            author["repositories"] = [
+                repo_ids.get(name, name) for name in author.get("repositories", [])
+            ]
+            author_entries.append(author)
+
+        if repository_summaries is None:
+            repository_section = compact_json(
+                self._repository_entries(
+                    repositories, repo_rows, author_ids, detail, omitted
+                )
+            )
+        else:
+            repository_section = "\n\n".join(
+                [SUMMARIES_NOTE]
+                + [
+                    f"### {repositories[row]['name']} (id {row})\n"
+                    f"{repository_summaries[row]}"
+                    for row in repo_rows
+                ]
+            )
+
+        text = PROMPT_TEMPLATE.format(
+            overall_stats=compact_json(data.get("overall_stats", {})),
+            summary=compact_json(data.get("summary", {})),
+            repository_stats=repository_section,
+            author_stats=compact_json(author_entries),
+            omitted=compact_json(omitted),
+            **_window_fields(data.get("time_window", {})),
+        )
+        return BuiltPrompt(text, estimate_tokens(text, self.model), omitted)
+
+    @staticmethod
+    def _repository_entries(
+        repositories: List[Dict[str, Any]],
+        repo_rows: List[int],
+        author_ids: Dict[str, int],
+        detail: Tuple[int, int, int],
+        omitted: Dict[str, int],
+    ) -> List[Dict[str, Any]]:
+        """Get the kept repositories with their recent commits trimmed."""
+        max_commits, _, message_length = detail
+        entries = []
+        for row in repo_rows:
+            repo = dict(repositories[row], id=row)
+            recent = repo.get("recent_commits", [])
+            omitted["recent_commits"] += max(len(recent) - max_commits, 0)
+            repo["recent_commits"] = [
+                dict(
+                    commit,
+                    author=author_ids.get(commit["author"], commit["author"]),
+                    message=commit["message"][:message_length],
+                )
+                for commit in recent[:max_commits]
+            ]
+            entries.append(repo)
+
+        return entries
@@ -0,0 +1,150 @@
+"""Snapshots of collected repository data keyed by the repository's ref tips."""
+
+import hashlib
+import os
+import pickle
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bump when the pickled layout of RepositoryData changes
+SNAPSHOT_VERSION = 2
+
+
+def resolve_git_dirs(repo_path: str) -> Tuple[str, str]:
+    """Get a repository's git dir and common dir without running git.
+
+    Handles `.git` files (submodules, worktrees) and linked worktrees whose
+    refs live in a shared common directory.
+    """
+    git_dir = os.path.join(repo_path, ".git")
+    if os.path.isfile(git_dir):
+        with open(git_dir, encoding="utf-8") as f:
+            content = f.read().strip()
+        if content.startswith("gitdir:"):
+            git_dir = os.path.join(repo_path, content[len("gitdir:") :].strip())
+
+    common_dir = git_dir
+    commondir_file = os.path.join(git_dir, "commondir")
+    if os.path.isfile(commondir_file):
+        with open(commondir_file, encoding="utf-8") as f:
+            common_dir = os.path.join(git_dir, f.read().strip())
+
+    return os.path.normpath(git_dir), os.path.normpath(common_dir)
+
+
+def read_ref_tips(repo_path: str) -> Dict[str, str]:
+    """Read every ref and HEAD of a repository straight from its git directory.
+
+    This is the information `git for-each-ref` reports, gathered from
+    `packed-refs` and the loose ref files so no git process is needed.
+    """
+    git_dir, common_dir = resolve_git_dirs(repo_path)
+    if os.path.isdir(os.path.join(common_dir, "reftable")):
+        raise ValueError("reftable ref storage cannot be read without git")
+    refs: Dict[str, str] = {}
+
+    packed_refs = os.path.join(common_dir, "packed-refs")
+    if os.path.isfile(packed_refs):
+        with open(packed_refs, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                # Skip the header and peeled tag lines ("^<sha>")
+                if not line or line[0] in "#^":
+                    continue
+                sha, _, name = line.partition(" ")
+                refs[name] = sha
+
+    # Loose refs take precedence over packed ones
+    refs_dir = os.path.join(common_dir, "refs")
+    for root, _, files in os.walk(refs_dir):
+        for file_name in files:
+            path = os.path.join(root, file_name)
+            name = os.path.relpath(path, common_dir).replace(os.sep, "/")
+            with open(path, encoding="utf-8") as f:
+                refs[name] = f.read().strip()
+
+    with open(os.path.join(git_dir, "HEAD"), encoding="utf-8") as f:
+        refs["HEAD"] = f.read().strip()
+
+    return refs
+
+
+def ref_tips_hash(repo_path: str) -> str:
+    """Hash a repository's ref tips; the hash changes whenever any ref moves."""
+    refs = read_ref_tips(repo_path)
+    digest = hashlib.sha256()
+    for name in sorted(refs):
+        digest.update(f"{refs[name]} {name}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RepositorySnapshot:
+    """Collected repository data together with the state it was collected from."""
+
+    def __init__(
+        self,
+        ref_hash: str,
+        start_date: datetime,
+        end_date: datetime,
+        collected_at: datetime,
+        repo_data: Any,
+    ):
+        self.ref_hash = ref_hash
+        self.start_date = start_date
+        self.end_date = end_date
+        self.collected_at = collected_at
+        self.repo_data = repo_data
+
+    def covers(self, start_date: datetime, end_date: datetime) -> bool:
+        """Check whether a time window lies within the collected window.
+
+        A window that reached the collection time is treated as open-ended:
+        with unchanged refs no commit can have appeared after it.
+        """
+        if start_date < self.start_date:
+            return False
+        return end_date <= self.end_date or self.end_date >= self.collected_at
+
+    def commits_in_window(self, start_date: datetime, end_date: datetime) -> List:
+        """Get the snapshot's commits that fall within a time window."""
+        start = start_date.timestamp()
+        end = end_date.timestamp()
+        return [
+            commit
+            for commit in self.repo_data.commits
+            if start <= commit.date.timestamp() <= end
+        ]
+
+
+class RepositorySnapshotStore:
+    """Directory of pickled repository snapshots, one file per repository."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, repo_path: str) -> str:
+        """Get the snapshot file path for a repository."""
+        key = hashlib.sha256(os.path.abspath(repo_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def load(self, repo_path: str) -> Optional[RepositorySnapshot]:
+        """Load the snapshot for a repository, or None if there is no usable one."""
+        try:
+            with open(self._path(repo_path), "rb") as f:
+                version, snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable snapshot for {repo_path}: {e}")
+            return None
+
+        return snapshot if version == SNAPSHOT_VERSION else None
+
+    def save(self, repo_path: str, snapshot: RepositorySnapshot) -> None:
+        """Save a repository snapshot, replacing the previous one atomically."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(repo_path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((SNAPSHOT_VERSION, snapshot), f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,259 @@
+"""Report plans: several reports from one collection pass over their repositories."""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from ..config import Config
+from .data_collector import DataCollector, RepositoryData
+from .data_transformer import DataTransformer
+from .llm_generator import LLMReportGenerator
+from .slack_sender import SlackSender
+
+JOB_KEYS = {
+    "name",
+    "repos",
+    "days",
+    "start_date",
+    "end_date",
+    "channels",
+    "prompt_file",
+    "title",
+    "save_report",
+}
+
+
+def _parse_date(value: Any, field: str) -> datetime:
+    """Parse a YYYY-MM-DD date of a plan."""
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"{field} must be a YYYY-MM-DD date, got {value!r}")
+
+
+class ReportJob:
+    """One report of a plan: a subset of repositories, a window and channels."""
+
+    def __init__(
+        self,
+        name: str,
+        repository_paths: List[str],
+        start_date: datetime,
+        end_date: datetime,
+        channels: List[str],
+        system_prompt: Optional[str] = None,
+        title: str = "Git Repository Analysis Report",
+        save_report: Optional[str] = None,
+    ):
+        self.name = name
+        self.repository_paths = repository_paths
+        self.start_date = start_date
+        self.end_date = end_date
+        self.channels = channels
+        self.system_prompt = system_prompt
+        self.title = title
+        self.save_report = save_report
+
+    @classmethod
+    def from_dict(
+        cls,
+        entry: Dict[str, Any],
+        config: Config,
+        base_dir: str,
+        now: datetime,
+        index: int = 0,
+    ) -> "ReportJob":
+        """Build a job from its plan entry, resolving paths and the window."""
+        unknown = set(entry) - JOB_KEYS
+        if unknown:
+            raise ValueError(f"Unknown report plan keys: {', '.join(sorted(unknown))}")
+        if not entry.get("repos"):
+            raise ValueError("Every report plan job needs repos")
+        name = entry.get("name") or f"job-{index + 1}"
+
+        def resolve(path: str) -> str:
+            return os.path.normpath(os.path.join(base_dir, os.path.expanduser(path)))
+
+        # Windows follow the analyze options: days back from the end date
+        days = int(entry.get("days", config.time_window_days))
+        end_date = now
+        if "end_date" in entry:
+            end_date = _parse_date(entry["end_date"], f"{name}: end_date")
+        start_date = end_date - timedelta(days=days)
+        if "start_date" in entry:
+            start_date = _parse_date(entry["start_date"], f"{name}: start_date")
+        if start_date >= end_date:
+            raise ValueError(f"{name}: start_date must be before end_date")
+
+        channels = entry.get("channels") or [config.slack_channel]
+        if isinstance(channels, str):
+            channels = [channels]
+
+        system_prompt = None
+        if entry.get("prompt_file"):
+            with open(resolve(entry["prompt_file"]), "r", encoding="utf-8") as f:
+                system_prompt = f.read()
+
+        return cls(
+            name=name,
+            repository_paths=[resolve(path) for path in entry["repos"]],
+            start_date=start_date,
+            end_date=end_date,
+            channels=list(channels),
+            system_prompt=system_prompt,
+            title=entry.get("title") or f"Git Repository Analysis Report: {name}",
+            save_report=resolve(entry["save_report"])
+            if entry.get("save_report")
+            else None,
+        )
+
+    def slice(self, repository_data_list: List[RepositoryData]) -> List[RepositoryData]:
+        """Select this job's repositories and the commits within its window."""
+        start = self.start_date.astimezone()
+        end = self.end_date.astimezone()
+        by_path = {os.path.normpath(repo.path): repo for repo in repository_data_list}
+
+        sliced = []
+        for path in self.repository_paths:
+            repo_data = by_path.get(path)
+            if repo_data is None:
+                continue
+            job_data = RepositoryData(repo_data.path, repo_data.name)
+            job_data.gitinspector_data = repo_data.gitinspector_data
+            job_data.errors = repo_data.errors
+            job_data.commits = [
+                commit
+                for commit in repo_data.commits
+                if start <= commit.date.astimezone() <= end
+            ]
+            sliced.append(job_data)
+        return sliced
+
+
+class ReportPlan:
+    """Reports to generate from one collection pass.
+
+    Repositories shared by several jobs are collected once, over the union
+    of the jobs' windows; every job's statistics are then computed from its
+    own slice of the collected commits.
+    """
+
+    def __init__(self, jobs: List[ReportJob]):
+        if not jobs:
+            raise ValueError("A report plan needs at least one job")
+        names = [job.name for job in jobs]
+        if len(set(names)) != len(names):
+            raise ValueError("Report plan job names must be unique")
+        self.jobs = jobs
+
+    @classmethod
+    def load(
+        cls, path: str, config: Config, now: Optional[datetime] = None
+    ) -> "ReportPlan":
+        """Read a JSON plan; relative paths are relative to the plan file."""
+        with open(path, "r", encoding="utf-8") as f:
+            plan = json.load(f)
+        base_dir = os.path.dirname(os.path.abspath(path))
+        now = now or datetime.now()
+        entries = plan.get("jobs") if isinstance(plan, dict) else None
+        if not isinstance(entries, list):
+            raise ValueError("A report plan needs a list of jobs")
+        return cls(
+            [
+                ReportJob.from_dict(entry, config, base_dir, now, index)
+                for index, entry in enumerate(entries)
+            ]
+        )
+
+    @property
+    def repository_paths(self) -> List[str]:
+        """Get every repository of the plan once, in order of first use."""
+        return list(
+            dict.fromkeys(path for job in self.jobs for path in job.repository_paths)
+        )
+
+    @property
+    def start_date(self) -> datetime:
+        """Get the start of the earliest job window."""
+        return min(job.start_date for job in self.jobs)
+
+    @property
+    def end_date(self) -> datetime:
+        """Get the end of the latest job window."""
+        return max(job.end_date for job in self.jobs)
+
+    def collection_config(self, config: Config) -> Config:
+        """Get the configuration collecting every repository over every window."""
+        return config.model_copy(
+            update={
+                "repository_paths": self.repository_paths,
+                "start_date": self.start_date,
+                "end_date": self.end_date,
+            }
+        )
+
+    def job_config(self, config: Config, job: ReportJob) -> Config:
+        """Get the configuration generating and sending a job's report."""
+        update = {
+            "repository_paths": job.repository_paths,
+            "start_date": job.start_date,
+            "end_date": job.end_date,
+            "slack_channel": job.channels[0],
+        }
+        if job.system_prompt:
+            update["llm_system_prompt"] = job.system_prompt
+        return config.model_copy(update=update)
+
+
+def run_report_plan(
+    config: Config, plan: ReportPlan, dry_run: bool = False
+) -> List[Dict[str, Any]]:
+    """Collect once, then generate and send every job's report concurrently.
+
+    Returns one result per job with its ``name``, the ``commits`` in its
+    window, the ``report``, whether it was ``sent`` (None on a dry run) and
+    the ``error`` that stopped it, if any. A failing job does not stop the
+    others. Jobs post to Slack concurrently; only jobs sharing a channel
+    wait for each other, to keep that channel's messages in order.
+    """
+    repository_data = DataCollector(plan.collection_config(config)).collect_all_data()
+
+    def run_job(job: ReportJob) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "name": job.name,
+            "commits": 0,
+            "report": None,
+            "sent": None,
+            "error": None,
+        }
+        try:
+            transformer = DataTransformer(
+                job.start_date, job.end_date, engine=config.transform_engine
+            )
+            transformed = transformer.transform(job.slice(repository_data))
+            result["commits"] = transformed.overall_stats.get("total_commits", 0)
+
+            job_config = plan.job_config(config, job)
+            report = LLMReportGenerator(job_config).generate_report(transformed)
+            result["report"] = report
+            if job.save_report:
+                with open(job.save_report, "w", encoding="utf-8") as f:
+                    f.write(report)
+
+            if not dry_run:
+                result["sent"] = SlackSender(job_config, job.channels).send_report(
+                    report, job.title
+                )
+        except Exception as e:
+            print(f"Error: Report job {job.name} failed: {e}")
+            result["error"] = str(e)
+            if not dry_run:
+                result["sent"] = False
+        return result
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(plan.jobs), config.llm_concurrency)
+    ) as executor:
+        return list(executor.map(run_job, plan.jobs))
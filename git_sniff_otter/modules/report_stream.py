@@ -0,0 +1,183 @@
+"""Delivery of a streamed report to its outputs, one markdown section at a time."""
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from .slack_sender import SlackSender
+
+# Top-level ("#") and section ("##") headings start a new section
+SECTION_HEADING = re.compile(r"#{1,2} ")
+
+
+class SectionSplitter:
+    """Cuts streamed markdown into sections at top-level and section headings.
+
+    A section is only cut once it has content besides headings, so a title is
+    kept together with the first section. Headings inside code fences do not
+    count.
+    """
+
+    def __init__(self):
+        self._partial_line = ""
+        self._lines: List[str] = []
+        self._has_content = False
+        self._in_fence = False
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return the sections it completed."""
+        *lines, self._partial_line = (self._partial_line + text).split("\n")
+        sections = []
+        for line in lines:
+            if line.lstrip().startswith("```"):
+                self._in_fence = not self._in_fence
+            elif (
+                not self._in_fence and SECTION_HEADING.match(line) and self._has_content
+            ):
+                sections.append("\n".join(self._lines).strip())
+                self._lines = []
+                self._has_content = False
+            self._lines.append(line)
+            if line.strip() and not SECTION_HEADING.match(line):
+                self._has_content = True
+        return sections
+
+    def close(self) -> List[str]:
+        """Return the last section once the stream has ended."""
+        self._lines.append(self._partial_line)
+        section = "\n".join(self._lines).strip()
+        self._partial_line = ""
+        self._lines = []
+        self._has_content = False
+        self._in_fence = False
+        return [section] if section else []
+
+
+class ReportSink(ABC):
+    """An output receiving a report section by section."""
+
+    @abstractmethod
+    def write_section(self, section: str) -> None:
+        """Output one finished section."""
+
+    def close(self) -> bool:
+        """Finish the output, returning whether every section was delivered."""
+        return True
+
+
+class FileSink(ReportSink):
+    """Appends sections to a report file as they arrive."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._sections = 0
+
+    def write_section(self, section: str) -> None:
+        """Append a section to the file and flush it."""
+        if self._sections:
+            self._file.write("\n\n")
+        self._file.write(section)
+        self._file.flush()
+        self._sections += 1
+
+    def close(self) -> bool:
+        """Close the file."""
+        self._file.write("\n")
+        self._file.close()
+        return True
+
+
+class SlackSink(ReportSink):
+    """Posts every section to Slack as soon as it is finished.
+
+    The first message carries the report title. After a failed post the
+    remaining sections are not sent but kept in the sender's outbox, behind
+    the failed one, so they can be resent in order.
+    """
+
+    def __init__(
+        self, sender: SlackSender, title: str = "Git Repository Analysis Report"
+    ):
+        self.sender = sender
+        self.title = title
+        self.sections_sent = 0
+        self.ok = True
+
+    def write_section(self, section: str) -> None:
+        """Post a section, prefixed by the title if it is the first."""
+        if not self.sections_sent and self.ok:
+            section = f"*{self.title}*\n\n{section}"
+        if not self.ok:
+            self.sender.spool_section(section, self.title)
+            return
+        self.ok = self.sender.send_section(section, self.title)
+        if self.ok:
+            self.sections_sent += 1
+
+    def close(self) -> bool:
+        """Report whether every section was posted."""
+        if self.ok:
+            print(
+                f"Report sent in {self.sections_sent} parts to "
+                f"{', '.join(self.sender.channels)}"
+            )
+        return self.ok
+
+
+class SectionDelivery:
+    """Passes finished sections of a streamed report to sinks in order.
+
+    Sinks are called in a worker thread, one section at a time, so a slow
+    sink never holds up reading the stream.
+    """
+
+    def __init__(self, sinks: List[ReportSink]):
+        self.sinks = sinks
+        self.text = ""
+        self.sections_queued = 0
+        self._splitter = SectionSplitter()
+        self._queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    def feed(self, text: str) -> None:
+        """Add streamed text, queueing any section it completes."""
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._deliver())
+        self.text += text
+        for section in self._splitter.feed(text):
+            self._queue.put_nowait(section)
+            self.sections_queued += 1
+
+    def restart(self) -> bool:
+        """Drop the text received so far, unless a section was already queued."""
+        if self.sections_queued:
+            return False
+        self.text = ""
+        self._splitter = SectionSplitter()
+        return True
+
+    async def finish(self) -> str:
+        """Deliver the last section, wait for the sinks and close them."""
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._deliver())
+        for section in self._splitter.close():
+            self._queue.put_nowait(section)
+            self.sections_queued += 1
+        self._queue.put_nowait(None)
+        await self._worker
+
+        for sink in self.sinks:
+            sink.close()
+        return self.text.strip()
+
+    async def _deliver(self) -> None:
+        """Write queued sections to every sink until the end marker."""
+        loop = asyncio.get_running_loop()
+        while True:
+            section = await self._queue.get()
+            if section is None:
+                return
+            for sink in self.sinks:
+                await loop.run_in_executor(None, sink.write_section, section)
@@ -0,0 +1,257 @@
+"""Persistent per-day, per-repository rollups of partial aggregates.
+
+Each row holds the AggregateState of one repository's commits on one local
+calendar day. A repository's coverage records the contiguous range of days
+whose rows are complete, and the ref tips they were computed at, so reports
+for any window of whole days can be answered by merging rows.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .aggregates import AggregateState
+from .data_collector import CommitData, RepositoryData
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS day_rollups (
+    repo_path TEXT NOT NULL,
+    day TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (repo_path, day)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    repo_path TEXT PRIMARY KEY,
+    first_day TEXT NOT NULL,
+    last_day TEXT NOT NULL,
+    ref_tips TEXT NOT NULL,
+    utc_offset TEXT NOT NULL
+)
+"""
+
+
+def local_day(commit_date: datetime) -> date:
+    """Get the local calendar day a commit falls on."""
+    if commit_date.utcoffset() is None:
+        return commit_date.date()
+    return commit_date.astimezone().date()
+
+
+def day_start(day: date) -> datetime:
+    """Get local midnight at the start of a day, as a naive datetime."""
+    return datetime.combine(day, time())
+
+
+def current_utc_offset() -> str:
+    """Describe the local UTC offset; rollup days are only valid within one."""
+    return str(datetime.now().astimezone().utcoffset())
+
+
+def align_window(start_date: datetime, end_date: datetime) -> Tuple[datetime, datetime]:
+    """Align a window's start down to midnight so it is made of whole days.
+
+    The end is kept: the last, partial day is always collected live.
+    """
+    return day_start(start_date.date()), end_date
+
+
+def full_days(start_date: datetime, end_date: datetime) -> Optional[Tuple[date, date]]:
+    """Get the first and last whole days inside a window, or None if there are none."""
+    first_day = start_date.date()
+    if start_date > day_start(first_day):
+        first_day += timedelta(days=1)
+    last_day = end_date.date() - timedelta(days=1)
+    if last_day < first_day:
+        return None
+    return first_day, last_day
+
+
+def group_by_day(
+    repo_path: str,
+    name: str,
+    commits: Iterable[CommitData],
+    first_day: Optional[date] = None,
+    last_day: Optional[date] = None,
+) -> Dict[date, RepositoryData]:
+    """Group commits by local day, newest first, dropping days out of range."""
+    by_day: Dict[date, RepositoryData] = {}
+    for commit in sorted(commits, key=lambda c: c.date, reverse=True):
+        day = local_day(commit.date)
+        if (first_day and day < first_day) or (last_day and day > last_day):
+            continue
+        if day not in by_day:
+            by_day[day] = RepositoryData(repo_path, name)
+        by_day[day].commits.append(commit)
+    return by_day
+
+
+class RollupCoverage:
+    """The range of days a repository's rollups are complete for."""
+
+    def __init__(
+        self, first_day: date, last_day: date, ref_tips: Dict[str, str], utc_offset: str
+    ):
+        self.first_day = first_day
+        self.last_day = last_day
+        self.ref_tips = ref_tips
+        self.utc_offset = utc_offset
+
+    def covers(self, first_day: date, last_day: date) -> bool:
+        """Check whether a range of days is covered."""
+        return self.first_day <= first_day and last_day <= self.last_day
+
+
+class RollupStore:
+    """SQLite store of daily repository rollups and their coverage."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Get the SQLite connection, creating the database on first use."""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Parallel collectors share the file, so wait for locks instead of failing
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def coverage(self, repo_path: str) -> Optional[RollupCoverage]:
+        """Get a repository's coverage, or None if it has no usable rollups."""
+        row = self.connection.execute(
+            "SELECT first_day, last_day, ref_tips, utc_offset FROM coverage "
+            "WHERE repo_path = ?",
+            (repo_path,),
+        ).fetchone()
+        if row is None:
+            return None
+        return RollupCoverage(
+            date.fromisoformat(row[0]),
+            date.fromisoformat(row[1]),
+            json.loads(row[2]),
+            row[3],
+        )
+
+    def save_days(
+        self,
+        repo_path: str,
+        days: Dict[date, RepositoryData],
+        first_day: date,
+        last_day: date,
+        ref_tips: Dict[str, str],
+    ) -> None:
+        """Store all commits of a range of days, collected at ``ref_tips``.
+
+        Coverage grows to include the range when it overlaps or touches the
+        current coverage; otherwise the old rollups are replaced. States are
+        stored at repository position 0 and repositioned by the reader.
+        """
+        coverage = self.coverage(repo_path)
+        with self.connection:
+            if (
+                coverage is None
+                or coverage.ref_tips != ref_tips
+                or first_day > coverage.last_day + timedelta(days=1)
+                or last_day < coverage.first_day - timedelta(days=1)
+            ):
+                self._delete(repo_path)
+            else:
+                self.connection.execute(
+                    "DELETE FROM day_rollups "
+                    "WHERE repo_path = ? AND day BETWEEN ? AND ?",
+                    (repo_path, first_day.isoformat(), last_day.isoformat()),
+                )
+                first_day = min(first_day, coverage.first_day)
+                last_day = max(last_day, coverage.last_day)
+
+            self._write_days(
+                repo_path,
+                {
+                    day: AggregateState.from_repository_data(repo_data, 0)
+                    for day, repo_data in days.items()
+                },
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?)",
+                (
+                    repo_path,
+                    first_day.isoformat(),
+                    last_day.isoformat(),
+                    json.dumps(ref_tips, sort_keys=True),
+                    current_utc_offset(),
+                ),
+            )
+
+    def add_commits(
+        self,
+        repo_path: str,
+        days: Dict[date, RepositoryData],
+        ref_tips: Dict[str, str],
+    ) -> None:
+        """Merge commits that appeared since the last update into covered days."""
+        with self.connection:
+            for day, repo_data in days.items():
+                row = self.connection.execute(
+                    "SELECT state FROM day_rollups WHERE repo_path = ? AND day = ?",
+                    (repo_path, day.isoformat()),
+                ).fetchone()
+                if row is None:
+                    state = AggregateState.from_repository_data(repo_data, 0)
+                else:
+                    state = AggregateState.from_dict(json.loads(row[0]))
+                    # Place them after already rolled up commits of the same instant
+                    first_seq = state.repositories[repo_path].total_commits
+                    state.update(
+                        AggregateState.from_repository_data(
+                            repo_data, 0, first_seq=first_seq
+                        )
+                    )
+                self._write_days(repo_path, {day: state})
+            self.connection.execute(
+                "UPDATE coverage SET ref_tips = ? WHERE repo_path = ?",
+                (json.dumps(ref_tips, sort_keys=True), repo_path),
+            )
+
+    def load_days(
+        self, repo_path: str, first_day: date, last_day: date
+    ) -> List[AggregateState]:
+        """Load the rollups of a range of days."""
+        rows = self.connection.execute(
+            "SELECT state FROM day_rollups WHERE repo_path = ? AND day BETWEEN ? AND ?",
+            (repo_path, first_day.isoformat(), last_day.isoformat()),
+        )
+        return [AggregateState.from_dict(json.loads(row[0])) for row in rows]
+
+    def drop(self, repo_path: str) -> None:
+        """Forget all rollups of a repository."""
+        with self.connection:
+            self._delete(repo_path)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _delete(self, repo_path: str) -> None:
+        """Delete a repository's rows and coverage."""
+        self.connection.execute(
+            "DELETE FROM day_rollups WHERE repo_path = ?", (repo_path,)
+        )
+        self.connection.execute(
+            "DELETE FROM coverage WHERE repo_path = ?", (repo_path,)
+        )
+
+    def _write_days(self, repo_path: str, states: Dict[date, AggregateState]) -> None:
+        """Insert or replace day rows."""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO day_rollups VALUES (?, ?, ?)",
+            [
+                (repo_path, day.isoformat(), json.dumps(state.to_dict()))
+                for day, state in states.items()
+            ],
+        )
@@ -1,11 +1,19 @@
 """Slack integration module for sending reports to Slack channels."""
 
+import copy
+import functools
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.error import URLError
 
 # Type imports are handled in the mock classes if needed
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError:
     print(
         "Warning: requests library not installed. Webhook functionality may not work."
@@ -16,13 +24,32 @@ except ImportError:
             self.status_code = status_code
             self.text = text
 
+    class MockSession:
+        def mount(self, prefix, adapter):
+            pass
+
+        def post(self, *args, **kwargs):
+            return MockResponse()
+
     class MockRequests:
+        Session = MockSession
+
         @staticmethod
         def post(*args, **kwargs):
             return MockResponse()
 
         class exceptions:
             RequestException = Exception
+            ConnectionError = ConnectionError
+            Timeout = TimeoutError
+
+            class HTTPError(Exception):
+                def __init__(self, message, response=None):
+                    super().__init__(message)
+                    self.response = response
+
+    def HTTPAdapter(**kwargs):  # type: ignore
+        return None
 
     requests = MockRequests()  # type: ignore
 
@@ -38,7 +65,10 @@ except ImportError:
             self.token = token
 
         def chat_postMessage(self, **kwargs):
-            return {"ok": True}
+            return {"ok": True, "channel": kwargs.get("channel"), "ts": "0"}
+
+        def files_upload_v2(self, **kwargs):
+            return {"ok": True, "files": []}
 
         def auth_test(self):
             return {"user": "mock_bot"}
@@ -52,15 +82,141 @@ except ImportError:
     SlackApiError = MockSlackApiError  # type: ignore
 
 from ..config import Config
+from ..utils.retry import RetryPolicy, TokenBucket, shared_limiter
+from .markdown_split import split_markdown
+from .outbox import Outbox, claim_owner
+
+# Slack message limit
+MAX_MESSAGE_LENGTH = 4000
+
+# Messages per minute Slack accepts per channel, by method: chat.postMessage
+# and incoming webhooks allow about one per second with short bursts
+CHANNEL_RATE_LIMITS = {"chat.postMessage": 60, "webhook": 60}
+CHANNEL_BURST = 3
+
+# Uploads per minute across the workspace: an upload makes two tier 4 calls
+# (files.getUploadURLExternal and files.completeUploadExternal, 100/min)
+FILE_UPLOADS_PER_MINUTE = 50
+
+# In "file" mode a report is sent as a summary message of at most
+# SUMMARY_LENGTH characters, then uploaded as this file (the report's message
+# at FILE_POSITION); "auto" uploads reports that would take more than
+# AUTO_FILE_MIN_MESSAGES messages
+REPORT_FILENAME = "report.md"
+FILE_POSITION = 1
+SUMMARY_LENGTH = 1500
+AUTO_FILE_MIN_MESSAGES = 3
+
+# Network failures of webhook posts (requests) and API calls (slack_sdk uses
+# urllib); retried along with rate limits and server errors
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    URLError,
+)
+
+_sessions: Dict[int, Any] = {}
+_sessions_lock = threading.Lock()
+
+
+def shared_session(pool_size: int = 4) -> "requests.Session":
+    """Get the process-wide HTTP session for webhook posts, creating it on first use.
+
+    Connections are kept alive and reused by every sender, so only the first
+    message to a host pays for the TCP and TLS handshake.
+    """
+    with _sessions_lock:
+        if pool_size not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[pool_size] = session
+        return _sessions[pool_size]
+
+
+def channel_limiter(method: str, channel: str) -> TokenBucket:
+    """Get the process-wide limiter for posting to a channel with a method."""
+    return shared_limiter(
+        f"slack:{method}:{channel}", CHANNEL_RATE_LIMITS[method], CHANNEL_BURST
+    )
+
+
+def describe_error(exc: BaseException) -> str:
+    """Describe why a post failed, preferring Slack's error code."""
+    if isinstance(exc, SlackApiError):
+        try:
+            return str(exc.response["error"])
+        except (KeyError, TypeError):
+            pass
+    return str(exc)
+
+
+class DeliveryReport:
+    """Outcome of posting messages to Slack, per channel and message.
+
+    Every part is a dict with the ``channel``, the message ``index`` and a
+    ``status`` of "sent", "failed" (with the ``error``) or "skipped" (not
+    posted after an earlier message of its channel failed).
+    """
+
+    def __init__(self):
+        self.parts: List[Dict[str, Any]] = []
+
+    @property
+    def ok(self) -> bool:
+        """Whether every message was posted."""
+        return all(part["status"] == "sent" for part in self.parts)
+
+    @property
+    def channels(self) -> List[str]:
+        """Get the channels posted to, in order."""
+        return list(dict.fromkeys(part["channel"] for part in self.parts))
+
+    def sent(self, channel: str) -> int:
+        """Get the number of messages posted to a channel."""
+        return sum(
+            1
+            for part in self.parts
+            if part["channel"] == channel and part["status"] == "sent"
+        )
+
+    def summary(self) -> str:
+        """Describe what landed in each channel."""
+        lines = []
+        for channel in self.channels:
+            parts = [part for part in self.parts if part["channel"] == channel]
+            line = f"{channel}: {self.sent(channel)} of {len(parts)} messages sent"
+            failed = [part for part in parts if part["status"] == "failed"]
+            if failed:
+                line += (
+                    f" (message {failed[0]['index'] + 1} failed: {failed[0]['error']})"
+                )
+            lines.append(line)
+        return "\n".join(lines)
 
 
 class SlackSender:
     """Handles sending reports to Slack via webhook or bot token."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, channels: Optional[List[str]] = None):
         self.config = config
+        self.channels = list(channels or [config.slack_channel])
         self.webhook_url = config.slack_webhook_url
         self.client = None
+        self.session = None
+        self.retry_policy = RetryPolicy(transient_errors=TRANSIENT_ERRORS)
+        self.last_delivery: Optional[DeliveryReport] = None
+        self.outbox: Optional[Outbox] = None
+
+        if config.slack_outbox:
+            self.outbox = Outbox(
+                os.path.join(config.cache_dir, "outbox.sqlite3"),
+                max_attempts=config.slack_outbox_max_attempts,
+            )
+
+        if self.webhook_url:
+            self.session = shared_session(config.slack_pool_size)
 
         if config.slack_token:
             self.client = WebClient(token=config.slack_token)
@@ -68,150 +224,358 @@ class SlackSender:
     def send_report(
         self, report: str, title: str = "Git Repository Analysis Report"
     ) -> bool:
-        """Send the report to Slack using the configured method."""
+        """Send the report to every channel using the configured method.
 
-        # Try bot token method first (more reliable)
-        if self.client:
-            return self._send_via_bot_token(report, title)
-
-        # Fallback to webhook method
-        elif self.webhook_url:
-            return self._send_via_webhook(report, title)
-
-        else:
+        The outcome per channel and message is kept in ``last_delivery``.
+        With the outbox enabled, messages that could not be posted are kept
+        for ``flush_outbox``.
+        """
+        if not self.client and not self.webhook_url:
             print(
                 "Error: No Slack configuration found. Please set SLACK_TOKEN or SLACK_WEBHOOK_URL."
             )
             return False
 
-    def _send_via_bot_token(self, report: str, title: str) -> bool:
-        """Send report using Slack bot token."""
-        try:
-            # Split long reports into multiple messages if needed
-            max_length = 4000  # Slack message limit
-
-            if len(report) <= max_length:
-                # Send as single message
-                if self.client is not None:
-                    self.client.chat_postMessage(
-                        channel=self.config.slack_channel,
-                        text=f"*{title}*\n\n{report}",
-                        mrkdwn=True,
-                    )
-                print(f"Report sent successfully to {self.config.slack_channel}")
-                return True
-
-            else:
-                # Split into multiple messages
-                return self._send_long_report_via_bot(report, title)
-
-        except SlackApiError as e:
-            print(f"Error sending to Slack: {e.response['error']}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending to Slack: {e}")
-            return False
-
-    def _send_long_report_via_bot(self, report: str, title: str) -> bool:
-        """Send a long report by splitting it into multiple messages."""
-        try:
-            if self.client is None:
-                return False
+        # Split long reports into multiple messages, title first
+        if len(report) <= MAX_MESSAGE_LENGTH:
+            messages = [f"*{title}*\n\n{report}"]
+        else:
+            messages = [f"*{title}*"] + self._split_report_by_sections(report)
 
-            # Send title first
-            self.client.chat_postMessage(
-                channel=self.config.slack_channel, text=f"*{title}*", mrkdwn=True
-            )
+        mode = self._delivery_mode(len(messages))
+        if mode == "file":
+            messages = [self._file_summary(report, title), report]
 
-            # Split report by sections (looking for ## headers)
-            sections = self._split_report_by_sections(report)
-
-            for section in sections:
-                if section.strip():
-                    self.client.chat_postMessage(
-                        channel=self.config.slack_channel, text=section, mrkdwn=True
-                    )
+        delivery = self.post(
+            {channel: messages for channel in self.channels}, title, mode
+        )
+        print(delivery.summary())
+        return delivery.ok
 
+    def send_section(self, text: str, title: str = "Report section") -> bool:
+        """Send one part of a report as its own message(s), without a title."""
+        if not self.client and not self.webhook_url:
             print(
-                f"Long report sent successfully in {len(sections)} parts to {self.config.slack_channel}"
+                "Error: No Slack configuration found. "
+                "Please set SLACK_TOKEN or SLACK_WEBHOOK_URL."
             )
-            return True
-
-        except SlackApiError as e:
-            print(f"Error sending long report to Slack: {e.response['error']}")
             return False
 
-    def _send_via_webhook(self, report: str, title: str) -> bool:
-        """Send report using Slack webhook."""
-        try:
-            # Prepare the payload
-            payload = {
-                "text": f"*{title}*\n\n{report}",
-                "mrkdwn": True,
-                "channel": self.config.slack_channel,
-            }
-
-            # Send to webhook
-            if not self.webhook_url:
-                raise ValueError("Webhook URL is not configured")
-
-            response = requests.post(
-                self.webhook_url,
-                data=json.dumps(payload),
-                headers={"Content-Type": "application/json"},
-                timeout=30,
-            )
+        parts = self._split_report_by_sections(text)
+        delivery = self.post({channel: parts for channel in self.channels}, title)
+        if not delivery.ok:
+            print(delivery.summary())
+        return delivery.ok
 
-            if response.status_code == 200:
-                print(
-                    f"Report sent successfully via webhook to {self.config.slack_channel}"
-                )
-                return True
-            else:
+    def spool_section(self, text: str, title: str = "Report section") -> bool:
+        """Keep a part of a report in the outbox to be sent later, if enabled."""
+        if self.outbox is None:
+            return False
+        parts = self._split_report_by_sections(text)
+        self.outbox.add(title, {channel: parts for channel in self.channels})
+        return True
+
+    def post(
+        self, messages: Dict[str, List[str]], title: str, mode: str = "messages"
+    ) -> DeliveryReport:
+        """Post messages per channel, through the outbox if it is enabled.
+
+        Reports left in the outbox by earlier attempts are sent first, so
+        messages still reach every channel in the order they were created.
+        """
+        if self.outbox is None:
+            return self.deliver(messages, mode=mode, title=title)
+
+        # Senders posting to other channels are not held up: each channel is
+        # flushed under its own claim, waited for only in this report's channels
+        report_id = self.outbox.add(title, messages, mode)
+        deliveries = self.flush_outbox(wait_for=messages)
+        for earlier_id, delivery in deliveries.items():
+            if earlier_id != report_id:
+                print(f"Sent report {earlier_id} from the outbox:")
+                print(delivery.summary())
+
+        # Messages another sender handled first are not in this flush's
+        # outcome: the outbox tells whether they were posted or given up
+        delivery = deliveries.get(report_id, DeliveryReport())
+        done = {(part["channel"], part["index"]) for part in delivery.parts}
+        error = self.outbox.given_up(report_id)
+        unsent = self.outbox.unsent_messages(report_id)
+        for channel, texts in messages.items():
+            for index in range(len(texts)):
+                if (channel, index) in done:
+                    continue
+                if error is None and (channel, index) not in unsent:
+                    part = {"channel": channel, "index": index, "status": "sent"}
+                else:
+                    part = {
+                        "channel": channel,
+                        "index": index,
+                        "status": "failed",
+                        "error": error or "Still waiting in the outbox",
+                    }
+                delivery.parts.append(part)
+        delivery.parts.sort(key=lambda part: (part["channel"], part["index"]))
+        self.last_delivery = delivery
+        return delivery
+
+    def flush_outbox(self, wait_for: Iterable[str] = ()) -> Dict[int, DeliveryReport]:
+        """Send the unsent messages in the outbox, oldest report first per channel.
+
+        Channels are flushed in parallel, each under a claim in the outbox,
+        so senders in other processes never post the same messages. Channels
+        another sender is flushing are left to it, except those in
+        ``wait_for``, whose claim is waited for. Once a message fails, the
+        rest of its channel is not posted during the flush, so a later report
+        never overtakes an earlier one.
+        """
+        deliveries: Dict[int, DeliveryReport] = {}
+        if self.outbox is None:
+            return deliveries
+
+        wait_for = set(wait_for)
+        channels = sorted(wait_for.union(self.outbox.pending_channels()))
+        if not channels:
+            return deliveries
+        owner = claim_owner()
+        with ThreadPoolExecutor(max_workers=len(channels)) as executor:
+            for parts in executor.map(
+                lambda channel: self._flush_channel(
+                    channel, owner, channel in wait_for
+                ),
+                channels,
+            ):
+                for part in parts:
+                    report_id = part.pop("report_id")
+                    deliveries.setdefault(report_id, DeliveryReport())
+                    deliveries[report_id].parts.append(part)
+
+        for report_id, delivery in sorted(deliveries.items()):
+            tried = [part for part in delivery.parts if part["status"] != "skipped"]
+            if not tried:
+                continue
+            errors = [part["error"] for part in tried if "error" in part]
+            if self.outbox.record_attempt(report_id, errors[0] if errors else None):
                 print(
-                    f"Webhook request failed with status {response.status_code}: {response.text}"
+                    f"Warning: Giving up report {report_id} after "
+                    f"{self.outbox.max_attempts} failed attempts: {errors[0]}"
                 )
-                return False
+        return deliveries
 
-        except requests.exceptions.RequestException as e:
-            print(f"Error sending webhook to Slack: {e}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error sending webhook to Slack: {e}")
-            return False
+    def _flush_channel(
+        self, channel: str, owner: str, wait: bool
+    ) -> List[Dict[str, Any]]:
+        """Send a channel's unsent messages under its claim, oldest report first.
 
-    def _split_report_by_sections(
-        self, report: str, max_length: int = 4000
-    ) -> list[str]:
-        """Split a report into sections based on markdown headers."""
-        sections = []
-        current_section = ""
-
-        lines = report.split("\n")
-
-        for line in lines:
-            # Check if this line would make the current section too long
-            if len(current_section) + len(line) + 1 > max_length:
-                if current_section.strip():
-                    sections.append(current_section.strip())
-                current_section = line
-            else:
-                if current_section:
-                    current_section += "\n" + line
-                else:
-                    current_section = line
+        Returns the outcome of every message, with its report ID and its
+        position within the report.
+        """
+        assert self.outbox is not None
+        if not self.outbox.claim(channel, owner, wait=wait):
+            return []
 
-            # If we hit a section header and have content, consider breaking
-            if line.startswith("##") and current_section.strip():
-                if len(current_section) > max_length * 0.7:  # 70% of max length
-                    sections.append(current_section.strip())
-                    current_section = ""
+        parts: List[Dict[str, Any]] = []
+        try:
+            failed = False
+            for report, pending in self.outbox.pending_channel_messages(channel):
+                report_id = report["id"]
+                if failed:
+                    report_parts = [
+                        {"channel": channel, "index": index, "status": "skipped"}
+                        for index in range(len(pending))
+                    ]
+                else:
+                    report_parts = self._send_pending(channel, report, pending)
+                for part in report_parts:
+                    part.update(report_id=report_id, index=pending[part["index"]][0])
+                    failed = failed or part["status"] != "sent"
+                parts.extend(report_parts)
+        finally:
+            self.outbox.release(channel, owner)
+        return parts
+
+    def _send_pending(
+        self, channel: str, report: Dict[str, Any], pending: List[Tuple[int, str]]
+    ) -> List[Dict[str, Any]]:
+        """Post a report's unsent messages to a channel, marking each as sent."""
+        assert self.outbox is not None
+        outbox = self.outbox
+        positions = [position for position, _ in pending]
+        posts = self._posters(report["mode"], report["title"], positions)
+
+        def on_sent(channel: str, index: int, channel_id: Optional[str]) -> None:
+            outbox.mark_sent(report["id"], channel, positions[index], channel_id)
+
+        return self._deliver_channel(
+            channel,
+            [(text, post) for (_, text), post in zip(pending, posts)],
+            on_sent,
+            channel_id=report["channel_id"],
+        )
+
+    def deliver(
+        self,
+        messages: Dict[str, List[str]],
+        on_sent: Optional[Callable[[str, int, Optional[str]], None]] = None,
+        mode: str = "messages",
+        title: str = "Git Repository Analysis Report",
+    ) -> DeliveryReport:
+        """Post messages to their channels, keeping their order within a channel.
+
+        Channels are posted to in parallel. Each channel's messages are paced
+        by its rate limiter and rate-limited or failed posts are retried;
+        once a message finally fails, the rest of that channel is skipped so
+        no message is posted out of order. ``on_sent`` is called with the
+        channel, the index and the channel ID Slack reported (if any) of every
+        posted message, from the posting thread. In "file" mode the messages
+        are a summary and the whole report, which is uploaded as a file.
+        """
+        delivery = DeliveryReport()
+        self.last_delivery = delivery
+        if not messages:
+            return delivery
+
+        def deliver_channel(channel: str, texts: List[str]) -> List[Dict[str, Any]]:
+            posts = self._posters(mode, title, list(range(len(texts))))
+            return self._deliver_channel(channel, list(zip(texts, posts)), on_sent)
+
+        with ThreadPoolExecutor(max_workers=len(messages)) as executor:
+            for parts in executor.map(
+                lambda item: deliver_channel(*item), messages.items()
+            ):
+                delivery.parts.extend(parts)
+        return delivery
+
+    def _deliver_channel(
+        self,
+        channel: str,
+        messages: List[Tuple[str, Callable[..., Optional[str]]]],
+        on_sent: Optional[Callable[[str, int, Optional[str]], None]] = None,
+        channel_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Post one channel's messages in order, returning the outcome of each.
+
+        Every message comes with the function posting it. Posts may return
+        the channel's ID, which file uploads need; ``channel_id`` is the ID
+        already known from earlier messages.
+        """
+        method = "chat.postMessage" if self.client else "webhook"
+        policy = copy.copy(self.retry_policy)
+        policy.limiter = channel_limiter(method, channel)
+
+        parts: List[Dict[str, Any]] = []
+        error = None
+        for index, (text, post) in enumerate(messages):
+            part = {"channel": channel, "index": index, "status": "skipped"}
+            if error is None:
+                try:
+                    posted_to = post(policy, channel_id or channel, text)
+                    channel_id = posted_to or channel_id
+                    part["status"] = "sent"
+                    if on_sent:
+                        on_sent(channel, index, posted_to)
+                except Exception as e:
+                    error = describe_error(e)
+                    part.update(status="failed", error=error)
+            parts.append(part)
+        return parts
+
+    def _post(self, policy: RetryPolicy, channel: str, text: str) -> Optional[str]:
+        """Post a single message with retries, raising if Slack did not accept it.
+
+        Returns the channel's ID if Slack reported it.
+        """
+        return policy.call(self._post_message, channel, text)
+
+    def _posters(
+        self, mode: str, title: str, positions: List[int]
+    ) -> List[Callable[..., Optional[str]]]:
+        """Get the function posting each message of a report, by its position.
+
+        In "file" mode the message after the summary is the report to upload.
+        """
+        upload = functools.partial(self._upload_report, title=title)
+        return [
+            upload if mode == "file" and position == FILE_POSITION else self._post
+            for position in positions
+        ]
+
+    @staticmethod
+    def _file_summary(report: str, title: str) -> str:
+        """Build the message announcing a report uploaded as a file."""
+        summary = split_markdown(report, SUMMARY_LENGTH)
+        return (
+            f"*{title}*\n\n{summary[0] if summary else ''}\n\n"
+            f"_Full report attached as {REPORT_FILENAME}_"
+        )
+
+    def _upload_report(
+        self, policy: RetryPolicy, channel: str, report: str, title: str
+    ) -> None:
+        """Upload a whole report as a file to a channel, given by its ID.
+
+        Takes three API calls whatever the size of the report. The channel ID
+        is the one Slack returned for the summary message before it.
+        """
+        upload_policy = copy.copy(policy)
+        upload_policy.limiter = shared_limiter(
+            "slack:files_upload_v2", FILE_UPLOADS_PER_MINUTE
+        )
+        upload_policy.call(
+            self.client.files_upload_v2,
+            channel=channel,
+            content=report,
+            filename=REPORT_FILENAME,
+            title=title,
+        )
+
+    def _delivery_mode(self, message_count: int) -> str:
+        """Choose between posting messages and uploading a file for a report."""
+        mode = self.config.slack_delivery_mode
+        if mode == "messages":
+            return mode
+        if not self.client:
+            print("Uploading reports as files needs SLACK_TOKEN; posting messages")
+            return "messages"
+        if mode == "auto":
+            return "file" if message_count > AUTO_FILE_MIN_MESSAGES else "messages"
+        return mode
+
+    def _post_message(self, channel: str, text: str) -> Optional[str]:
+        """Post a single message, raising if Slack did not accept it.
+
+        Returns the channel's ID when posting with a bot token.
+        """
+        if self.client:
+            response = self.client.chat_postMessage(
+                channel=channel, text=text, mrkdwn=True
+            )
+            return response.get("channel")
+
+        response = self._post_webhook(
+            {"text": text, "mrkdwn": True, "channel": channel}
+        )
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(
+                f"Webhook request failed with status {response.status_code}: "
+                f"{response.text}",
+                response=response,
+            )
 
-        # Add the last section
-        if current_section.strip():
-            sections.append(current_section.strip())
+    def _post_webhook(self, payload: Dict[str, Any], timeout: float = 30):
+        """Post a JSON payload to the webhook over the shared session."""
+        return self.session.post(
+            self.webhook_url,
+            data=json.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout,
+        )
 
-        return sections
+    def _split_report_by_sections(
+        self, report: str, max_length: int = MAX_MESSAGE_LENGTH
+    ) -> list[str]:
+        """Split a report into messages, preferably at markdown headers."""
+        return split_markdown(report, max_length)
 
     def test_connection(self) -> bool:
         """Test the Slack connection."""
@@ -232,12 +596,7 @@ class SlackSender:
                     "channel": self.config.slack_channel,
                 }
 
-                response = requests.post(
-                    self.webhook_url,
-                    data=json.dumps(payload),
-                    headers={"Content-Type": "application/json"},
-                    timeout=10,
-                )
+                response = self._post_webhook(payload, timeout=10)
 
                 if response.status_code == 200:
                     print("Slack webhook connection successful")
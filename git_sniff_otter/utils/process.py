@@ -0,0 +1,124 @@
+"""Subprocess helpers with time budgets and output size caps."""
+
+import os
+import signal
+import subprocess
+import threading
+from typing import List, Optional
+
+READ_CHUNK_SIZE = 64 * 1024
+# Only the tail of stderr is kept for error messages
+STDERR_LIMIT = 64 * 1024
+
+
+class ProcessTimeoutError(Exception):
+    """Raised when a process exceeds its time budget and is killed."""
+
+    def __init__(self, cmd: List[str], timeout: float):
+        super().__init__(f"{cmd[0]} timed out after {timeout:.0f}s")
+        self.cmd = cmd
+        self.timeout = timeout
+
+
+class OutputLimitExceeded(Exception):
+    """Raised when a process writes more output than allowed and is killed."""
+
+    def __init__(self, cmd: List[str], limit: int):
+        super().__init__(f"{cmd[0]} produced more than {limit} bytes of output")
+        self.cmd = cmd
+        self.limit = limit
+
+
+def _kill(process: subprocess.Popen) -> None:
+    """Kill a process and anything left in its process group."""
+    try:
+        if os.name == "posix":
+            # Also reaps stray children that would keep our pipes open
+            os.killpg(process.pid, signal.SIGKILL)
+        elif process.poll() is None:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_capped(
+    cmd: List[str],
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    max_output_bytes: Optional[int] = None,
+) -> str:
+    """Run a command and return its stdout, enforcing a time and size budget.
+
+    stdout is read in chunks as it is produced instead of being buffered by
+    ``communicate``. The process (and its children) is killed as soon as the
+    budget is exceeded, or when the caller is interrupted.
+
+    Raises:
+        ProcessTimeoutError: The process ran longer than ``timeout`` seconds.
+        OutputLimitExceeded: stdout grew beyond ``max_output_bytes``.
+        subprocess.CalledProcessError: The process exited with an error.
+    """
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        # A separate process group lets us kill helpers the tool spawns (git)
+        start_new_session=os.name == "posix",
+    )
+    stdout_chunks: List[bytes] = []
+    stderr_tail = bytearray()
+    over_limit = threading.Event()
+
+    def read_stdout():
+        size = 0
+        assert process.stdout is not None
+        for chunk in iter(lambda: process.stdout.read(READ_CHUNK_SIZE), b""):
+            size += len(chunk)
+            if max_output_bytes is not None and size > max_output_bytes:
+                over_limit.set()
+                _kill(process)
+                break
+            stdout_chunks.append(chunk)
+
+    def read_stderr():
+        assert process.stderr is not None
+        for chunk in iter(lambda: process.stderr.read(READ_CHUNK_SIZE), b""):
+            stderr_tail.extend(chunk)
+            del stderr_tail[:-STDERR_LIMIT]
+
+    readers = [
+        threading.Thread(target=read_stdout, daemon=True),
+        threading.Thread(target=read_stderr, daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    try:
+        # Exceeding the output cap kills the process, which ends this wait too
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise ProcessTimeoutError(cmd, timeout or 0) from None
+    finally:
+        # Covers KeyboardInterrupt and the error paths above
+        _kill(process)
+        process.wait()
+        for reader in readers:
+            reader.join()
+        for stream in (process.stdout, process.stderr):
+            if stream is not None:
+                stream.close()
+
+    if over_limit.is_set():
+        raise OutputLimitExceeded(cmd, max_output_bytes or 0)
+
+    stdout = b"".join(stdout_chunks).decode("utf-8", errors="replace")
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(
+            process.returncode,
+            cmd,
+            output=stdout,
+            stderr=bytes(stderr_tail).decode("utf-8", errors="replace"),
+        )
+    return stdout
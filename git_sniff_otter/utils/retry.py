@@ -0,0 +1,230 @@
+"""Retries with exponential backoff and a shared token-bucket rate limiter."""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from urllib.error import HTTPError
+
+# Statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUSES = {408, 409, 429}
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    """Get the HTTP status of a failed request, if the error carries one."""
+    code = getattr(exc, "status_code", None)
+    if code is None and isinstance(exc, HTTPError):
+        code = exc.code
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Get the seconds a server asked to wait before retrying, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    if isinstance(headers, dict):
+        # Plain dicts (e.g. from slack_sdk) keep the server's header case
+        headers = {str(name).lower(): value for name, value in headers.items()}
+
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` requests per second on average.
+
+    Up to ``capacity`` requests may be made in a burst. A rate of 0 disables
+    the limit, except for pauses requested through ``pause``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token if one is available, else get the seconds until one is."""
+        with self._lock:
+            now = self.clock()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.rate <= 0:
+                return 0.0
+
+            elapsed = max(now - self._updated, 0.0)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, sleep: Callable[[float], None] = time.sleep) -> None:
+        """Wait until a token is available and take it."""
+        wait = self.reserve()
+        while wait > 0:
+            sleep(wait)
+            wait = self.reserve()
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a token is available."""
+        wait = self.reserve()
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.reserve()
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for a while, e.g. after a server asked to back off."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+
+_shared_limiters: Dict[str, TokenBucket] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_limiter(
+    name: str, requests_per_minute: float, burst: int = 1
+) -> TokenBucket:
+    """Get the process-wide limiter of a service, creating it on first use."""
+    with _shared_limiters_lock:
+        if name not in _shared_limiters:
+            _shared_limiters[name] = TokenBucket(requests_per_minute / 60, burst)
+        return _shared_limiters[name]
+
+
+class RetryPolicy:
+    """Retries transient failures with exponential backoff and full jitter.
+
+    A failure is transient if it carries a retryable or 5xx HTTP status, or
+    is a connection error (including ``transient_errors``). A server's
+    ``Retry-After`` is waited out instead of the backoff, and pauses the
+    limiter so concurrent callers back off too. Attempts stop after
+    ``max_attempts`` or when the next one could not start before
+    ``deadline`` seconds from the first; the last error is then raised.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        deadline: Optional[float] = 300.0,
+        limiter: Optional[TokenBucket] = None,
+        transient_errors: Tuple[Type[BaseException], ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.limiter = limiter
+        self.transient_errors = (ConnectionError, TimeoutError) + transient_errors
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """Check whether a failure is worth retrying."""
+        code = status_code(exc)
+        if code is not None:
+            return code in RETRYABLE_STATUSES or code >= 500
+        return isinstance(exc, self.transient_errors)
+
+    def backoff(self, attempt: int) -> float:
+        """Get a random delay before retry ``attempt`` (1 for the first retry)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return self.rng() * ceiling
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call a function, retrying transient failures."""
+        give_up_at = self._give_up_at()
+        attempt = 0
+        while True:
+            if self.limiter:
+                self.limiter.acquire(self.sleep)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                delay = self._next_delay(e, attempt, give_up_at)
+                if delay is None:
+                    raise
+            self.sleep(delay)
+
+    async def acall(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await a coroutine function, retrying transient failures."""
+        give_up_at = self._give_up_at()
+        attempt = 0
+        while True:
+            if self.limiter:
+                await self.limiter.acquire_async()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                delay = self._next_delay(e, attempt, give_up_at)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    def _give_up_at(self) -> Optional[float]:
+        """Get the clock time after which no attempt starts."""
+        return self.clock() + self.deadline if self.deadline else None
+
+    def _next_delay(
+        self, exc: BaseException, attempt: int, give_up_at: Optional[float]
+    ) -> Optional[float]:
+        """Get the delay before retrying a failure, or None to give up."""
+        if attempt >= self.max_attempts or not self.is_retryable(exc):
+            return None
+
+        delay = retry_after(exc)
+        if delay is not None and self.limiter:
+            self.limiter.pause(delay)
+        if delay is None:
+            delay = self.backoff(attempt)
+        if give_up_at is not None and self.clock() + delay > give_up_at:
+            return None
+
+        print(
+            f"Request failed ({exc}), retrying in {delay:.1f}s "
+            f"(attempt {attempt + 1} of {self.max_attempts})"
+        )
+        return delay
@@ -33,6 +33,10 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=requirements,
+    extras_require={
+        "numpy": ["numpy>=1.24"],
+        "tiktoken": ["tiktoken>=0.5"],
+    },
     entry_points={
         "console_scripts": [
             "git-sniff-otter=git_sniff_otter.cli:cli",
@@ -0,0 +1,282 @@
+"""Shared fixtures for the test suite."""
+
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from git_sniff_otter.config import Config
+from git_sniff_otter.modules.data_collector import CommitData, RepositoryData
+
+
+def run_git(repo_path, *args, date="2024-01-01T12:00:00+02:00"):
+    """Run a git command with a fixed identity and commit date."""
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="Test Author",
+        GIT_AUTHOR_EMAIL="test@example.com",
+        GIT_COMMITTER_NAME="Test Author",
+        GIT_COMMITTER_EMAIL="test@example.com",
+        GIT_AUTHOR_DATE=date,
+        GIT_COMMITTER_DATE=date,
+    )
+    subprocess.run(
+        ["git", *args], cwd=repo_path, env=env, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def sample_repo(tmp_path):
+    """Create a small repository with branches, a merge, binary files and a rename."""
+    repo = str(tmp_path / "sample-repo")
+    os.makedirs(repo)
+    run_git(repo, "init", "-q", "-b", "main")
+
+    with open(os.path.join(repo, "app.py"), "w") as f:
+        f.write("print('hello')\n")
+    with open(os.path.join(repo, "logo.png"), "wb") as f:
+        f.write(b"\x89PNG\x00\x01\x02")
+    run_git(repo, "add", ".")
+    run_git(repo, "commit", "-q", "-m", "Initial commit\n\nWith a body.")
+
+    run_git(repo, "checkout", "-q", "-b", "feature")
+    with open(os.path.join(repo, "app.py"), "a") as f:
+        f.write("print('feature')\n")
+    run_git(repo, "commit", "-q", "-am", "Add feature", date="2024-01-02T08:00:00Z")
+
+    run_git(repo, "checkout", "-q", "main")
+    with open(os.path.join(repo, "notes with space.md"), "w") as f:
+        f.write("one\ntwo\n")
+    run_git(repo, "add", ".")
+    run_git(repo, "commit", "-q", "-m", "Add notes", date="2024-01-03T08:00:00Z")
+    run_git(
+        repo,
+        "merge",
+        "-q",
+        "--no-ff",
+        "-m",
+        "Merge feature",
+        "feature",
+        date="2024-01-04T08:00:00Z",
+    )
+    run_git(repo, "mv", "app.py", "main.py")
+    run_git(repo, "commit", "-q", "-m", "Rename app", date="2024-01-05T08:00:00Z")
+    return repo
+
+
+@pytest.fixture
+def make_config():
+    """Return a factory building a Config with a window covering the sample repo."""
+
+    def _make_config(repository_paths, **overrides):
+        values = {
+            "openai_api_key": "test-key",
+            "repository_paths": repository_paths,
+            "slack_channel": "#test",
+            "slack_token": "test-token",
+            "start_date": datetime(2023, 12, 1),
+            "end_date": datetime(2024, 2, 1),
+        }
+        values.update(overrides)
+        return Config(**values)
+
+    return _make_config
+
+
+def synthetic_repository_data(num_repos=3, commits_per_repo=40, seed=0):
+    """Build RepositoryData with overlapping authors, paths and timezones."""
+    rng = random.Random(seed)
+    extensions = ["py", "JS", "md", "yml", "go", ""]
+    zones = [timezone.utc, timezone(timedelta(hours=2)), timezone(timedelta(hours=-5))]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    repository_data_list = []
+    for repo_index in range(num_repos):
+        repo_data = RepositoryData(f"/repos/repo-{repo_index}", f"repo-{repo_index}")
+        for i in range(commits_per_repo):
+            author = rng.randrange(8)
+            files = []
+            for _ in range(rng.randrange(4)):
+                extension = rng.choice(extensions)
+                name = f"src/file_{rng.randrange(30)}"
+                files.append(f"{name}.{extension}" if extension else name)
+            insertions = rng.randrange(200)
+            deletions = rng.randrange(50)
+            date = start + timedelta(minutes=rng.randrange(60 * 24 * 30))
+            repo_data.commits.append(
+                CommitData.from_fields(
+                    sha=f"{repo_index:04x}{i:036x}",
+                    author_name=f"Author {author}",
+                    author_email=f"author{author}@example.com",
+                    message=f"Commit {i} in repo {repo_index}",
+                    date=date.astimezone(rng.choice(zones)),
+                    files_changed=list(dict.fromkeys(files)),
+                    insertions=insertions,
+                    deletions=deletions,
+                    lines_changed=insertions + deletions,
+                )
+            )
+        repo_data.commits.sort(key=lambda c: c.date, reverse=True)
+        repository_data_list.append(repo_data)
+
+    # A repository without commits must still be reported
+    repository_data_list.append(RepositoryData("/repos/empty", "empty"))
+    return repository_data_list
+
+
+def normalized(transformed_dict):
+    """Make a TransformedData.to_dict() result comparable across engines.
+
+    Author repositories come from a set, so their order is not meaningful.
+    """
+    for author in transformed_dict["author_stats"]:
+        author["repositories"] = sorted(author["repositories"])
+    return transformed_dict
+
+
+class FakeChatClient:
+    """Stand-in for the OpenAI client that records completion requests.
+
+    Repository summary requests are answered with "Summary of <name>", any
+    other request with a numbered report. Every request takes ``delay``
+    seconds, and the largest number of requests in flight at once is kept.
+    """
+
+    def __init__(self, delay=0.0, fail_for=()):
+        self.delay = delay
+        self.fail_for = set(fail_for)
+        self.requests = []
+        self.reports = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, model, messages, **params):
+        """Answer a chat completion request."""
+        with self.lock:
+            self.requests.append(messages)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            match = re.search(
+                r'in the Git repository "([^"]*)"', messages[1]["content"]
+            )
+            if match and match.group(1) in self.fail_for:
+                raise RuntimeError(f"failed on {match.group(1)}")
+            if match:
+                content = f"Summary of {match.group(1)}"
+            else:
+                with self.lock:
+                    self.reports += 1
+                    content = f"Report {self.reports}"
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeLLMServer:
+    """Local HTTP server answering chat completions from a script.
+
+    Each request takes the next status from ``statuses`` (200 once it runs
+    out). Errors carry a ``Retry-After`` header when ``retry_after`` is set.
+    Successful requests are answered with ``chunks``, as server-sent events
+    waiting ``delay`` seconds before each one when streaming, or joined into
+    a single completion otherwise. The time every streamed chunk was written
+    is recorded in ``sent_at``.
+    """
+
+    def __init__(self, chunks, delay=0.0, statuses=(), retry_after=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.requests = []
+        self.sent_at = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                body = json.loads(self.rfile.read(length))
+                server.requests.append(body)
+                status = server.statuses.pop(0) if server.statuses else 200
+                if status != 200:
+                    self._send_json(status, {"error": {"message": f"status {status}"}})
+                elif body.get("stream"):
+                    self._stream(body["model"])
+                else:
+                    message = {"role": "assistant", "content": "".join(server.chunks)}
+                    self._send_json(
+                        200,
+                        {
+                            "id": "chatcmpl-fake",
+                            "object": "chat.completion",
+                            "created": 0,
+                            "model": body["model"],
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": message,
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                        },
+                    )
+
+            def _send_json(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status != 200 and server.retry_after is not None:
+                    self.send_header("Retry-After", str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, model):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for content in server.chunks:
+                    time.sleep(server.delay)
+                    chunk = {
+                        "id": "chatcmpl-fake",
+                        "object": "chat.completion.chunk",
+                        "created": 0,
+                        "model": model,
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {"content": content},
+                                "finish_reason": None,
+                            }
+                        ],
+                    }
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                    self.wfile.flush()
+                    server.sent_at.append(time.monotonic())
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/v1"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        """Stop the server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,118 @@
+"""Tests for mergeable partial aggregates."""
+
+import json
+import random
+from datetime import datetime, timezone
+
+from git_sniff_otter.modules.aggregates import AggregateState
+from git_sniff_otter.modules.data_transformer import DataTransformer
+
+from .conftest import normalized, synthetic_repository_data
+
+
+class TestAggregateState:
+    """Test cases for AggregateState."""
+
+    transformer = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+    @staticmethod
+    def _random_partials(repository_data_list, rng):
+        """Split every repository's commits into randomly sized, scattered partials."""
+        partials = []
+        for position, repo_data in enumerate(repository_data_list):
+            rows = list(range(len(repo_data.commits)))
+            rng.shuffle(rows)
+            pieces = rng.randint(1, 5)
+            for piece in range(pieces):
+                partials.append(
+                    AggregateState.from_repository_data(
+                        repo_data, position, sorted(rows[piece::pieces])
+                    )
+                )
+        return partials
+
+    @staticmethod
+    def _random_fold(partials, rng):
+        """Merge partials pairwise in a random tree shape."""
+        partials = list(partials)
+        while len(partials) > 1:
+            i, j = rng.sample(range(len(partials)), 2)
+            merged = partials[i].merge(partials[j])
+            partials = [p for k, p in enumerate(partials) if k not in (i, j)]
+            partials.append(merged)
+        return partials[0]
+
+    def test_merge_order_does_not_change_result(self):
+        """Any split and merge order should give the direct transform's output."""
+        for seed in range(25):
+            rng = random.Random(seed)
+            repository_data_list = synthetic_repository_data(
+                num_repos=rng.randint(1, 4), seed=seed
+            )
+            # Identical timestamps exercise the sequence tie-break
+            for commit in repository_data_list[0].commits[:6]:
+                commit.date = datetime(2024, 1, 20, tzinfo=timezone.utc)
+            repository_data_list[0].commits.sort(key=lambda c: c.date, reverse=True)
+            expected = self.transformer.transform(repository_data_list).to_dict()
+
+            partials = self._random_partials(repository_data_list, rng)
+            rng.shuffle(partials)
+            folded = self._random_fold(partials, rng)
+            actual = self.transformer.transform_aggregates([folded]).to_dict()
+
+            assert normalized(actual) == normalized(expected), f"seed {seed}"
+
+    def test_merge_is_associative(self):
+        """Grouping of merges should not matter."""
+        repository_data_list = synthetic_repository_data(num_repos=3, seed=5)
+        a, b, c = [
+            AggregateState.from_repository_data(repo_data, position)
+            for position, repo_data in enumerate(repository_data_list[:3])
+        ]
+
+        left = a.merge(b).merge(c)
+        right = a.merge(b.merge(c))
+
+        assert left.to_dict() == right.to_dict()
+        # Merging must not modify its inputs
+        assert (
+            a.to_dict()
+            == AggregateState.from_repository_data(repository_data_list[0], 0).to_dict()
+        )
+
+    def test_serialized_partials_fold_to_same_result(self):
+        """Partials should survive a JSON round trip."""
+        repository_data_list = synthetic_repository_data(num_repos=2, seed=9)
+        partials = [
+            AggregateState.from_repository_data(repo_data, position)
+            for position, repo_data in enumerate(repository_data_list)
+        ]
+
+        loaded = [
+            AggregateState.from_dict(json.loads(json.dumps(p.to_dict())))
+            for p in partials
+        ]
+
+        assert normalized(
+            self.transformer.transform_aggregates(loaded).to_dict()
+        ) == normalized(self.transformer.transform_aggregates(partials).to_dict())
+
+    def test_reposition_moves_repository_in_report(self):
+        """A cached partial can be placed at another position in the report."""
+        repository_data_list = synthetic_repository_data(num_repos=2, seed=2)
+        first = AggregateState.from_repository_data(repository_data_list[0], 5)
+        second = AggregateState.from_repository_data(repository_data_list[1], 1)
+        first.reposition(repository_data_list[0].path, 0)
+
+        actual = self.transformer.transform_aggregates([second, first]).to_dict()
+        expected = self.transformer.transform(repository_data_list[:2]).to_dict()
+
+        assert normalized(actual) == normalized(expected)
+
+    def test_empty_state_is_identity(self):
+        """Merging with an empty state should change nothing."""
+        repo_data = synthetic_repository_data(num_repos=1)[0]
+        state = AggregateState.from_repository_data(repo_data, 0)
+
+        assert state.merge(AggregateState()).to_dict() == state.to_dict()
+        assert AggregateState().merge(state).to_dict() == state.to_dict()
@@ -0,0 +1,59 @@
+"""Tests for the columnar commit table."""
+
+from datetime import datetime
+
+from git_sniff_otter.modules.commit_table import CommitTable
+from git_sniff_otter.modules.data_collector import DataCollector
+from git_sniff_otter.modules.data_transformer import DataTransformer
+
+from .conftest import normalized, synthetic_repository_data
+
+
+class TestCommitTable:
+    """Test cases for CommitTable."""
+
+    def test_round_trip(self):
+        """The compatibility view should give back the original commits."""
+        repository_data_list = synthetic_repository_data()
+
+        table = CommitTable.from_repository_data(repository_data_list)
+
+        assert len(table) == 120
+        assert len(table.authors) == 8
+        assert [r.to_dict() for r in table.to_repository_data()] == [
+            r.to_dict() for r in repository_data_list
+        ]
+
+    def test_naive_dates_round_trip(self):
+        """Naive dates should come back naive and unchanged."""
+        repository_data_list = synthetic_repository_data(num_repos=1)
+        commit = repository_data_list[0].commits[0]
+        commit.date = datetime(2024, 3, 1, 12, 30, 15, 123456)
+
+        table = CommitTable.from_repository_data(repository_data_list)
+
+        assert table.date(0) == commit.date
+        assert table.date(0).tzinfo is None
+
+    def test_transform_table_matches_transform(self):
+        """Transforming the columns should give the same result as the objects."""
+        repository_data_list = synthetic_repository_data()
+        transformer = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+        expected = transformer.transform(repository_data_list).to_dict()
+        actual = transformer.transform_table(
+            CommitTable.from_repository_data(repository_data_list)
+        ).to_dict()
+
+        assert normalized(actual) == normalized(expected)
+
+    def test_collector_builds_table(self, sample_repo, make_config):
+        """The collector should produce a table equal to its regular output."""
+        config = make_config([sample_repo])
+
+        expected = DataCollector(config).collect_all_data()
+        table = DataCollector(config).collect_table()
+
+        assert [c.to_dict() for c in table.iter_commits()] == [
+            c.to_dict() for c in expected[0].commits
+        ]
@@ -0,0 +1,300 @@
+"""Tests for data collection module."""
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from git_sniff_otter.modules.data_collector import DataCollector, GitInspectorData
+from git_sniff_otter.modules.data_transformer import DataTransformer
+
+from .conftest import normalized, run_git
+
+
+class TestParallelCollection:
+    """Test cases for collecting repositories in a process pool."""
+
+    def test_parallel_matches_sequential(self, sample_repo, tmp_path, make_config):
+        """Parallel collection should return the same data in input order."""
+        other_repo = str(tmp_path / "other-repo")
+        shutil.copytree(sample_repo, other_repo)
+        repo_paths = [other_repo, sample_repo, other_repo]
+
+        sequential = DataCollector(make_config(repo_paths)).collect_all_data()
+        parallel = DataCollector(
+            make_config(repo_paths, collection_jobs=2)
+        ).collect_all_data()
+
+        assert [r.path for r in parallel] == repo_paths
+        assert [r.to_dict() for r in parallel] == [r.to_dict() for r in sequential]
+
+    def test_failing_repository_is_isolated(self, sample_repo, tmp_path, make_config):
+        """A broken repository should not prevent the others from being collected."""
+        broken_repo = str(tmp_path / "broken-repo")
+        os.makedirs(os.path.join(broken_repo, ".git"))
+        config = make_config([sample_repo], collection_jobs=2)
+        config.repository_paths = [broken_repo, sample_repo]
+
+        result = DataCollector(config).collect_all_data()
+
+        assert [r.name for r in result] == ["broken-repo", "sample-repo"]
+        assert result[0].commits == []
+        assert len(result[1].commits) == 5
+
+
+class TestRepositoryPhases:
+    """Test cases for the per-repository collection phases."""
+
+    def test_phases_run_concurrently(self, sample_repo, make_config):
+        """GitInspector and the commit walk should overlap in time."""
+        collector = DataCollector(make_config([sample_repo]))
+
+        def slow_gitinspector(repo_path):
+            time.sleep(0.3)
+            return GitInspectorData("", {"authors": [{"name": "Test Author"}]})
+
+        def slow_commits(repo_path):
+            time.sleep(0.3)
+            return []
+
+        collector._run_gitinspector = slow_gitinspector
+        collector._collect_commits = slow_commits
+
+        repo_data = collector._collect_repository_data(sample_repo)
+
+        assert repo_data.gitinspector_data.authors == [{"name": "Test Author"}]
+        assert repo_data.timings["gitinspector"] >= 0.3
+        assert repo_data.timings["commits"] >= 0.3
+        assert repo_data.timings["total"] < 0.55
+
+    def test_failed_phase_is_still_timed(self, sample_repo, make_config):
+        """A failing GitInspector run should keep the commits and its timing."""
+        collector = DataCollector(
+            make_config([sample_repo], gitinspector_path="/nonexistent/gitinspector")
+        )
+
+        repo_data = collector._collect_repository_data(sample_repo)
+
+        assert repo_data.gitinspector_data is None
+        assert len(repo_data.commits) == 5
+        assert set(repo_data.timings) == {"commits", "gitinspector", "total"}
+
+
+class TestCommitCache:
+    """Test cases for the persistent commit cache."""
+
+    def test_second_run_hits_cache(self, sample_repo, tmp_path, make_config):
+        """A repeated collection should be served from the cache unchanged."""
+        uncached = DataCollector(make_config([sample_repo])).collect_all_data()
+        config = make_config(
+            [sample_repo], commit_cache=True, cache_dir=str(tmp_path / "cache")
+        )
+
+        first = DataCollector(config).collect_all_data()
+        second = DataCollector(config).collect_all_data()
+
+        assert first[0].cache_stats == {"hits": 0, "misses": 5}
+        assert second[0].cache_stats == {"hits": 5, "misses": 0}
+        assert [r.to_dict() for r in second] == [r.to_dict() for r in uncached]
+
+    def test_only_new_commits_are_read(self, sample_repo, tmp_path, make_config):
+        """Commits added after a cached run should be the only misses."""
+        config = make_config(
+            [sample_repo],
+            commit_cache=True,
+            cache_dir=str(tmp_path / "cache"),
+            commit_backend="gitpython",
+        )
+        DataCollector(config).collect_all_data()
+
+        with open(os.path.join(sample_repo, "new.txt"), "w") as f:
+            f.write("new\n")
+        run_git(sample_repo, "add", "new.txt")
+        run_git(sample_repo, "commit", "-q", "-m", "New", date="2024-01-06T08:00:00Z")
+
+        result = DataCollector(config).collect_all_data()
+
+        assert result[0].cache_stats == {"hits": 5, "misses": 1}
+        assert result[0].commits[0].message == "New"
+        assert result[0].commits[0].files_changed == ("new.txt",)
+
+
+class TestIncrementalCollection:
+    """Test cases for skipping repositories whose refs have not moved."""
+
+    def test_unchanged_repository_is_skipped(
+        self, sample_repo, tmp_path, make_config, monkeypatch
+    ):
+        """A second run should reuse the snapshot without starting any process."""
+        config = make_config(
+            [sample_repo],
+            skip_unchanged_repos=True,
+            cache_dir=str(tmp_path),
+            gitinspector_path=_fake_gitinspector(tmp_path, GITINSPECTOR_JSON),
+        )
+        first = DataCollector(config).collect_all_data()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("no process should be started")
+
+        monkeypatch.setattr(subprocess, "Popen", fail)
+        monkeypatch.setattr(subprocess, "run", fail)
+        second = DataCollector(config).collect_all_data()
+
+        assert first[0].snapshot_status == "collected"
+        assert second[0].snapshot_status == "reused"
+        assert second[0].to_dict() == first[0].to_dict()
+
+    def test_subset_window_reuses_commits(self, sample_repo, tmp_path, make_config):
+        """A narrower window should be answered from the snapshot's commits."""
+        config = make_config(
+            [sample_repo], skip_unchanged_repos=True, cache_dir=str(tmp_path)
+        )
+        DataCollector(config).collect_all_data()
+
+        config.start_date = datetime(2024, 1, 2, 12)
+        config.end_date = datetime(2024, 1, 4, 12)
+        result = DataCollector(config).collect_all_data()
+
+        assert result[0].snapshot_status == "reused-commits"
+        assert [c.message for c in result[0].commits] == ["Merge feature", "Add notes"]
+
+    def test_failed_gitinspector_is_run_again(
+        self, sample_repo, tmp_path, make_config, monkeypatch
+    ):
+        """A GitInspector failure should not be reused from the snapshot."""
+        config = make_config(
+            [sample_repo],
+            skip_unchanged_repos=True,
+            cache_dir=str(tmp_path),
+            gitinspector_path=_fake_gitinspector(tmp_path, "time.sleep(30)"),
+            gitinspector_timeout=0.5,
+        )
+        first = DataCollector(config).collect_all_data()
+
+        config.gitinspector_path = _fake_gitinspector(tmp_path, GITINSPECTOR_JSON)
+        second = DataCollector(config).collect_all_data()
+
+        monkeypatch.setattr(subprocess, "Popen", None)
+        third = DataCollector(config).collect_all_data()
+
+        assert first[0].gitinspector_failure["reason"] == "timeout"
+        assert second[0].snapshot_status == "reused-commits"
+        assert second[0].gitinspector_data.authors == [{"name": "Jane"}]
+        assert third[0].snapshot_status == "reused"
+        assert third[0].gitinspector_data.authors == [{"name": "Jane"}]
+
+    def test_moved_refs_trigger_collection(self, sample_repo, tmp_path, make_config):
+        """A new commit should invalidate the snapshot."""
+        config = make_config(
+            [sample_repo], skip_unchanged_repos=True, cache_dir=str(tmp_path)
+        )
+        DataCollector(config).collect_all_data()
+
+        run_git(sample_repo, "commit", "-q", "--allow-empty", "-m", "Empty")
+        run_git(sample_repo, "pack-refs", "--all")
+        result = DataCollector(config).collect_all_data()
+
+        assert result[0].snapshot_status == "collected"
+        assert len(result[0].commits) == 6
+
+
+GITINSPECTOR_JSON = """print('{"authors": [{"name": "Jane"}]}')"""
+
+
+def _fake_gitinspector(tmp_path, body):
+    """Write an executable script standing in for GitInspector."""
+    script = tmp_path / "fake-gitinspector"
+    script.write_text(f"#!{sys.executable}\nimport sys, time\n{body}\n")
+    script.chmod(0o755)
+    return str(script)
+
+
+class TestGitInspectorLimits:
+    """Test cases for GitInspector time budgets and output caps."""
+
+    def test_timeout_is_recorded(self, sample_repo, tmp_path, make_config):
+        """A hanging GitInspector should be killed and reported as a timeout."""
+        config = make_config(
+            [sample_repo],
+            gitinspector_path=_fake_gitinspector(tmp_path, "time.sleep(30)"),
+            gitinspector_timeout=0.5,
+        )
+        collector = DataCollector(config)
+
+        started = time.monotonic()
+        result = collector.collect_all_data()
+
+        assert time.monotonic() - started < 5
+        assert result[0].gitinspector_data is None
+        assert len(result[0].commits) == 5
+        assert collector.gitinspector_failures[0]["repository"] == sample_repo
+        assert collector.gitinspector_failures[0]["reason"] == "timeout"
+
+    def test_output_cap(self, sample_repo, tmp_path, make_config):
+        """Output beyond the cap should abort the run."""
+        config = make_config(
+            [sample_repo],
+            gitinspector_path=_fake_gitinspector(
+                tmp_path, "sys.stdout.write('x' * 100000)"
+            ),
+            gitinspector_max_output_bytes=1000,
+        )
+        collector = DataCollector(config)
+
+        collector.collect_all_data()
+
+        assert collector.gitinspector_failures[0]["reason"] == "output_limit"
+
+    def test_text_fallback_can_be_disabled(self, sample_repo, tmp_path, make_config):
+        """With the fallback disabled a failing JSON run is not repeated."""
+        calls = tmp_path / "calls.txt"
+        script = _fake_gitinspector(
+            tmp_path, f"open({str(calls)!r}, 'a').write('run\\n')\nsys.exit(1)"
+        )
+
+        for fallback, expected_runs in ((True, 2), (False, 1)):
+            calls.write_text("")
+            config = make_config(
+                [sample_repo],
+                gitinspector_path=script,
+                gitinspector_text_fallback=fallback,
+            )
+            DataCollector(config).collect_all_data()
+
+            assert calls.read_text().count("run") == expected_runs
+
+
+class TestStreaming:
+    """Test cases for streaming commits from the collector to the transformer."""
+
+    def test_stream_matches_collected_transform(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """Streaming should give the same statistics with every backend."""
+        other_repo = str(tmp_path / "other-repo")
+        shutil.copytree(sample_repo, other_repo)
+        for backend in ("numstat", "gitpython"):
+            config = make_config([sample_repo, other_repo], commit_backend=backend)
+            transformer = DataTransformer(config.start_date, config.end_date)
+
+            expected = transformer.transform(DataCollector(config).collect_all_data())
+            actual = transformer.transform_stream(
+                DataCollector(config).stream_repositories()
+            )
+
+            assert normalized(actual.to_dict()) == normalized(expected.to_dict())
+
+    def test_stream_failure_is_recorded(self, tmp_path, make_config, sample_repo):
+        """A repository that cannot be read should end its stream with an error."""
+        broken_repo = str(tmp_path / "broken-repo")
+        os.makedirs(os.path.join(broken_repo, ".git"))
+        config = make_config([sample_repo])
+        config.repository_paths = [broken_repo]
+
+        ((repo_data, commits),) = DataCollector(config).stream_repositories()
+
+        assert list(commits) == []
+        assert "commits" in repo_data.errors
@@ -1,6 +1,10 @@
 """Tests for data transformation module."""
 
-from datetime import datetime, timedelta
+import gc
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
 
 from git_sniff_otter.modules.data_collector import CommitData, RepositoryData
 from git_sniff_otter.modules.data_transformer import (
@@ -9,6 +13,8 @@ from git_sniff_otter.modules.data_transformer import (
     RepositoryStats,
 )
 
+from .conftest import normalized, synthetic_repository_data
+
 
 class MockCommit:
     """Mock commit for testing."""
@@ -78,6 +84,18 @@ class TestAuthorStats:
         assert result["total_commits"] == 1
         assert result["net_lines"] == 5  # 10 - 5
 
+    def test_only_recent_messages_are_kept(self):
+        """Test that messages beyond the reported ones are not stored."""
+        author = AuthorStats("John Doe", "john@example.com")
+        for i in range(15):
+            author.add_commit(CommitData(MockCommit(message=f"Commit {i}")), "repo")
+
+        result = author.to_dict()
+
+        assert len(author.commit_messages) == 10
+        assert result["recent_commit_messages"] == [f"Commit {i}" for i in range(10)]
+        assert result["total_commits"] == 15
+
 
 class TestRepositoryStats:
     """Test cases for RepositoryStats class."""
@@ -97,6 +115,13 @@ class TestRepositoryStats:
         assert repo_stats.total_commits == 1
         assert repo_stats.total_insertions == 10
 
+    def test_commit_data_is_slotted(self):
+        """Test that commit data has no per-instance dict and keeps its dict form."""
+        commit_data = CommitData(MockCommit(files={"a.py": {}, "b.md": {}}))
+
+        assert not hasattr(commit_data, "__dict__")
+        assert commit_data.to_dict()["files_changed"] == ["a.py", "b.md"]
+
 
 class TestDataTransformer:
     """Test cases for DataTransformer class."""
@@ -126,3 +151,146 @@ class TestDataTransformer:
         assert summary["total_commits"] == 1
         assert summary["total_repositories"] == 1
         assert summary["total_authors"] == 1
+
+
+class TestNumpyEngine:
+    """Test that the numpy engine matches the python engine exactly."""
+
+    @staticmethod
+    def _both_engines(repository_data_list):
+        """Transform with both engines and return the normalized dicts."""
+        pytest.importorskip("numpy")
+        start_date = datetime(2024, 1, 1)
+        end_date = datetime(2024, 2, 1)
+        expected = DataTransformer(start_date, end_date).transform(repository_data_list)
+        actual = DataTransformer(start_date, end_date, engine="numpy").transform(
+            repository_data_list
+        )
+        return normalized(actual.to_dict()), normalized(expected.to_dict())
+
+    def test_matches_mock_commit_fixtures(self):
+        """Test the engines agree on the mock commits used above."""
+        repo_data = RepositoryData("/test/repo", "test-repo")
+        repo_data.commits = [
+            CommitData(MockCommit(files={"test.py": {}, "main.js": {}})),
+            CommitData(MockCommit(author_name="Other", author_email="o@x.com")),
+            CommitData(MockCommit(message="Docs", files={"README": {}, "a.MD": {}})),
+        ]
+
+        actual, expected = self._both_engines([repo_data])
+
+        assert actual == expected
+
+    def test_matches_large_synthetic_dataset(self):
+        """Test the engines agree on many repositories with tied counts and dates."""
+        repository_data_list = synthetic_repository_data(
+            num_repos=12, commits_per_repo=1500, seed=7
+        )
+
+        actual, expected = self._both_engines(repository_data_list)
+
+        assert actual == expected
+
+    def test_equal_dates_keep_first_commit(self):
+        """Test that the same instant in different timezones resolves like python."""
+        repository_data_list = synthetic_repository_data(num_repos=2, seed=3)
+        instant = datetime(2024, 1, 5, 12, tzinfo=timezone.utc)
+        for i, commit in enumerate(repository_data_list[0].commits):
+            commit.date = instant.astimezone(timezone(timedelta(hours=i % 5)))
+
+        actual, expected = self._both_engines(repository_data_list)
+
+        assert actual == expected
+
+    def test_empty_input(self):
+        """Test the engines agree when there are no commits at all."""
+        actual, expected = self._both_engines([RepositoryData("/r", "r")])
+
+        assert actual == expected
+        assert actual["author_stats"] == []
+
+    def test_unknown_engine_is_rejected(self):
+        """Test that an unknown engine name raises an error."""
+        with pytest.raises(ValueError):
+            DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1), engine="gpu")
+
+
+class TestFusedTransform:
+    """Test that the single-pass transform matches the per-class walks."""
+
+    def test_matches_separate_walks(self):
+        """Test the fused pass against RepositoryStats and AuthorStats.add_commit."""
+        repository_data_list = synthetic_repository_data(num_repos=4, seed=11)
+        transformer = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+        repository_stats = [RepositoryStats(r) for r in repository_data_list]
+        authors = {}
+        for repo_data in repository_data_list:
+            for commit in repo_data.commits:
+                key = (commit.author_name, commit.author_email)
+                if key not in authors:
+                    authors[key] = AuthorStats(*key)
+                authors[key].add_commit(commit, repo_data.name)
+        expected = transformer._build_transformed(
+            repository_stats, list(authors.values())
+        )
+
+        actual = transformer.transform(repository_data_list)
+
+        assert normalized(actual.to_dict()) == normalized(expected.to_dict())
+
+
+class TestStreamTransform:
+    """Test cases for transforming streamed commits."""
+
+    transformer = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+    def test_arrival_order_does_not_matter(self):
+        """Test that shuffled commits give the result of the sorted commits."""
+        repository_data_list = synthetic_repository_data(seed=4)
+        expected = self.transformer.transform(repository_data_list).to_dict()
+        rng = random.Random(4)
+
+        def shuffled(commits):
+            commits = list(commits)
+            rng.shuffle(commits)
+            return iter(commits)
+
+        actual = self.transformer.transform_stream(
+            (repo_data, shuffled(repo_data.commits))
+            for repo_data in repository_data_list
+        ).to_dict()
+
+        assert normalized(actual) == normalized(expected)
+
+    def test_commits_are_not_retained(self):
+        """Test that streamed commits are released as soon as they are folded in."""
+        template = synthetic_repository_data(num_repos=1)[0].commits
+        live_counts = []
+
+        def commits():
+            for i in range(3000):
+                if i % 1000 == 999:
+                    live_counts.append(
+                        sum(isinstance(o, CommitData) for o in gc.get_objects())
+                    )
+                commit = template[i % len(template)]
+                yield CommitData.from_fields(
+                    sha=f"{i:040x}",
+                    author_name=commit.author_name,
+                    author_email=commit.author_email,
+                    message=commit.message,
+                    date=commit.date,
+                    files_changed=list(commit.files_changed),
+                    insertions=commit.insertions,
+                    deletions=commit.deletions,
+                    lines_changed=commit.lines_changed,
+                )
+
+        baseline = sum(isinstance(o, CommitData) for o in gc.get_objects())
+        result = self.transformer.transform_stream(
+            [(RepositoryData("/r", "r"), commits())]
+        )
+
+        assert result.overall_stats["total_commits"] == 3000
+        assert max(live_counts) - baseline < 10
@@ -0,0 +1,117 @@
+"""Tests for the streaming git log commit backend."""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from git_sniff_otter.modules.data_collector import DataCollector
+from git_sniff_otter.modules.git_log import iter_records
+
+from .conftest import run_git
+
+SHA_1 = b"a" * 40
+SHA_2 = b"d" * 64
+
+
+class TestNumstatBackend:
+    """Test cases for the numstat commit backend."""
+
+    def test_matches_gitpython_backend(self, sample_repo, make_config):
+        """Both backends should produce identical commit data."""
+        numstat = DataCollector(make_config([sample_repo], commit_backend="numstat"))
+        gitpython = DataCollector(
+            make_config([sample_repo], commit_backend="gitpython")
+        )
+
+        numstat_commits = [c.to_dict() for c in numstat._collect_commits(sample_repo)]
+        gitpython_commits = [
+            c.to_dict() for c in gitpython._collect_commits(sample_repo)
+        ]
+
+        assert len(numstat_commits) == 5
+        assert numstat_commits == gitpython_commits
+
+    def test_time_window_is_applied(self, sample_repo, make_config):
+        """Commits outside the window should not be collected."""
+        config = make_config([sample_repo], commit_backend="numstat")
+        config.start_date = datetime(2024, 1, 2, 12)
+        config.end_date = datetime(2024, 1, 4, 12)
+
+        commits = DataCollector(config)._collect_commits(sample_repo)
+
+        assert [c.message for c in commits] == ["Merge feature", "Add notes"]
+
+    def test_records_split_across_chunks(self):
+        """Records should parse the same however the output is chunked."""
+        output = (
+            b"\x1e" + SHA_1 + b"\x00Jane\x00jane@example.com\x00"
+            b"2024-01-01T00:00:00+00:00\x00Fix bug\n\x00"
+            b"\x00\n3\t1\tsrc/a.py\x00-\t-\timg.png\x00"
+            b"\x1e" + SHA_2 + b"\x00John\x00john@example.com\x00"
+            b"2024-01-02T00:00:00+00:00\x00Empty\n\x00"
+        )
+        chunked = [output[i : i + 7] for i in range(0, len(output), 7)]
+
+        records = list(iter_records(iter(chunked)))
+
+        assert [r.sha.encode() for r in records] == [SHA_1, SHA_2]
+        assert records[0].files_changed == ["src/a.py", "img.png"]
+        assert (records[0].insertions, records[0].deletions) == (3, 1)
+        assert records[1].files_changed == []
+        assert records[1].date == datetime.fromisoformat("2024-01-02T00:00:00+00:00")
+
+    def test_paths_are_kept_verbatim(self):
+        """Whitespace in file names should be kept."""
+        output = (
+            b"\x1e" + SHA_1 + b"\x00Jane\x00jane@example.com\x00"
+            b"2024-01-01T00:00:00+00:00\x00Rename\n\x00"
+            b"\x00\n1\t0\t notes.txt \x002\t0\tdocs/\tspec\x00"
+        )
+
+        (record,) = iter_records(iter([output]))
+
+        assert record.files_changed == [" notes.txt ", "docs/\tspec"]
+
+    def test_record_separators_in_commits_are_kept(self, sample_repo, make_config):
+        """Record separators in messages or names should not cut a commit."""
+        with open(os.path.join(sample_repo, "odd.txt"), "w") as f:
+            f.write("odd\n")
+        run_git(sample_repo, "add", ".")
+        run_git(
+            sample_repo,
+            "commit",
+            "-q",
+            "--author=Odd\x1eName <odd@example.com>",
+            "-m",
+            "Odd \x1e" + "a" * 40 + " message",
+            date="2024-01-05T09:00:00Z",
+        )
+        numstat = DataCollector(make_config([sample_repo], commit_backend="numstat"))
+        gitpython = DataCollector(
+            make_config([sample_repo], commit_backend="gitpython")
+        )
+
+        numstat_commits = [c.to_dict() for c in numstat._collect_commits(sample_repo)]
+
+        assert len(numstat_commits) == 6
+        assert numstat_commits == [
+            c.to_dict() for c in gitpython._collect_commits(sample_repo)
+        ]
+
+    def test_invalid_backend(self, sample_repo, make_config):
+        """Unknown backends should be rejected by the config."""
+        with pytest.raises(ValueError, match="Unknown commit backend"):
+            make_config([sample_repo], commit_backend="svn")
+
+    def test_window_defaults_to_recent_days(self, sample_repo, make_config):
+        """Without explicit dates, old commits fall outside the default window."""
+        config = make_config([sample_repo], commit_backend="numstat")
+        config.start_date = None
+        config.end_date = None
+        config.time_window_days = 1
+
+        assert DataCollector(config)._collect_commits(sample_repo) == []
+        assert config.analysis_end_date - config.analysis_start_date <= timedelta(
+            days=1
+        )
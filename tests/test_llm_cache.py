@@ -0,0 +1,88 @@
+"""Tests for the LLM response cache."""
+
+from datetime import datetime
+
+from git_sniff_otter.modules import llm_cache
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.llm_cache import ResponseCache
+from git_sniff_otter.modules.llm_generator import LLMReportGenerator
+
+from .conftest import FakeChatClient, synthetic_repository_data
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    def test_expired_entries_are_not_returned(self, tmp_path, monkeypatch):
+        """Entries older than the TTL should be misses."""
+        cache = ResponseCache(str(tmp_path / "llm.sqlite3"), 60, 1024)
+        cache.put("key", "gpt-4", "report")
+        assert cache.get("key") == "report"
+
+        later = llm_cache.time.time() + 61
+        monkeypatch.setattr(llm_cache.time, "time", lambda: later)
+
+        assert cache.get("key") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_least_recently_used_is_evicted(self, tmp_path, monkeypatch):
+        """Storing beyond the size limit should evict the least recently used entry."""
+        now = [1000.0]
+        monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+        cache = ResponseCache(str(tmp_path / "llm.sqlite3"), 0, 10)
+
+        cache.put("a", "gpt-4", "aaaa")
+        now[0] += 1
+        cache.put("b", "gpt-4", "bbbb")
+        now[0] += 1
+        cache.get("a")
+        now[0] += 1
+        cache.put("c", "gpt-4", "cccc")
+
+        assert cache.get("a") == "aaaa"
+        assert cache.get("b") is None
+        assert cache.get("c") == "cccc"
+
+    def test_identical_report_is_requested_once(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """Rerunning the same report should be served from the cache."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path))
+        transformed = DataTransformer(
+            datetime(2024, 1, 1), datetime(2024, 2, 1)
+        ).transform(synthetic_repository_data())
+        client = FakeChatClient()
+
+        reports = []
+        for llm_model in ("gpt-4", "gpt-4", "gpt-4o"):
+            generator = LLMReportGenerator(
+                config.model_copy(update={"llm_model": llm_model})
+            )
+            generator.client = client
+            reports.append(generator.generate_report(transformed))
+
+        assert reports == ["Report 1", "Report 1", "Report 2"]
+        assert len(client.requests) == 2
+
+        uncached = LLMReportGenerator(config.model_copy(update={"llm_cache": False}))
+        uncached.client = client
+        assert uncached.generate_report(transformed) == "Report 3"
+
+    def test_endpoints_are_cached_separately(self, sample_repo, tmp_path, make_config):
+        """A response from one base URL should not be returned for another."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path))
+        transformed = DataTransformer(
+            datetime(2024, 1, 1), datetime(2024, 2, 1)
+        ).transform(synthetic_repository_data())
+        client = FakeChatClient()
+
+        reports = []
+        for base_url in ("http://127.0.0.1:8399/v1", None, "http://127.0.0.1:8399/v1"):
+            generator = LLMReportGenerator(
+                config.model_copy(update={"llm_base_url": base_url})
+            )
+            generator.client = client
+            reports.append(generator.generate_report(transformed))
+
+        assert reports == ["Report 1", "Report 2", "Report 1"]
+        assert len(client.requests) == 2
@@ -0,0 +1,71 @@
+"""Tests for LLM report generation."""
+
+from datetime import datetime
+
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.llm_generator import LLMReportGenerator
+
+from .conftest import FakeChatClient, synthetic_repository_data
+
+
+class TestMapReduce:
+    """Test cases for map-reduce report generation."""
+
+    transformed = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1)).transform(
+        synthetic_repository_data(num_repos=6)
+    )
+
+    def _generator(self, make_config, sample_repo, client, **overrides):
+        """Build a map-reduce generator talking to a fake client."""
+        overrides = dict({"llm_map_reduce": True, "llm_cache": False}, **overrides)
+        config = make_config([sample_repo], **overrides)
+        generator = LLMReportGenerator(config)
+        generator.client = client
+        return generator
+
+    def test_repositories_are_summarized_concurrently(self, sample_repo, make_config):
+        """Each repository gets its own request, bounded by the concurrency limit."""
+        client = FakeChatClient(delay=0.05)
+        generator = self._generator(make_config, sample_repo, client, llm_concurrency=3)
+
+        report = generator.generate_report(self.transformed)
+
+        names = [repo.name for repo in self.transformed.repository_stats]
+        assert report == "Report 1"
+        assert len(client.requests) == len(names) + 1
+        assert client.max_in_flight == 3
+        final_prompt = client.requests[-1][1]["content"]
+        for name in names:
+            assert f"Summary of {name}" in final_prompt
+        # The summaries replace the repositories' statistics
+        assert '"recent_commits":[' not in final_prompt
+
+    def test_failed_summary_falls_back_to_statistics(self, sample_repo, make_config):
+        """A failed repository request should not fail the report."""
+        client = FakeChatClient(fail_for={"repo-1"})
+        generator = self._generator(make_config, sample_repo, client)
+
+        report = generator.generate_report(self.transformed)
+
+        final_prompt = client.requests[-1][1]["content"]
+        assert report == "Report 1"
+        assert "Summary of repo-1" not in final_prompt
+        assert "40 commits by" in final_prompt
+
+    def test_summaries_are_cached_individually(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """Repository summaries should be reused when only the report is new."""
+        client = FakeChatClient()
+        generator = self._generator(
+            make_config, sample_repo, client, llm_cache=True, cache_dir=str(tmp_path)
+        )
+        generator.generate_report(self.transformed)
+        requests = len(client.requests)
+
+        # A tighter budget changes the final prompt but not the summaries
+        generator.config.prompt_token_budget = 500
+        generator.prompt_builder.token_budget = 500
+        generator.generate_report(self.transformed)
+
+        assert len(client.requests) == requests + 1
@@ -0,0 +1,92 @@
+"""Tests for the local LLM stub server."""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+import requests
+
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.llm_generator import LLMReportGenerator
+from git_sniff_otter.modules.llm_stub import LLMStubServer, StubSettings
+
+from .conftest import synthetic_repository_data
+
+
+@pytest.fixture
+def stub_server():
+    """Start stub servers with given settings, stopping them afterwards."""
+    servers = []
+
+    def _stub_server(**settings):
+        values = dict({"latency_ms": 0, "tokens_per_second": 10000}, **settings)
+        server = LLMStubServer(StubSettings(**values)).start()
+        servers.append(server)
+        return server
+
+    yield _stub_server
+    for server in servers:
+        server.close()
+
+
+class TestLLMStub:
+    """Test cases for LLMStubServer."""
+
+    transformed = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1)).transform(
+        synthetic_repository_data()
+    )
+
+    def _generator(self, make_config, sample_repo, server, **overrides):
+        """Build a generator configured to use the stub server."""
+        config = make_config(
+            [sample_repo], llm_base_url=server.base_url, llm_cache=False, **overrides
+        )
+        return LLMReportGenerator(config)
+
+    def test_responses_are_deterministic(self, stub_server, sample_repo, make_config):
+        """The same request should get the same report, through LLM_BASE_URL."""
+        server = stub_server(response_tokens=80)
+        generator = self._generator(make_config, sample_repo, server)
+
+        first = generator.generate_report(self.transformed)
+        second = generator.generate_report(self.transformed)
+
+        assert first == second
+        assert first.startswith("# Git Repository Analysis Report")
+        assert "## Executive Summary" in first
+        assert server.requests == 2
+
+    def test_streaming_follows_token_rate(self, stub_server, sample_repo, make_config):
+        """A streamed response should take as long as its tokens at the set rate."""
+        server = stub_server(response_tokens=40, tokens_per_second=200)
+        generator = self._generator(make_config, sample_repo, server)
+
+        started = time.monotonic()
+        report = asyncio.run(generator.stream_report(self.transformed, []))
+
+        assert time.monotonic() - started >= 39 / 200
+        assert report == generator.generate_report(self.transformed)
+
+    def test_error_injection(self, stub_server, sample_repo, make_config):
+        """Injected errors should be retried and eventually give up."""
+        server = stub_server(error_rate=1.0)
+        generator = self._generator(
+            make_config, sample_repo, server, llm_max_attempts=2
+        )
+        generator.retry_policy.base_delay = 0.01
+
+        report = generator.generate_report(self.transformed)
+
+        assert report.startswith("# Git Repository Analysis Report\n")
+        assert "Executive Summary\nAnalysis of" in report
+        assert server.errors == 2
+
+        limited = stub_server(rate_limit_rate=1.0, retry_after=3)
+        response = requests.post(
+            f"{limited.base_url}/chat/completions",
+            json={"model": "stub", "messages": []},
+            timeout=10,
+        )
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
@@ -0,0 +1,84 @@
+"""Tests for splitting markdown reports into messages."""
+
+import random
+import re
+
+from git_sniff_otter.modules.markdown_split import split_markdown
+
+TABLE_HEADER = ["| Author | Commits |", "|---|---:|"]
+
+
+def random_report(rng):
+    """Build a report mixing headings, text, long lines, code and tables."""
+    lines = ["# Report"]
+    for _ in range(rng.randrange(1, 30)):
+        kind = rng.choice(["heading", "text", "text", "long", "word", "code", "table"])
+        if kind == "heading":
+            lines += ["", f"## Section {rng.randrange(100)}"]
+        elif kind == "text":
+            lines.append(" ".join("word" * rng.randrange(1, 4) for _ in range(12)))
+        elif kind == "long":
+            lines.append(" ".join("x" * rng.randrange(1, 30) for _ in range(80)))
+        elif kind == "word":
+            lines.append("y" * rng.randrange(1, 1500))
+        elif kind == "code":
+            lines.append("```python")
+            lines += [f"    value_{i} = {i}" for i in range(rng.randrange(60))]
+            lines.append("```")
+        else:
+            lines += TABLE_HEADER
+            lines += [f"| Author {i} | {i} |" for i in range(rng.randrange(60))]
+    return "\n".join(lines)
+
+
+def content(text):
+    """Reduce markdown to its text, without fences, table headers or whitespace."""
+    lines = [
+        line
+        for line in text.split("\n")
+        if not line.startswith("```") and line not in TABLE_HEADER
+    ]
+    return re.sub(r"\s", "", "".join(lines))
+
+
+class TestSplitMarkdown:
+    """Test cases for split_markdown."""
+
+    def test_random_reports_fit_without_losing_content(self):
+        """Every chunk should fit, keep fences balanced and lose no text."""
+        rng = random.Random(0)
+        for _ in range(300):
+            report = random_report(rng)
+            max_length = rng.randrange(60, 800)
+
+            chunks = split_markdown(report, max_length)
+
+            assert all(0 < len(chunk) <= max_length for chunk in chunks)
+            for chunk in chunks:
+                fences = [line for line in chunk.split("\n") if line.startswith("```")]
+                assert len(fences) % 2 == 0
+            assert "".join(content(chunk) for chunk in chunks) == content(report)
+
+    def test_large_blocks_are_split_in_valid_pieces(self):
+        """Large code blocks reopen their fence and large tables repeat their header."""
+        code = ["```python"] + [f"line_{i} = {i}" for i in range(100)] + ["```"]
+        table = TABLE_HEADER + [f"| Author {i} | {i} |" for i in range(100)]
+
+        code_chunks = split_markdown("\n".join(code), 300)
+        table_chunks = split_markdown("\n".join(table), 300)
+
+        assert len(code_chunks) > 1 and len(table_chunks) > 1
+        for chunk in code_chunks:
+            assert chunk.startswith("```python\n") and chunk.endswith("\n```")
+        for chunk in table_chunks:
+            assert chunk.split("\n")[:2] == TABLE_HEADER
+
+    def test_headings_start_chunks(self):
+        """A heading should move on with its section instead of ending a chunk."""
+        report = "# Title\n" + "a" * 50 + "\n\n## Next\n" + "b" * 170
+
+        assert split_markdown(report, 200) == [
+            "# Title\n" + "a" * 50,
+            "## Next\n" + "b" * 170,
+        ]
+        assert split_markdown("x" * 250, 100) == ["x" * 100, "x" * 100, "x" * 50]
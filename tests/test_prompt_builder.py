@@ -0,0 +1,62 @@
+"""Tests for the token-budgeted prompt builder."""
+
+import json
+from datetime import datetime
+
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.prompt_builder import PromptBuilder, estimate_tokens
+
+from .conftest import synthetic_repository_data
+
+
+def _section(text, heading):
+    """Parse the JSON under a markdown heading of a built prompt."""
+    return json.loads(text.split(f"## {heading}\n", 1)[1].split("\n", 1)[0])
+
+
+class TestPromptBuilder:
+    """Test cases for PromptBuilder."""
+
+    data = (
+        DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1))
+        .transform(synthetic_repository_data(num_repos=6, commits_per_repo=60))
+        .to_dict()
+    )
+
+    def test_unlimited_budget_keeps_everything(self):
+        """Without a budget all entries are sent, with names replaced by ids."""
+        built = PromptBuilder(0).build(self.data)
+        repositories = _section(built.text, "Repository Details")
+        authors = _section(built.text, "Author Contributions")
+
+        assert len(repositories) == len(self.data["repository_stats"])
+        assert len(authors) == len(self.data["author_stats"])
+        assert not any(built.omitted.values())
+        for repo in repositories:
+            for commit in repo["recent_commits"]:
+                assert authors[commit["author"]]["id"] == commit["author"]
+        assert [
+            repositories[i]["name"] for i in authors[0]["repositories"]
+        ] == self.data["author_stats"][0]["repositories"]
+        assert built.estimated_tokens == estimate_tokens(built.text)
+
+    def test_prompt_fits_budget(self):
+        """The prompt should shrink to fit and keep the most active entries."""
+        full = PromptBuilder(0).build(self.data)
+        budget = full.estimated_tokens // 3
+        built = PromptBuilder(budget).build(self.data)
+        authors = _section(built.text, "Author Contributions")
+
+        assert built.estimated_tokens <= budget
+        assert built.omitted["recent_commits"] > 0
+        assert authors[0]["name"] == self.data["author_stats"][0]["name"]
+        assert _section(built.text, "Overall Statistics") == self.data["overall_stats"]
+
+    def test_tiny_budget_keeps_overall_statistics(self):
+        """An unreachable budget should still send the top entries and totals."""
+        built = PromptBuilder(1).build(self.data)
+
+        assert len(_section(built.text, "Repository Details")) == 1
+        assert len(_section(built.text, "Author Contributions")) == 1
+        assert built.omitted["authors"] == len(self.data["author_stats"]) - 1
+        assert "left out" in built.describe(1)
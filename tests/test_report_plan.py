@@ -0,0 +1,143 @@
+"""Tests for report plans."""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from git_sniff_otter.modules import llm_generator, report_plan
+from git_sniff_otter.modules.data_collector import DataCollector
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.report_plan import ReportPlan, run_report_plan
+
+from .conftest import FakeChatClient
+
+
+def write_plan(tmp_path, jobs):
+    """Write a plan file next to the test's files."""
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps({"jobs": jobs}))
+    return str(path)
+
+
+class TestReportPlan:
+    """Test cases for ReportPlan."""
+
+    def test_load_resolves_windows_and_paths(self, sample_repo, make_config, tmp_path):
+        """Jobs should get their windows, channels and paths relative to the plan."""
+        (tmp_path / "prompt.txt").write_text("Be brief.")
+        config = make_config([sample_repo], slack_channel="#default")
+        path = write_plan(
+            tmp_path,
+            [
+                {"repos": ["sample-repo"], "days": 3, "prompt_file": "prompt.txt"},
+                {
+                    "name": "monthly",
+                    "repos": [sample_repo, "sample-repo"],
+                    "start_date": "2024-01-01",
+                    "end_date": "2024-02-01",
+                    "channels": "#monthly",
+                },
+            ],
+        )
+
+        plan = ReportPlan.load(path, config, now=datetime(2024, 1, 10))
+
+        weekly, monthly = plan.jobs
+        assert weekly.name == "job-1"
+        assert (weekly.start_date, weekly.end_date) == (
+            datetime(2024, 1, 7),
+            datetime(2024, 1, 10),
+        )
+        assert weekly.channels == ["#default"]
+        assert weekly.system_prompt == "Be brief."
+        assert monthly.channels == ["#monthly"]
+        assert plan.repository_paths == [os.path.normpath(sample_repo)]
+        assert (plan.start_date, plan.end_date) == (
+            datetime(2024, 1, 1),
+            datetime(2024, 2, 1),
+        )
+        assert plan.job_config(config, weekly).llm_system_prompt == "Be brief."
+
+    def test_invalid_plans_are_rejected(self, sample_repo, make_config, tmp_path):
+        """Unknown keys, missing repositories and empty plans should fail to load."""
+        config = make_config([sample_repo])
+        for jobs in ([], [{"repos": []}], [{"repos": ["a"], "channel": "#x"}]):
+            with pytest.raises(ValueError):
+                ReportPlan.load(write_plan(tmp_path, jobs), config)
+
+    def test_repositories_are_collected_once_for_all_jobs(
+        self, sample_repo, make_config, tmp_path, monkeypatch
+    ):
+        """Every job should report its own window from a single collection pass."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path), llm_cache=False)
+        windows = [("2024-01-01", "2024-01-03"), ("2023-12-01", "2024-02-01")]
+        path = write_plan(
+            tmp_path,
+            [
+                {
+                    "name": f"job-{start}",
+                    "repos": [sample_repo],
+                    "start_date": start,
+                    "end_date": end,
+                    "save_report": f"{start}.md",
+                }
+                for start, end in windows
+            ],
+        )
+        client = FakeChatClient()
+        monkeypatch.setattr(llm_generator, "OpenAI", lambda **kwargs: client)
+        collections = []
+        collect = DataCollector.collect_all_data
+
+        def counting_collect(collector):
+            collections.append(collector.config.repository_paths)
+            return collect(collector)
+
+        monkeypatch.setattr(
+            report_plan.DataCollector, "collect_all_data", counting_collect
+        )
+
+        results = run_report_plan(config, ReportPlan.load(path, config), dry_run=True)
+
+        assert len(collections) == 1
+        assert len(client.requests) == 2
+        for (start, end), result in zip(windows, results):
+            start_date = datetime.strptime(start, "%Y-%m-%d")
+            end_date = datetime.strptime(end, "%Y-%m-%d")
+            window_config = make_config(
+                [sample_repo], start_date=start_date, end_date=end_date
+            )
+            expected = DataTransformer(start_date, end_date).transform(
+                DataCollector(window_config).collect_all_data()
+            )
+            assert result["commits"] == expected.overall_stats["total_commits"]
+            assert result["sent"] is None
+            assert (tmp_path / f"{start}.md").read_text() == result["report"]
+        assert results[0]["commits"] < results[1]["commits"]
+
+    def test_failing_job_does_not_stop_the_others(
+        self, sample_repo, make_config, tmp_path, monkeypatch
+    ):
+        """A job that fails should record its error while the other jobs finish."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path), llm_cache=False)
+        path = write_plan(
+            tmp_path,
+            [
+                {
+                    "name": "broken",
+                    "repos": [sample_repo],
+                    "save_report": "missing/broken.md",
+                },
+                {"name": "ok", "repos": [sample_repo], "save_report": "ok.md"},
+            ],
+        )
+        monkeypatch.setattr(llm_generator, "OpenAI", lambda **kwargs: FakeChatClient())
+
+        broken, ok = run_report_plan(config, ReportPlan.load(path, config))
+
+        assert broken["error"]
+        assert broken["sent"] is False
+        assert ok["error"] is None
+        assert (tmp_path / "ok.md").read_text() == ok["report"]
@@ -0,0 +1,158 @@
+"""Tests for streaming report generation and section delivery."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from openai import AsyncOpenAI
+
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.llm_generator import LLMReportGenerator
+from git_sniff_otter.modules.report_stream import FileSink, ReportSink, SectionSplitter
+
+from .conftest import FakeLLMServer, synthetic_repository_data
+
+REPORT_CHUNKS = [
+    "# Weekly Report\n\n## Executive",
+    " Summary\nBusy week.\n",
+    "\n## Repositories\n```\n## not a heading\n```\n",
+    "Details.\n## Contributors\nAuthor 1 led.",
+]
+
+
+class RecordingSink(ReportSink):
+    """Sink remembering every section and when it arrived."""
+
+    def __init__(self):
+        self.sections = []
+        self.received_at = []
+        self.closed = False
+
+    def write_section(self, section):
+        """Record a section."""
+        self.sections.append(section)
+        self.received_at.append(time.monotonic())
+
+    def close(self):
+        """Record that the sink was closed."""
+        self.closed = True
+        return True
+
+
+class TestSectionSplitter:
+    """Test cases for SectionSplitter."""
+
+    def test_sections_are_cut_at_headings(self):
+        """Sections end at headings outside code fences; the title is kept."""
+        splitter = SectionSplitter()
+        sections = []
+        for chunk in REPORT_CHUNKS:
+            sections.extend(splitter.feed(chunk))
+        sections.extend(splitter.close())
+
+        assert sections == [
+            "# Weekly Report\n\n## Executive Summary\nBusy week.",
+            "## Repositories\n```\n## not a heading\n```\nDetails.",
+            "## Contributors\nAuthor 1 led.",
+        ]
+
+
+class TestStreamReport:
+    """Test cases for LLMReportGenerator.stream_report."""
+
+    transformed = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1)).transform(
+        synthetic_repository_data()
+    )
+
+    @pytest.fixture
+    def stream_generator(self, sample_repo, tmp_path, make_config):
+        """Build a generator streaming from a fake server."""
+        servers = []
+
+        def _stream_generator(chunks, delay=0.0, statuses=()):
+            server = FakeLLMServer(chunks, delay, statuses)
+            servers.append(server)
+            config = make_config(
+                [sample_repo], cache_dir=str(tmp_path), llm_max_attempts=2
+            )
+            generator = LLMReportGenerator(config)
+            generator.async_client = AsyncOpenAI(
+                api_key="test", base_url=server.base_url, max_retries=0
+            )
+            return generator, server
+
+        yield _stream_generator
+        for server in servers:
+            server.close()
+
+    def test_sections_are_delivered_while_streaming(self, stream_generator, tmp_path):
+        """The first section should reach the sinks before the stream ends."""
+        generator, server = stream_generator(REPORT_CHUNKS, delay=0.1)
+        sink = RecordingSink()
+        path = tmp_path / "report.md"
+
+        report = asyncio.run(
+            generator.stream_report(self.transformed, [sink, FileSink(str(path))])
+        )
+
+        assert report == "".join(REPORT_CHUNKS)
+        assert len(sink.sections) == 3
+        assert sink.received_at[0] < server.sent_at[-1]
+        assert sink.closed
+        assert path.read_text(encoding="utf-8") == "\n\n".join(sink.sections) + "\n"
+
+        # A rerun is answered from the response cache
+        cached_sink = RecordingSink()
+        server.close()
+        assert (
+            asyncio.run(generator.stream_report(self.transformed, [cached_sink]))
+            == report
+        )
+        assert cached_sink.sections == sink.sections
+
+    def test_transient_failure_is_retried(self, stream_generator):
+        """Opening the stream should be retried after a server error."""
+        generator, server = stream_generator(REPORT_CHUNKS, statuses=[503])
+        generator.retry_policy.base_delay = 0.01
+        sink = RecordingSink()
+
+        report = asyncio.run(generator.stream_report(self.transformed, [sink]))
+
+        assert len(server.requests) == 2
+        assert report == "".join(REPORT_CHUNKS)
+
+    def test_failed_request_delivers_fallback_report(self, stream_generator):
+        """A request failing before the first section sends the fallback report."""
+        generator, server = stream_generator(REPORT_CHUNKS, statuses=[400])
+        sink = RecordingSink()
+
+        report = asyncio.run(generator.stream_report(self.transformed, [sink]))
+
+        assert len(server.requests) == 1
+        assert report.startswith("# Git Repository Analysis Report")
+        assert "\n\n".join(sink.sections) == report
+
+    def test_building_the_prompt_does_not_block_the_loop(self, stream_generator):
+        """The event loop should keep running while the prompt is being built."""
+        generator, _ = stream_generator(REPORT_CHUNKS)
+        loop_ran = threading.Event()
+        create_messages = generator._create_messages
+
+        def slow_create_messages(data):
+            # Map-reduce summaries block like this until their requests finish
+            assert loop_ran.wait(timeout=5)
+            return create_messages(data)
+
+        generator._create_messages = slow_create_messages
+
+        async def run():
+            report = asyncio.create_task(
+                generator.stream_report(self.transformed, [RecordingSink()])
+            )
+            await asyncio.sleep(0.05)
+            loop_ran.set()
+            return await report
+
+        assert asyncio.run(run()) == "".join(REPORT_CHUNKS)
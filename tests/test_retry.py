@@ -0,0 +1,157 @@
+"""Tests for retries and rate limiting of requests."""
+
+from datetime import datetime
+
+import pytest
+from openai import OpenAI
+
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.llm_generator import LLMReportGenerator
+from git_sniff_otter.utils.retry import RetryPolicy, TokenBucket
+
+from .conftest import FakeLLMServer, synthetic_repository_data
+
+
+class FakeClock:
+    """Clock that only moves when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        """Advance the clock instead of sleeping."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class StatusError(Exception):
+    """Error carrying an HTTP status, like the OpenAI client's errors."""
+
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_backoff_is_exponential_with_jitter(self):
+        """Delays should double per attempt up to the maximum, scaled by jitter."""
+        clock = FakeClock()
+        policy = RetryPolicy(
+            max_attempts=5,
+            base_delay=1,
+            max_delay=5,
+            deadline=None,
+            clock=clock,
+            sleep=clock.sleep,
+            rng=lambda: 0.5,
+        )
+        failures = iter([StatusError(500)] * 4)
+
+        def flaky():
+            error = next(failures, None)
+            if error:
+                raise error
+            return "ok"
+
+        assert policy.call(flaky) == "ok"
+        assert clock.sleeps == [0.5, 1.0, 2.0, 2.5]
+
+    def test_client_errors_and_deadline_stop_retries(self):
+        """Non-transient errors fail at once; no attempt starts past the deadline."""
+        clock = FakeClock()
+        policy = RetryPolicy(
+            deadline=2.5, clock=clock, sleep=clock.sleep, rng=lambda: 1.0
+        )
+        calls = []
+
+        def fail(status):
+            calls.append(status)
+            raise StatusError(status)
+
+        with pytest.raises(StatusError):
+            policy.call(fail, 400)
+        assert calls == [400]
+
+        calls.clear()
+        with pytest.raises(StatusError):
+            policy.call(fail, 503)
+        # Waited 1s and 2s would pass the deadline, so only two attempts
+        assert calls == [503, 503]
+        assert clock.sleeps == [1.0]
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_rate_burst_and_pause(self):
+        """Requests beyond the burst should wait for the rate; pauses block all."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.5)
+
+        bucket.acquire(clock.sleep)
+        assert clock.now == pytest.approx(0.5)
+
+        bucket.pause(10)
+        assert bucket.reserve() == pytest.approx(10)
+
+
+class TestGeneratorRetries:
+    """Test cases for retried LLM requests against a scripted server."""
+
+    transformed = DataTransformer(datetime(2024, 1, 1), datetime(2024, 2, 1)).transform(
+        synthetic_repository_data()
+    )
+
+    @pytest.fixture
+    def scripted_generator(self, sample_repo, make_config):
+        """Build a generator talking to a scripted server, recording its waits."""
+        servers = []
+
+        def _scripted_generator(statuses, retry_after=None, **overrides):
+            server = FakeLLMServer(
+                ["Report"], statuses=statuses, retry_after=retry_after
+            )
+            servers.append(server)
+            config = make_config([sample_repo], llm_cache=False, **overrides)
+            generator = LLMReportGenerator(config)
+            generator.client = OpenAI(
+                api_key="test", base_url=server.base_url, max_retries=0
+            )
+            clock = FakeClock()
+            generator.retry_policy.sleep = clock.sleep
+            generator.retry_policy.limiter = None
+            return generator, server, clock
+
+        yield _scripted_generator
+        for server in servers:
+            server.close()
+
+    def test_rate_limits_and_server_errors_are_retried(self, scripted_generator):
+        """429 and 5xx responses should be retried, honoring Retry-After."""
+        generator, server, clock = scripted_generator([429, 500, 502], retry_after=7)
+
+        assert generator.generate_report(self.transformed) == "Report"
+        assert len(server.requests) == 4
+        assert clock.sleeps == [7.0, 7.0, 7.0]
+
+    def test_gives_up_after_max_attempts(self, scripted_generator):
+        """Once attempts run out the fallback report is returned."""
+        generator, server, clock = scripted_generator(
+            [500, 500, 500], llm_max_attempts=3
+        )
+
+        report = generator.generate_report(self.transformed)
+
+        assert report.startswith("# Git Repository Analysis Report")
+        assert len(server.requests) == 3
+        assert len(clock.sleeps) == 2
@@ -0,0 +1,140 @@
+"""Tests for the daily rollup store."""
+
+import os
+from datetime import date, datetime
+
+from git_sniff_otter.modules.data_collector import DataCollector
+from git_sniff_otter.modules.data_transformer import DataTransformer
+from git_sniff_otter.modules.rollups import align_window, full_days
+
+from .conftest import normalized, run_git
+
+
+class TestRollups:
+    """Test cases for answering reports from daily rollups."""
+
+    @staticmethod
+    def _transform_direct(config):
+        """Transform freshly collected commits, without rollups."""
+        config = config.model_copy(update={"rollups": False})
+        transformer = DataTransformer(config.start_date, config.end_date)
+        return normalized(
+            transformer.transform(DataCollector(config).collect_all_data()).to_dict()
+        )
+
+    @staticmethod
+    def _transform_rollups(config, calls=None):
+        """Transform from rollups, recording the windows collected from git."""
+        collector = DataCollector(config)
+        collect_commits = collector._collect_commits
+
+        def recording_collect_commits(repo_path, since=None, until=None):
+            if calls is not None:
+                calls.append((since, until))
+            return collect_commits(repo_path, since, until)
+
+        collector._collect_commits = recording_collect_commits
+        transformer = DataTransformer(config.start_date, config.end_date)
+        return normalized(
+            transformer.transform_aggregates(collector.collect_rollups()).to_dict()
+        )
+
+    def test_matches_direct_transform(self, sample_repo, tmp_path, make_config):
+        """Cold and warm rollup reports should equal the regular report."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path), rollups=True)
+        expected = self._transform_direct(config)
+
+        assert self._transform_rollups(config) == expected
+        assert self._transform_rollups(config) == expected
+
+    def test_warm_run_only_collects_partial_day(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """Once days are rolled up only the window's last, partial day hits git."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path), rollups=True)
+        self._transform_rollups(config)
+
+        calls = []
+        self._transform_rollups(config, calls)
+
+        assert calls == [(datetime(2024, 2, 1), datetime(2024, 2, 1))]
+
+    def test_wider_window_collects_only_missing_days(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """Extending the window should only collect the days not yet covered."""
+        config = make_config(
+            [sample_repo],
+            cache_dir=str(tmp_path),
+            rollups=True,
+            start_date=datetime(2024, 1, 3),
+        )
+        self._transform_rollups(config)
+
+        calls = []
+        wider = config.model_copy(update={"start_date": datetime(2024, 1, 1)})
+        result = self._transform_rollups(wider, calls)
+
+        assert calls[0] == (datetime(2024, 1, 1), datetime(2024, 1, 2, 23, 59, 59))
+        assert len(calls) == 2
+        assert result == self._transform_direct(wider)
+
+    def test_new_commits_merge_into_covered_days(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """Commits that appear later, even with old dates, should be counted."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path), rollups=True)
+        self._transform_rollups(config)
+
+        run_git(sample_repo, "checkout", "-q", "-b", "late", "HEAD~2")
+        with open(os.path.join(sample_repo, "late.py"), "w") as f:
+            f.write("x = 1\n")
+        run_git(sample_repo, "add", ".")
+        run_git(sample_repo, "commit", "-q", "-m", "Late", date="2024-01-03T09:00:00Z")
+
+        calls = []
+        result = self._transform_rollups(config, calls)
+
+        # Found through the refs that moved, not by collecting the days again
+        assert len(calls) == 1
+        assert result == self._transform_direct(config)
+
+    def test_rewritten_history_rebuilds_rollups(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """Commits amended or reset away should no longer be counted."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path), rollups=True)
+        self._transform_rollups(config)
+
+        run_git(sample_repo, "commit", "-q", "--amend", "-m", "Amended")
+        assert self._transform_rollups(config) == self._transform_direct(config)
+
+        run_git(sample_repo, "reset", "-q", "--hard", "HEAD~1")
+        result = self._transform_rollups(config)
+
+        assert result == self._transform_direct(config)
+        assert result["overall_stats"]["total_commits"] == 4
+
+    def test_collect_all_data_keeps_rollups_current(
+        self, sample_repo, tmp_path, make_config
+    ):
+        """A regular collection should store its whole days as rollups."""
+        config = make_config([sample_repo], cache_dir=str(tmp_path), rollups=True)
+        DataCollector(config).collect_all_data()
+
+        calls = []
+        result = self._transform_rollups(config, calls)
+
+        assert len(calls) == 1
+        assert result == self._transform_direct(config)
+
+    def test_window_alignment(self):
+        """Windows should be aligned to whole days."""
+        start, end = align_window(
+            datetime(2024, 1, 3, 15, 30), datetime(2024, 1, 10, 9, 0)
+        )
+
+        assert start == datetime(2024, 1, 3)
+        assert end == datetime(2024, 1, 10, 9, 0)
+        assert full_days(start, end) == (date(2024, 1, 3), date(2024, 1, 9))
+        assert full_days(datetime(2024, 1, 3, 1), datetime(2024, 1, 4, 2)) is None
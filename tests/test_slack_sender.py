@@ -0,0 +1,549 @@
+"""Tests for sending reports to Slack."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+import requests
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.slack_response import SlackResponse
+
+from git_sniff_otter.modules import slack_sender
+from git_sniff_otter.modules.outbox import Outbox, claim_owner
+from git_sniff_otter.modules.slack_sender import SlackSender
+
+
+class WebhookServer:
+    """Local keep-alive webhook recording messages and client connections."""
+
+    def __init__(self):
+        self.messages = []
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                server.messages.append(json.loads(self.rfile.read(length)))
+                server.connections.add(self.client_address)
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/hook"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        """Stop the server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeSlackClient:
+    """Stand-in for the Slack WebClient recording posted messages.
+
+    Each post takes ``delay`` seconds. ``errors`` maps a channel to the
+    ``(status, error, retry_after)`` answers of its next posts.
+    """
+
+    def __init__(self, delay=0.0, errors=None):
+        self.delay = delay
+        self.errors = {channel: list(e) for channel, e in (errors or {}).items()}
+        self.posted = []
+        self.attempts = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def chat_postMessage(self, channel, text, **kwargs):
+        """Post a message or fail as scripted."""
+        with self.lock:
+            self.attempts += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            scripted = self.errors.get(channel)
+            error = scripted.pop(0) if scripted else None
+        try:
+            time.sleep(self.delay)
+            if error:
+                status, code, retry_after = error
+                headers = {"Retry-After": str(retry_after)} if retry_after else {}
+                response = SlackResponse(
+                    client=None,
+                    http_verb="POST",
+                    api_url="https://slack.com/api/chat.postMessage",
+                    req_args={},
+                    data={"ok": False, "error": code},
+                    headers=headers,
+                    status_code=status,
+                )
+                raise SlackApiError(code, response)
+            with self.lock:
+                self.posted.append((channel, text))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        return {"ok": True}
+
+
+class SlackAPIServer:
+    """Local stand-in for the Slack Web API and its file upload URLs.
+
+    Every call is recorded as ``(method, params)``; uploaded files are kept
+    in ``uploads`` by file id. ``failures`` maps a method to the errors its
+    next calls answer with.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.uploads = {}
+        self.failures = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                url = urlparse(self.path)
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if url.path.startswith("/upload/"):
+                    server.calls.append(("upload", {}))
+                    server.uploads[url.path.rsplit("/", 1)[1]] = body.decode()
+                    self._send(200, b"OK - uploaded")
+                    return
+
+                method = url.path.rsplit("/", 1)[1]
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    params = json.loads(body)
+                else:
+                    params = dict(parse_qsl(url.query))
+                    params.update(parse_qsl(body.decode()))
+                server.calls.append((method, params))
+                self._send(200, json.dumps(server.answer(method, params)).encode())
+
+            def _send(self, status, data):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def answer(self, method, params):
+        """Build the API response to a call."""
+        if self.failures.get(method):
+            return {"ok": False, "error": self.failures[method].pop(0)}
+        if method == "chat.postMessage":
+            return {"ok": True, "channel": "C0123", "ts": f"{len(self.calls)}.0"}
+        if method == "files.getUploadURLExternal":
+            file_id = f"F{len(self.calls)}"
+            return {
+                "ok": True,
+                "upload_url": f"{self.url}/upload/{file_id}",
+                "file_id": file_id,
+            }
+        if method == "files.completeUploadExternal":
+            files = json.loads(params["files"])
+            return {"ok": True, "files": [{"id": f["id"]} for f in files]}
+        return {"ok": False, "error": "unknown_method"}
+
+    def close(self):
+        """Stop the server."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def webhook_server():
+    """Run a local webhook for the duration of a test."""
+    server = WebhookServer()
+    yield server
+    server.close()
+
+
+class TestWebhookSession:
+    """Test cases for webhook posting over the shared session."""
+
+    def test_messages_reuse_one_connection(
+        self, sample_repo, make_config, webhook_server, tmp_path, monkeypatch
+    ):
+        """Every message of every sender should reuse one kept-alive connection."""
+        monkeypatch.setattr(slack_sender, "CHANNEL_BURST", 10)
+        senders = [
+            SlackSender(
+                make_config(
+                    [sample_repo],
+                    slack_token=None,
+                    slack_webhook_url=webhook_server.url,
+                    slack_channel=channel,
+                    cache_dir=str(tmp_path),
+                )
+            )
+            for channel in ("#one", "#two")
+        ]
+        report = "\n".join(f"## Section {i}\n" + "x" * 3000 for i in range(3))
+
+        for sender in senders:
+            assert sender.send_section(report)
+            assert sender.send_report("Short report")
+        assert senders[0].test_connection()
+
+        assert senders[0].session is senders[1].session
+        assert len(webhook_server.messages) == 9
+        assert [m["channel"] for m in webhook_server.messages[:4]] == ["#one"] * 4
+        assert len(webhook_server.connections) == 1
+
+
+class TestPostingQueue:
+    """Test cases for rate-limited posting to several channels."""
+
+    @pytest.fixture
+    def bot_sender(self, sample_repo, make_config, monkeypatch, tmp_path):
+        """Build a sender posting to fresh channels through a fake client."""
+        monkeypatch.setattr(slack_sender, "CHANNEL_BURST", 10)
+        suffix = time.monotonic_ns()
+
+        def _bot_sender(client, count=2):
+            channels = [f"#channel-{i}-{suffix}" for i in range(count)]
+            config = make_config([sample_repo], cache_dir=str(tmp_path))
+            sender = SlackSender(config, channels)
+            sender.client = client
+            sender.retry_policy.sleep = lambda seconds: None
+            return sender, channels
+
+        return _bot_sender
+
+    def test_rate_limited_posts_are_retried_in_order(self, bot_sender):
+        """A 429 should be retried in place while other channels post in parallel."""
+        client = FakeSlackClient(delay=0.05)
+        sender, (first, second) = bot_sender(client)
+        client.errors = {first: [(429, "ratelimited", 0)]}
+        report = "\n".join(f"## Section {i}\n" + "x" * 3000 for i in range(3))
+
+        assert sender.send_report(report)
+
+        for channel in (first, second):
+            texts = [text for c, text in client.posted if c == channel]
+            assert texts[0] == "*Git Repository Analysis Report*"
+            assert "\n".join(texts[1:]) == report
+        assert client.attempts == 9
+        assert client.max_in_flight == 2
+        assert sender.last_delivery.sent(first) == 4
+
+    def test_failed_message_skips_rest_of_channel(self, bot_sender):
+        """After a post fails for good, later messages of that channel are not sent."""
+        client = FakeSlackClient()
+        sender, (first, second) = bot_sender(client)
+        client.errors = {first: [None, (200, "channel_not_found", None)]}
+
+        assert not sender.send_section("one\n" + "x" * 3990 + "\ntwo\nthree")
+
+        delivery = sender.last_delivery
+        statuses = [p["status"] for p in delivery.parts if p["channel"] == first]
+        assert statuses == ["sent", "failed"]
+        assert delivery.sent(second) == 2
+        assert "1 of 2 messages sent (message 2 failed: channel_not_found)" in (
+            delivery.summary()
+        )
+
+    def test_network_errors_are_retried(self, bot_sender):
+        """Connection errors and timeouts of requests and urllib should be retried."""
+        client = FakeSlackClient()
+        sender, (channel,) = bot_sender(client, count=1)
+        failures = [URLError("Connection reset"), requests.exceptions.ReadTimeout()]
+        post = client.chat_postMessage
+
+        def flaky_post(**kwargs):
+            if failures:
+                raise failures.pop(0)
+            return post(**kwargs)
+
+        client.chat_postMessage = flaky_post
+
+        assert sender.send_section("Short report")
+        assert client.posted == [(channel, "Short report")]
+        assert sender.retry_policy.is_retryable(requests.exceptions.ConnectionError())
+        assert not sender.retry_policy.is_retryable(
+            HTTPError("https://hooks.slack.com", 404, "Not Found", None, None)
+        )
+
+
+class TestOutbox:
+    """Test cases for resuming failed deliveries from the outbox."""
+
+    @pytest.fixture
+    def make_sender(self, sample_repo, make_config, monkeypatch, tmp_path):
+        """Build senders sharing one outbox, each with its own fake client."""
+        monkeypatch.setattr(slack_sender, "CHANNEL_BURST", 10)
+        channel = f"#outbox-{time.monotonic_ns()}"
+        config = make_config([sample_repo], cache_dir=str(tmp_path))
+
+        def _make_sender(client):
+            sender = SlackSender(config, [channel])
+            sender.client = client
+            sender.retry_policy.max_attempts = 1
+            return sender
+
+        return _make_sender, channel
+
+    def test_resend_posts_only_unsent_messages(self, make_sender):
+        """A later flush should continue where the failed delivery stopped."""
+        _make_sender, channel = make_sender
+        report = "\n".join(f"## Section {i}\n" + "x" * 3000 for i in range(3))
+        outage = FakeSlackClient(errors={channel: [None, None, (503, "down", None)]})
+
+        assert not _make_sender(outage).send_report(report)
+        assert len(outage.posted) == 2
+
+        recovered = FakeSlackClient()
+        sender = _make_sender(recovered)
+        (pending,) = sender.outbox.pending_reports()
+        assert (pending["pending"], pending["last_error"]) == (2, "down")
+
+        deliveries = sender.flush_outbox()
+
+        assert all(delivery.ok for delivery in deliveries.values())
+        texts = [text for _, text in outage.posted + recovered.posted]
+        assert texts[0] == "*Git Repository Analysis Report*"
+        assert "\n".join(texts[1:]) == report
+        assert sender.outbox.pending_reports() == []
+
+    def test_earlier_reports_are_sent_first(self, make_sender):
+        """A new report should only be posted after the unsent ones before it."""
+        _make_sender, channel = make_sender
+        outage = FakeSlackClient(errors={channel: [(500, "down", None)]})
+        assert not _make_sender(outage).send_report("First", "Monday")
+
+        client = FakeSlackClient()
+        assert _make_sender(client).send_report("Second", "Tuesday")
+
+        assert [text for _, text in client.posted] == [
+            "*Monday*\n\nFirst",
+            "*Tuesday*\n\nSecond",
+        ]
+
+    def test_claimed_channels_are_left_to_their_sender(self, make_sender):
+        """A channel claimed by a live sender is skipped; a dead sender's is not."""
+        _make_sender, channel = make_sender
+        outage = FakeSlackClient(errors={channel: [(500, "down", None)]})
+        assert not _make_sender(outage).send_report("First", "Monday")
+        client = FakeSlackClient()
+        sender = _make_sender(client)
+        other = Outbox(sender.outbox.path)
+        owner = claim_owner()
+
+        assert other.claim(channel, owner)
+        assert sender.flush_outbox() == {}
+
+        other.release(channel, owner)
+        finished = subprocess.Popen([sys.executable, "-c", ""])
+        finished.wait()
+        host, _, suffix = owner.split(":")
+        assert other.claim(channel, f"{host}:{finished.pid}:{suffix}")
+        deliveries = sender.flush_outbox()
+
+        assert [delivery.ok for delivery in deliveries.values()] == [True]
+        assert client.posted == [(channel, "*Monday*\n\nFirst")]
+
+    def test_concurrent_processes_post_each_message_once(self, make_sender, tmp_path):
+        """Processes flushing the same outbox should never post a message twice."""
+        _make_sender, channel = make_sender
+        sender = _make_sender(FakeSlackClient())
+        texts = [f"Message {i}" for i in range(10)]
+        sender.outbox.add("Report", {channel: texts})
+        posted = tmp_path / "posted.txt"
+
+        script = FLUSH_SCRIPT.format(
+            cache_dir=str(tmp_path), channel=channel, posted=str(posted)
+        )
+        processes = [
+            subprocess.Popen([sys.executable, "-c", script], cwd=os.getcwd())
+            for _ in range(3)
+        ]
+        assert [process.wait(timeout=60) for process in processes] == [0, 0, 0]
+
+        assert posted.read_text().splitlines() == texts
+        assert sender.outbox.pending_reports() == []
+
+    def test_failing_report_is_given_up(self, make_sender):
+        """After the attempt limit a failing report stops blocking later ones."""
+        _make_sender, channel = make_sender
+        failing = FakeSlackClient(
+            errors={channel: [(200, "channel_not_found", None)] * 2}
+        )
+        sender = _make_sender(failing)
+        sender.outbox.max_attempts = 2
+
+        assert not sender.send_report("First", "Monday")
+        # The second attempt gives the first report up; this one waits behind it
+        assert not sender.send_report("Second", "Tuesday")
+        (pending,) = sender.outbox.pending_reports()
+        assert (pending["title"], pending["attempts"]) == ("Tuesday", 0)
+
+        assert sender.send_report("Third", "Wednesday")
+        assert [text for _, text in failing.posted] == [
+            "*Tuesday*\n\nSecond",
+            "*Wednesday*\n\nThird",
+        ]
+        assert sender.outbox.pending_reports() == []
+
+    def test_report_given_up_by_another_sender_is_not_reported_sent(self, make_sender):
+        """A report another sender gave up should count as failed, not sent."""
+        _make_sender, channel = make_sender
+        sender = _make_sender(FakeSlackClient())
+        other = _make_sender(FakeSlackClient(errors={channel: [(500, "down", None)]}))
+        other.outbox.max_attempts = 1
+        claim = sender.outbox.claim
+
+        def claim_after_other_sender(channel, owner, wait=False):
+            # The other sender flushes the report first and exhausts its attempts
+            other.flush_outbox()
+            return claim(channel, owner, wait)
+
+        sender.outbox.claim = claim_after_other_sender
+
+        assert not sender.send_report("First", "Monday")
+        (part,) = sender.last_delivery.parts
+        assert (part["status"], part["error"]) == ("failed", "down")
+        assert sender.client.posted == []
+        assert sender.outbox.pending_reports() == []
+
+    def test_single_report_can_be_discarded(self, make_sender):
+        """Discarding one report should keep the others."""
+        _make_sender, channel = make_sender
+        outage = FakeSlackClient(errors={channel: [(500, "down", None)] * 2})
+        sender = _make_sender(outage)
+        sender.send_report("First", "Monday")
+        sender.send_report("Second", "Tuesday")
+        first, second = sender.outbox.pending_reports()
+
+        sender.outbox.discard(first["id"])
+
+        assert [r["id"] for r in sender.outbox.pending_reports()] == [second["id"]]
+
+
+FLUSH_SCRIPT = """
+import time
+
+from git_sniff_otter.config import Config
+from git_sniff_otter.modules import slack_sender
+
+
+class SlowClient:
+    def chat_postMessage(self, channel, text, **kwargs):
+        time.sleep(0.02)
+        with open({posted!r}, "a") as f:
+            f.write(text + "\\n")
+        return {{"ok": True, "channel": channel}}
+
+
+slack_sender.CHANNEL_BURST = 100
+config = Config(
+    openai_api_key="test-key",
+    repository_paths=["."],
+    slack_channel={channel!r},
+    slack_token="test-token",
+    cache_dir={cache_dir!r},
+)
+sender = slack_sender.SlackSender(config)
+sender.client = SlowClient()
+sender.flush_outbox(wait_for=[{channel!r}])
+"""
+
+
+class TestFileDelivery:
+    """Test cases for uploading reports as files against a Slack API stub."""
+
+    @pytest.fixture
+    def api_sender(self, sample_repo, make_config, tmp_path):
+        """Build a sender talking to a local Slack API with a delivery mode."""
+        server = SlackAPIServer()
+
+        def _api_sender(mode):
+            config = make_config(
+                [sample_repo],
+                slack_delivery_mode=mode,
+                slack_channel=f"#files-{time.monotonic_ns()}",
+                cache_dir=str(tmp_path),
+            )
+            sender = SlackSender(config)
+            sender.client = WebClient(token="xoxb-test", base_url=f"{server.url}/api/")
+            return sender, server
+
+        yield _api_sender
+        server.close()
+
+    def test_report_size_does_not_change_api_calls(self, api_sender):
+        """A report of any size should take a summary message and one upload."""
+        sender, server = api_sender("file")
+        report = "## Summary\nAll good.\n\n" + "\n".join(
+            f"## Section {i}\n" + "x" * 3000 for i in range(20)
+        )
+
+        assert sender.send_report(report, "Weekly")
+
+        methods = [method for method, _ in server.calls]
+        assert methods == [
+            "chat.postMessage",
+            "files.getUploadURLExternal",
+            "upload",
+            "files.completeUploadExternal",
+        ]
+        summary = server.calls[0][1]["text"]
+        assert summary.startswith("*Weekly*\n\n## Summary\nAll good.")
+        assert len(summary) < 2000
+        assert server.calls[3][1]["channel_id"] == "C0123"
+        assert list(server.uploads.values()) == [report]
+
+    def test_failed_upload_does_not_repeat_summary(self, api_sender):
+        """Resending after a failed upload should only upload the file."""
+        sender, server = api_sender("file")
+        server.failures["files.completeUploadExternal"] = ["internal_error"]
+        report = "## Summary\nAll good.\n\n" + "x" * 5000
+
+        assert not sender.send_report(report, "Weekly")
+        deliveries = sender.flush_outbox()
+
+        assert [delivery.ok for delivery in deliveries.values()] == [True]
+        methods = [method for method, _ in server.calls]
+        assert methods == [
+            "chat.postMessage",
+            "files.getUploadURLExternal",
+            "upload",
+            "files.completeUploadExternal",
+            "files.getUploadURLExternal",
+            "upload",
+            "files.completeUploadExternal",
+        ]
+        assert server.calls[-1][1]["channel_id"] == "C0123"
+        assert list(server.uploads.values()) == [report, report]
+
+    def test_auto_mode_posts_short_reports_as_messages(self, api_sender):
+        """In auto mode a report fitting a few messages should not be uploaded."""
+        sender, server = api_sender("auto")
+
+        assert sender.send_report("Short report")
+
+        assert [method for method, _ in server.calls] == ["chat.postMessage"]